@@ -0,0 +1,3 @@
+"""
+CoT / ReAct 날짜 추론 실험에서 공유하는 보조 모듈 모음.
+"""
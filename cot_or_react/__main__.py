@@ -0,0 +1,6 @@
+import sys
+
+from cot_or_react.run import main
+
+
+sys.exit(main())
@@ -0,0 +1,359 @@
+"""
+항목 단위 CoT / ReAct 실행 로직.
+
+t1.py, t2.py, t3.py, t3_llm.py 에 복사되어 있던 루프 본문을 옮겨 온 것으로,
+결과 항목에 남기는 필드(thought, prediction, latency, tokens, react_* 등)는 예전과 같습니다.
+"""
+import json
+import time
+from dataclasses import dataclass
+
+from cot_or_react.budget import BudgetExceeded
+from cot_or_react.json_repair import REPAIR_STATS, reask_messages, repair_json
+from cot_or_react.react_guard import DEFAULT_MAX_STALL_TURNS, StallGuard
+from cot_or_react.verifier import ScheduleVerifier
+
+
+MAX_TURNS = 10
+
+# 재요청(--json-repair reask)에 보내는 단계별 응답 스키마
+ANSWER_SCHEMA = {"thought": "string", "prediction": "the answer in the format the task asks for"}
+THOUGHT_SCHEMA = {"thought": "string", "tool": "calculator | calendar_db | search | finish", "tool_input": "string"}
+DECIDER_SCHEMA = {"thought": "string", "status": ["continue | finish", ["YYYY-MM-DD"]]}
+
+
+@dataclass
+class RunContext:
+    llm: object
+    toolbox: object
+    prompts: dict
+    max_stall_turns: int = DEFAULT_MAX_STALL_TURNS
+    verifier: str = "off"   # T3 ReAct 후보 목록 로컬 검증: "off", "shadow"(기록만), "on"(검증되면 바로 종료)
+    verifier_trusted: tuple = ()  # on 모드에서 일찍 끝내도 되는 제약 모양(verifier.calibrate 의 trusted)
+    max_turns: int = MAX_TURNS
+    budget: object = None   # BudgetController: 호출 직전에 항목·실행 예산을 확인
+    json_repair: str = "reask"  # 깨진 JSON 응답: "off"(그대로 실패), "local"(로컬 복구만), "reask"(로컬 복구 후 짧은 재요청)
+
+
+def is_error_prediction(prediction) -> bool:
+    """
+    이 모듈이 남기는 오류 예측("Error: ..." 문자열, 입력 누락 시의 {"error": ...})인지 확인합니다.
+    """
+    return isinstance(prediction, (str, dict)) and str(prediction).startswith(("Error", "{'error'"))
+
+
+def complete(ctx: RunContext, item: dict, messages: list, required_keys=None):
+    """
+    ctx.llm.complete 를 호출하고 항목의 입력·출력 토큰을 item['usage'] 에 누적합니다.
+    스트리밍 호출이면 TTFT·초당 토큰 수를 item['llm_calls'] 에 남깁니다.
+    required_keys 는 이 단계의 제어 흐름에 필요한 키로, 완성되면 스트리밍 생성을 중단할 수 있습니다.
+    다른 항목의 같은 요청에 합류한 응답은 비용이 들지 않았으므로 usage 대신 item['coalesced_calls'] 로 셉니다.
+    예산 제어기가 있으면 호출 전에 확인하고, 예산을 넘었으면 BudgetExceeded 를 던집니다.
+    """
+    if ctx.budget is not None:
+        ctx.budget.before_call(item)
+    response = ctx.llm.complete(messages, required_keys=required_keys)
+    usage = item.setdefault('usage', {"prompt_tokens": 0, "completion_tokens": 0})
+    if response.coalesced:
+        item['coalesced_calls'] = item.get('coalesced_calls', 0) + 1
+    else:
+        usage["prompt_tokens"] += response.prompt_tokens
+        usage["completion_tokens"] += response.completion_tokens
+    if response.stop_reason is not None:
+        item.setdefault('llm_calls', []).append(response.call_record())
+    return response
+
+
+def _record_repair(item: dict, step: str, fixes: list, reasked: bool, ok: bool):
+    REPAIR_STATS.record(step, fixes, reasked, ok)
+    item.setdefault('json_repairs', []).append({"step": step, "fixes": fixes, "reasked": reasked, "ok": ok})
+
+
+def _json_object(content: str) -> tuple:
+    output, fixes = repair_json(content)
+    if not isinstance(output, dict):
+        raise json.JSONDecodeError("Expected a JSON object", content, 0)
+    return output, fixes
+
+
+def parse_json(ctx: RunContext, item: dict, response, schema: dict, step: str) -> tuple:
+    """
+    응답 본문을 JSON 객체로 해석해 (객체, 토큰 수) 를 돌려줍니다. 토큰 수는 재요청을 했다면 그 토큰까지 더한 값입니다.
+    로컬 복구로 안 되면 깨진 출력과 schema 만 담아 한 번 재요청합니다(대화 기록은 보내지 않음).
+    복구한 경우 item['json_repairs'] 에 단계와 수정 내역을 남기고, 끝내 해석하지 못하면 json.JSONDecodeError 를 던집니다.
+    """
+    if ctx.json_repair == "off":
+        return json.loads(response.content), response.total_tokens
+    try:
+        output, fixes = _json_object(response.content)
+    except json.JSONDecodeError:
+        if ctx.json_repair != "reask":
+            _record_repair(item, step, [], reasked=False, ok=False)
+            raise
+        reask = complete(ctx, item, reask_messages(response.content, schema), required_keys=tuple(schema))
+        try:
+            output, fixes = _json_object(reask.content)
+        except json.JSONDecodeError:
+            _record_repair(item, step, [], reasked=True, ok=False)
+            raise
+        _record_repair(item, step, fixes, reasked=True, ok=True)
+        return output, response.total_tokens + reask.total_tokens
+    if fixes:
+        _record_repair(item, step, fixes, reasked=False, ok=True)
+    return output, response.total_tokens
+
+
+def run_cot(item: dict, ctx: RunContext) -> dict:
+    input_text = item.get("input_text")
+    anchor_date = item.get("anchor_date")
+
+    user_input_json = {"input_text": input_text, "anchor_date": anchor_date}
+    messages = [
+        {"role": "system", "content": ctx.prompts["system"]},
+        {"role": "user", "content": json.dumps(user_input_json, ensure_ascii=False, indent=2)}
+    ]
+    try:
+        response = complete(ctx, item, messages, required_keys=("prediction",))
+        tokens = response.total_tokens
+
+        try:
+            prediction_json, tokens = parse_json(ctx, item, response, ANSWER_SCHEMA, "cot")
+            item['thought'] = prediction_json.get("thought", "Thought key not found")
+            item['prediction'] = prediction_json.get("prediction", "Prediction key not found")
+        except json.JSONDecodeError:
+            item['prediction'] = f"Error: Invalid JSON response: {response.content.strip()}"
+            item['thought'] = "N/A due to invalid JSON response"
+
+        item['latency'] = response.latency
+        item['tokens'] = tokens
+    except BudgetExceeded as e:
+        # 예산 초과는 처리 오류가 아니므로 오류 로그 없이 표시만 합니다(초과 내역은 항목의 budget 필드에 있습니다).
+        item['prediction'] = f"Error: {e}"
+        item['tokens'] = 0
+    except Exception as e:
+        print(f"ID {item.get('id')} 처리 중 오류 발생: {e}")
+        item['prediction'] = f"Error: {str(e)}"
+    return item
+
+
+def run_react_single_step(item: dict, ctx: RunContext) -> dict:
+    """
+    T1/T2 ReAct: Thought & Tool Selection -> Action -> (필요하면) 최종 답 생성.
+    """
+    input_text = item.get("input_text")
+    anchor_date = item.get("anchor_date")
+    start_time = time.time()
+    ctx.toolbox.start_item(item)
+    total_tokens = 0
+
+    try:
+        # [Step 1: Thought & Tool Selection]
+        user_input_json = {"input_text": input_text, "anchor_date": anchor_date}
+        messages_step1 = [
+            {"role": "system", "content": ctx.prompts["system"]},
+            {"role": "user", "content": json.dumps(user_input_json, ensure_ascii=False)}
+        ]
+        response_step1 = complete(ctx, item, messages_step1, required_keys=("tool", "tool_input"))
+        step1_output, tokens = parse_json(ctx, item, response_step1, THOUGHT_SCHEMA, "thought")
+        total_tokens += tokens
+
+        tool_name = step1_output.get("tool")
+        tool_input = step1_output.get("tool_input")
+        thought = step1_output.get("thought")
+        item['react_step1_output'] = step1_output
+
+        # [Step 2: Action (Tool Execution)]
+        if tool_name == "finish":
+            observation = "No tool needed. Directly providing the answer."
+            item['prediction'] = tool_input
+        elif tool_name in ("calculator", "calendar_db", "search"):
+            observation, _ = ctx.toolbox.execute(tool_name, tool_input)
+        else:
+            observation = "Error: Unknown tool selected or tool not provided."
+
+        item['react_observation'] = observation
+
+        # [Step 3: Final Answer Generation (if needed)]
+        if tool_name != "finish":
+            tool_log = {
+                "tool": tool_name,
+                "input": tool_input,
+                "observation": observation
+            }
+            final_user_input = {
+                "input_text": input_text,
+                "anchor_date": anchor_date,
+                "tool_log": tool_log
+            }
+            messages_step3 = [
+                {"role": "system", "content": ctx.prompts["observation"]},
+                {"role": "user", "content": json.dumps(final_user_input, ensure_ascii=False, indent=2)}
+            ]
+            response_step3 = complete(ctx, item, messages_step3, required_keys=("prediction",))
+            step3_output, tokens = parse_json(ctx, item, response_step3, ANSWER_SCHEMA, "answer")
+            total_tokens += tokens
+
+            item['thought'] = step3_output.get("thought")
+            item['prediction'] = step3_output.get("prediction")
+        else:
+            item['thought'] = thought
+
+        item['latency'] = time.time() - start_time
+
+    except BudgetExceeded as e:
+        # 최종 답 생성 전에 예산을 넘으면 도구 결과만 남기고 끝냅니다. 초과 내역은 항목의 budget 필드에 있습니다.
+        item['prediction'] = f"Error: {e}"
+        item['latency'] = time.time() - start_time
+    except Exception as e:
+        print(f"ReAct Error for ID {item.get('id')}: {e}")
+        item['prediction'] = f"Error: {str(e)}"
+
+    item['tokens'] = total_tokens
+    return item
+
+
+def run_react_loop(item: dict, ctx: RunContext) -> dict:
+    """
+    T3 ReAct: Planner(Thought) -> Action -> Decider(Observation) 를 최대 ctx.max_turns 턴 반복합니다.
+    """
+    input_text = item.get("input_text")
+    anchor_date = item.get("anchor_date")
+    start_time = time.time()
+    ctx.toolbox.start_item(item)
+    total_tokens = 0
+    tool_log = []
+    current_summary_thought = ""
+    guard = StallGuard(ctx.max_stall_turns)
+    verifier = ScheduleVerifier(input_text, anchor_date, ctx.toolbox.holidays, ctx.verifier, ctx.verifier_trusted) if ctx.verifier != "off" else None
+    finish_turn, early_finish = None, False
+
+    try:
+        for turn in range(ctx.max_turns):
+            # [Thought: Decide Tool]
+            thought_input = {
+                "user_query": input_text,
+                "anchor_date": anchor_date,
+                "current_summary_thought": current_summary_thought
+            }
+            messages_thought = [
+                {"role": "system", "content": ctx.prompts["system"]},
+                {"role": "user", "content": json.dumps(thought_input, ensure_ascii=False, indent=2)}
+            ]
+            response_thought = complete(ctx, item, messages_thought, required_keys=("tool", "tool_input"))
+            thought_output, tokens = parse_json(ctx, item, response_thought, THOUGHT_SCHEMA, "thought")
+            total_tokens += tokens
+
+            tool_name = thought_output.get("tool")
+            tool_input = thought_output.get("tool_input")
+
+            # [Action: Execute Tool] - 이 항목에서 이미 실행한 호출이면 메모에서 바로 가져옵니다.
+            observation = guard.recall(tool_name, tool_input)
+            repeated = observation is not None
+            tool_meta = {"source": "memo"}
+            if not repeated:
+                observation, tool_meta = ctx.toolbox.execute(tool_name, tool_input)
+                guard.remember(tool_name, tool_input, observation)
+            if "shadow" in tool_meta:
+                item.setdefault('shadow_checks', []).append(dict(tool_meta["shadow"], turn=turn + 1))
+
+            current_log_entry = {"thought": thought_output.get("thought"), "tool": tool_name, "input": tool_input, "observation": observation, "source": tool_meta["source"]}
+            if repeated:
+                current_log_entry["repeated"] = True
+            tool_log.append(current_log_entry)
+            item[f'react_turn_{turn+1}'] = current_log_entry
+
+            if repeated:
+                # 상태가 바뀌지 않았으므로 Observation 호출을 건너뛰고 Planner 에게 힌트만 남깁니다.
+                stalled = guard.record_turn(tool_name, tool_input, observation, repeated=True)
+                hint = guard.hint(tool_name, tool_input, observation)
+                if hint:
+                    current_summary_thought = f"{current_summary_thought or ''}\n{hint}".strip()
+                if stalled:
+                    break
+                continue
+
+            # [Observation: Evaluate State & Decide Termination]
+            observation_input = {"input_text": input_text, "tool_log": tool_log}
+            messages_obs = [
+                {"role": "system", "content": ctx.prompts["observation"]},
+                {"role": "user", "content": json.dumps(observation_input, ensure_ascii=False, indent=2)}
+            ]
+            response_obs = complete(ctx, item, messages_obs, required_keys=("status",))
+            obs_output, tokens = parse_json(ctx, item, response_obs, DECIDER_SCHEMA, "observation")
+            total_tokens += tokens
+
+            status_array = obs_output.get("status")
+            current_summary_thought = obs_output.get("thought")
+
+            if isinstance(status_array, list) and len(status_array) == 2:
+                status_decision = status_array[0]
+                prediction_list = status_array[1]
+
+                if status_decision == "finish":
+                    item['prediction'] = prediction_list
+                    item['thought'] = current_summary_thought
+                    finish_turn = turn + 1
+                    if verifier is not None:
+                        verifier.check(prediction_list, turn + 1)
+                    break
+
+                # Decider 가 continue 를 냈어도 요청의 규칙을 모두 만족하는 목록이면 다음 턴을 기다리지 않고 끝냅니다.
+                if verifier is not None and verifier.check(prediction_list, turn + 1) and verifier.may_finish:
+                    item['prediction'] = prediction_list
+                    item['thought'] = current_summary_thought
+                    finish_turn, early_finish = turn + 1, True
+                    break
+
+                if guard.record_turn(tool_name, tool_input, observation, repeated=False, dates=prediction_list):
+                    break
+            else:
+                # 예상치 못한 형식의 응답이 오면 오류 처리 후 루프 종료
+                item['prediction'] = f"Error: Invalid status format from observation: {status_array}"
+                item['thought'] = current_summary_thought
+                break
+        else:
+            item['prediction'] = f"Error: Reached max turns ({ctx.max_turns}) without finishing."
+            item['thought'] = current_summary_thought
+
+        if guard.stalled:
+            # 정체 턴이 한도에 도달: 모은 날짜가 있으면 그대로 종료하되 Decider 가 끝낸 답과 구분해 forced_finish 로 표시하고,
+            # 없으면 중단합니다.
+            item['prediction'] = guard.last_dates or f"Error: Stalled after {guard.stall_turns} turns without progress ({guard.stall_reason})"
+            item['thought'] = current_summary_thought
+            item['stall_reason'] = guard.stall_reason
+            if guard.last_dates:
+                item['forced_finish'] = "stalled"
+        item['react_guard'] = guard.summary()
+        if verifier is not None:
+            item['react_verifier'] = verifier.summary(finish_turn, item.get('prediction'), early_finish)
+
+        item['latency'] = time.time() - start_time
+
+    except BudgetExceeded as e:
+        # 예산을 넘으면 더 부르지 않고 그때까지 모은 날짜로 끝냅니다(forced_finish). 모은 날짜가 없으면 오류로 남깁니다.
+        item['prediction'] = guard.last_dates or f"Error: {e}"
+        if guard.last_dates:
+            item['forced_finish'] = "budget"
+        item['thought'] = current_summary_thought
+        item['react_guard'] = guard.summary()
+        item['latency'] = time.time() - start_time
+    except Exception as e:
+        print(f"ReAct Error for ID {item.get('id')}: {e}")
+        item['prediction'] = f"Error: {str(e)}"
+
+    item['tokens'] = total_tokens
+    return item
+
+
+def run_item(item: dict, task_config: dict, method: str, ctx: RunContext) -> dict:
+    """
+    한 항목을 method 에 맞게 처리합니다. 입력이 비어 있으면 기존 스크립트와 같은 오류 예측을 남깁니다.
+    """
+    if not item.get("input_text") or not item.get("anchor_date"):
+        item['prediction'] = {"error": "Missing input_text or anchor_date"}
+        return item
+    if method == "cot":
+        return run_cot(item, ctx)
+    if task_config["react"] == "loop":
+        return run_react_loop(item, ctx)
+    return run_react_single_step(item, ctx)
@@ -0,0 +1,181 @@
+"""
+CoT 마이크로 배치: 여러 항목을 한 요청에 묶어 시스템 프롬프트를 한 번만 보냅니다.
+
+T1/T2 CoT 항목은 "어제" 같은 짧은 구절 하나에 긴 시스템 프롬프트를 통째로 반복하므로,
+항목 N 개를 {"items": [...]} 로 묶어 보내고 {"results": [{"id", "thought", "prediction"}, ...]} 로 받아
+항목별로 나눕니다. 응답에서 빠졌거나 해석되지 않은 항목만 단건 CoT 로 다시 요청합니다.
+"""
+import json
+
+from cot_or_react.agent import run_cot, run_item
+from cot_or_react.budget import BudgetExceeded
+from cot_or_react.json_repair import REPAIR_STATS, repair_json
+from cot_or_react.llm import approx_tokens
+
+
+DEFAULT_BATCH_TOKENS = 2000
+
+BATCH_INSTRUCTION = """
+
+[Batch mode]
+The user message is a JSON object {"items": [{"id": ..., "input_text": ..., "anchor_date": ...}, ...]}.
+Solve every item independently, following all of the rules above.
+Output ONLY a JSON object of the form {"results": [{"id": ..., "thought": ..., "prediction": ...}, ...]}
+with exactly one entry per input item, using the same "id" values."""
+
+
+def _batch_payload(item: dict, key: str) -> dict:
+    return {"id": key, "input_text": item.get("input_text"), "anchor_date": item.get("anchor_date")}
+
+
+def pack_batches(dataset: list, batch_size: int, max_tokens: int = DEFAULT_BATCH_TOKENS) -> list:
+    """
+    데이터셋 순서를 유지하며 최대 batch_size 개, 입력 토큰 합이 max_tokens 이하인 묶음으로 나눕니다.
+    한 항목만으로 한도를 넘으면 그 항목은 혼자 한 묶음이 됩니다.
+    """
+    batches = []
+    current, current_tokens = [], 0
+    for item in dataset:
+        tokens = approx_tokens(json.dumps(_batch_payload(item, str(item.get("id"))), ensure_ascii=False))
+        if current and (len(current) >= batch_size or current_tokens + tokens > max_tokens):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(item)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _batch_keys(items: list) -> list:
+    # id 가 없거나 묶음 안에서 겹치면 위치로 구분되는 키를 씁니다.
+    keys = []
+    for position, item in enumerate(items):
+        key = str(item.get("id")) if item.get("id") is not None else f"#{position}"
+        keys.append(key if key not in keys else f"{key}#{position}")
+    return keys
+
+
+def _parse_results(content: str, json_repair: str = "reask") -> dict:
+    """
+    배치 응답을 {id: result} 로 바꿉니다. 로컬 복구로도 형식을 읽을 수 없으면 빈 딕셔너리를 반환해 모든 항목을 다시 요청하게 합니다.
+    빠진 항목은 어차피 단건으로 다시 요청하므로 묶음 응답은 재요청하지 않습니다.
+    """
+    if json_repair == "off":
+        try:
+            parsed = json.loads(content)
+        except json.JSONDecodeError:
+            return {}
+    else:
+        try:
+            parsed, fixes = repair_json(content)
+        except json.JSONDecodeError:
+            REPAIR_STATS.record("cot_batch", [], reasked=False, ok=False)
+            return {}
+        if fixes:
+            REPAIR_STATS.record("cot_batch", fixes, reasked=False, ok=True)
+    results = parsed.get("results") if isinstance(parsed, dict) else parsed
+    if not isinstance(results, list):
+        return {}
+    return {str(r["id"]): r for r in results if isinstance(r, dict) and "id" in r and "prediction" in r}
+
+
+def run_cot_batch(items: list, ctx) -> list:
+    """
+    입력이 있는 항목들을 한 요청으로 풀고 결과를 항목에 나눠 씁니다.
+    토큰은 묶음 사용량을 항목별 입력·출력 길이 비율로 나누고, latency 는 항목이 실제로 기다린 묶음 응답 시간입니다.
+    """
+    runnable = []
+    for item in items:
+        if item.get("input_text") and item.get("anchor_date"):
+            runnable.append(item)
+        else:
+            run_item(item, None, "cot", ctx)
+    if not runnable:
+        return items
+    _solve_batch(runnable, ctx)
+    return items
+
+
+def batch_messages(payloads: list, prompts: dict) -> list:
+    """
+    묶음 하나의 요청 메시지. 시스템 프롬프트 뒤에 배치 지시를 붙이고, 항목 payload 들을 한 user 메시지로 보냅니다.
+    """
+    return [
+        {"role": "system", "content": prompts["system"] + BATCH_INSTRUCTION},
+        {"role": "user", "content": json.dumps({"items": payloads}, ensure_ascii=False, indent=2)}
+    ]
+
+
+def batch_payloads(items: list) -> list:
+    return [_batch_payload(item, key) for item, key in zip(items, _batch_keys(items))]
+
+
+def _check_budget(items: list, ctx):
+    """
+    묶음 요청 직전의 예산 확인. 단건 호출의 agent.complete 와 같이 항목마다 before_call 을 거치고,
+    한 항목이라도 넘으면 나머지 항목에도 같은 초과를 기록한 뒤 BudgetExceeded 를 다시 던집니다.
+    """
+    if ctx.budget is None:
+        return
+    for item in items:
+        try:
+            ctx.budget.before_call(item)
+        except BudgetExceeded as e:
+            for other in items:
+                if other is not item:
+                    ctx.budget.record(other, f"{e.scope}_{e.resource}_exceeded")
+            raise
+
+
+def _solve_batch(items: list, ctx):
+    if len(items) == 1:
+        item = run_cot(items[0], ctx)
+        item['cot_batch'] = {"size": 1, "retried": False}
+        return
+
+    keys = _batch_keys(items)
+    payloads = batch_payloads(items)
+    messages = batch_messages(payloads, ctx.prompts)
+    try:
+        _check_budget(items, ctx)
+    except BudgetExceeded as e:
+        for item in items:
+            item['prediction'] = f"Error: {e}"
+            item['tokens'] = 0
+            item['cot_batch'] = {"size": len(items), "retried": False}
+        return
+    try:
+        response = ctx.llm.complete(messages)
+        parsed = _parse_results(response.content.strip(), ctx.json_repair)
+    except Exception as e:
+        print(f"CoT 배치({', '.join(keys)}) 처리 중 오류 발생: {e}")
+        response, parsed = None, {}
+
+    input_weights = [approx_tokens(json.dumps(p, ensure_ascii=False)) for p in payloads]
+    output_weights = [approx_tokens(json.dumps(parsed.get(key, {}), ensure_ascii=False)) for key in keys]
+    for index, (item, key) in enumerate(zip(items, keys)):
+        if response is not None:
+            share_prompt = response.prompt_tokens * input_weights[index] / sum(input_weights)
+            share_completion = response.completion_tokens * output_weights[index] / sum(output_weights)
+            item['tokens'] = round(share_prompt + share_completion)
+            if not response.coalesced:
+                item['usage'] = {"prompt_tokens": round(share_prompt), "completion_tokens": round(share_completion)}
+            item['latency'] = response.latency
+        else:
+            item['tokens'] = 0
+            item['latency'] = 0.0
+
+        result = parsed.get(key)
+        if result is not None:
+            item['thought'] = result.get("thought", "Thought key not found")
+            item['prediction'] = result.get("prediction", "Prediction key not found")
+            item['cot_batch'] = {"size": len(items), "retried": False}
+            continue
+
+        # 응답에서 빠졌거나 해석되지 않은 항목만 단건으로 다시 요청합니다.
+        batch_tokens, batch_latency = item.pop('tokens'), item.pop('latency')
+        run_cot(item, ctx)
+        item['tokens'] = batch_tokens + item.get('tokens', 0)
+        item['latency'] = batch_latency + item.get('latency', 0.0)
+        item['cot_batch'] = {"size": len(items), "retried": True}
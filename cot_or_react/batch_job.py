@@ -0,0 +1,257 @@
+"""
+오프라인 배치 작업 모드(--batch-phase).
+
+대화형 실행은 항목마다 첫 LLM 호출(CoT 호출, ReAct 첫 Thought 호출, extract-solve 추출 호출)의 latency 를 그대로 기다립니다.
+배치 모드는 이 첫 단계 요청을 두 단계로 떼어 냅니다.
+
+    1. prepare: 데이터셋의 첫 단계 요청을 custom_id 를 붙여 `{task}_{method}_batch_input.jsonl` 에 씁니다(LLM 호출 없음).
+       한 줄 형식은 OpenAI Batch API 입력과 같습니다: {"custom_id", "method": "POST", "url": "/v1/chat/completions", "body"}.
+    2. execute: 이 모듈의 로컬 실행기(높은 동시성, 재개 가능)나 공급자의 배치 엔드포인트가 요청을 처리해
+       `{task}_{method}_batch_output.jsonl` 을 만듭니다(OpenAI Batch API 출력 형식).
+    3. ingest: 출력 파일의 응답을 첫 단계 응답으로 쓰고 나머지(ReAct 다음 턴, 도구 실행 등)는 평소처럼 이어서 실행합니다.
+
+    python -m cot_or_react --task t1 t2 t3 --method cot react --batch-phase prepare --batch-dir batch/
+    python -m cot_or_react.batch_job execute --input batch/t3_react_batch_input.jsonl --concurrency 64
+    python -m cot_or_react --task t1 t2 t3 --method cot react --batch-phase ingest --batch-dir batch/
+
+응답은 요청 본문(모델, 메시지, 옵션)으로 찾으므로 ingest 때 모델이나 프롬프트가 바뀌었거나 출력에 없는 요청은 그대로 API 로 보냅니다.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cot_or_react.llm import Completion
+from cot_or_react.planner import first_turn_messages
+from cot_or_react.router import LLM_ROUTES, Router
+from cot_or_react.shard import select_shard
+from cot_or_react.tasks import load_dataset, load_prompts
+
+
+BATCH_PHASES = ("prepare", "ingest")
+BATCH_URL = "/v1/chat/completions"
+
+
+def batch_filename(task: str, method: str, kind: str, shard=None) -> str:
+    """
+    kind 는 "input" 또는 "output". 샤드를 주면 결과 파일과 같은 .shard-i-of-N 접미사를 붙입니다.
+    """
+    stem = f"{task}_{method}_batch_{kind}"
+    if shard:
+        stem += f".shard-{shard[0]}-of-{shard[1]}"
+    return stem + ".jsonl"
+
+
+def output_path_for(input_path: str) -> str:
+    if input_path.endswith("_batch_input.jsonl"):
+        return input_path[:-len("_batch_input.jsonl")] + "_batch_output.jsonl"
+    return input_path[:-len(".jsonl")] + ".output.jsonl" if input_path.endswith(".jsonl") else input_path + ".output"
+
+
+def request_key(body: dict) -> str:
+    """
+    요청 본문의 비교 키. 응답은 custom_id 가 아니라 이 키로 찾으므로 같은 요청을 보내는 항목은 응답 하나를 함께 씁니다.
+    """
+    return json.dumps({key: body.get(key) for key in ("model", "messages", "temperature", "response_format")},
+                      ensure_ascii=False, sort_keys=True)
+
+
+def first_stage_requests(task: str, method: str, args, llm) -> list:
+    """
+    (custom_id, 요청 본문) 목록. 라우팅은 항목마다 경로를 고르고, 규칙 해석기로 가는 항목과 입력이 빠진 항목은 LLM 을 부르지 않으므로 빠집니다.
+    """
+    methods = LLM_ROUTES if method == "route" else (method,)
+    prompts = {m: load_prompts(task, m, args.prompt_dir) for m in methods}
+    router = Router.load(args.router_table, task, args.route_tolerance) if method == "route" else None
+    lines = []
+    for position, item in enumerate(select_shard(load_dataset(task, args.data_dir), args.shard)):
+        if not item.get("input_text") or not item.get("anchor_date"):
+            continue
+        route = router.decide(item)[0] if router is not None else method
+        if route == "solver":
+            continue
+        messages = first_turn_messages(item, task, route, prompts[route])
+        lines.append((f"{task}-{method}-{position}", llm.request_kwargs(messages)))
+    return lines
+
+
+def prepare(args, llm) -> int:
+    """
+    --batch-phase prepare: 모든 Task / 메소드 조합의 첫 단계 요청을 --batch-dir 에 씁니다.
+    """
+    batch_dir = args.batch_dir or args.output_dir
+    os.makedirs(batch_dir, exist_ok=True)
+    failed = False
+    for task in args.task:
+        for method in args.method:
+            try:
+                lines = first_stage_requests(task, method, args, llm)
+            except FileNotFoundError as e:
+                print(f"오류: '{e.filename}' 파일을 찾을 수 없습니다.")
+                failed = True
+                continue
+            except (OSError, ValueError) as e:
+                print(f"오류: {e}")
+                failed = True
+                continue
+            path = os.path.join(batch_dir, batch_filename(task, method, "input", args.shard))
+            with open(path, "w", encoding="utf-8") as f:
+                for custom_id, body in lines:
+                    f.write(json.dumps({"custom_id": custom_id, "method": "POST", "url": BATCH_URL, "body": body}, ensure_ascii=False) + "\n")
+            print(f"[{task} {method}] 첫 단계 요청 {len(lines)}건 -> '{path}'")
+    return 1 if failed else 0
+
+
+def read_jsonl(path: str) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def completion_from_body(body: dict) -> Completion:
+    usage = body.get("usage") or {}
+    return Completion(
+        content=body["choices"][0]["message"].get("content") or "",
+        prompt_tokens=usage.get("prompt_tokens", 0) or 0,
+        completion_tokens=usage.get("completion_tokens", 0) or 0,
+        total_tokens=usage.get("total_tokens", 0) or 0,
+    )
+
+
+def load_responses(input_path: str, output_path: str) -> dict:
+    """
+    요청 키 -> Completion. 출력 줄은 custom_id 로 입력 줄의 요청 본문과 짝지으며, 실패한 요청(상태 200 이 아님)은 빠집니다.
+    """
+    bodies = {line["custom_id"]: line["body"] for line in read_jsonl(input_path)}
+    responses = {}
+    for line in read_jsonl(output_path):
+        response = line.get("response") or {}
+        if line.get("custom_id") not in bodies or response.get("status_code") != 200:
+            continue
+        responses[request_key(bodies[line["custom_id"]])] = completion_from_body(response["body"])
+    return responses
+
+
+def find_batch_files(batch_dir: str, task: str, method: str, shard=None):
+    """
+    (입력 경로, 출력 경로). 샤드 실행이면 샤드별 파일을 먼저 찾고, 없으면 전체 데이터셋 파일을 씁니다(응답은 요청 본문으로 찾음).
+    """
+    for candidate in ((shard, None) if shard else (None,)):
+        input_path = os.path.join(batch_dir, batch_filename(task, method, "input", candidate))
+        output_path = os.path.join(batch_dir, batch_filename(task, method, "output", candidate))
+        if os.path.exists(input_path) and os.path.exists(output_path):
+            return input_path, output_path
+    raise FileNotFoundError(2, "batch output not found", os.path.join(batch_dir, batch_filename(task, method, "output", shard)))
+
+
+class BatchLLM:
+    """
+    --batch-phase ingest 에서 LLM 을 감쌉니다. 배치 출력에 있는 요청은 그 응답을 돌려주고, 나머지는 감싼 LLM 으로 보냅니다.
+    배치로 처리된 호출은 이미 비용을 치렀으므로 LLM 호출 집계(stats)에는 들어가지 않고 summary() 에 따로 셉니다.
+    """
+
+    def __init__(self, llm, responses: dict, source: str = None):
+        self.llm = llm
+        self.responses = responses
+        self.source = source
+        self._lock = threading.Lock()
+        self.served = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+    def complete(self, messages: list, json_mode: bool = True, temperature: float = 0, required_keys=None) -> Completion:
+        completion = self.responses.get(request_key(self.llm.request_kwargs(messages, json_mode, temperature)))
+        if completion is None:
+            return self.llm.complete(messages, json_mode=json_mode, temperature=temperature, required_keys=required_keys)
+        with self._lock:
+            self.served += 1
+            self.prompt_tokens += completion.prompt_tokens
+            self.completion_tokens += completion.completion_tokens
+        return completion
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "source": self.source,
+                "responses": len(self.responses),
+                "served": self.served,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+            }
+
+
+def _done_ids(output_path: str) -> set:
+    if not os.path.exists(output_path):
+        return set()
+    return {line["custom_id"] for line in read_jsonl(output_path) if (line.get("response") or {}).get("status_code") == 200}
+
+
+def execute(input_path: str, output_path: str, llm, concurrency: int, retries: int) -> dict:
+    """
+    로컬 배치 실행기. 출력에 이미 성공한 custom_id 는 건너뛰므로 중단된 작업을 같은 명령으로 이어서 실행할 수 있습니다.
+    실패한 요청은 재시도 후 error 줄로 남고, 다음 실행에서 다시 시도됩니다.
+    """
+    done = _done_ids(output_path)
+    pending = [line for line in read_jsonl(input_path) if line["custom_id"] not in done]
+    counts = {"skipped": len(done), "succeeded": 0, "failed": 0}
+    lock = threading.Lock()
+
+    def send(line):
+        error = None
+        for attempt in range(retries + 1):
+            try:
+                response = llm.client.chat.completions.create(**line["body"])
+                result = {"id": f"batch_req_{line['custom_id']}", "custom_id": line["custom_id"],
+                          "response": {"status_code": 200, "body": response.model_dump()}, "error": None}
+                break
+            except Exception as e:
+                error = e
+                if attempt < retries:
+                    time.sleep(min(2 ** attempt, 30))
+        else:
+            result = {"id": f"batch_req_{line['custom_id']}", "custom_id": line["custom_id"], "response": None,
+                      "error": {"code": type(error).__name__, "message": str(error)}}
+        with lock:
+            with open(output_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+            counts["succeeded" if result["error"] is None else "failed"] += 1
+
+    from tqdm import tqdm
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(tqdm(pool.map(send, pending), total=len(pending), desc="배치 요청 처리 중"))
+    return counts
+
+
+def main(argv=None) -> int:
+    from cot_or_react.llm import LLM
+
+    parser = argparse.ArgumentParser(description="Execute an offline batch file written by --batch-phase prepare against an OpenAI-compatible endpoint.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    execute_parser = sub.add_parser("execute", help="Send every request in a batch input file and append the results to the batch output file.")
+    execute_parser.add_argument('--input', type=str, required=True, help="Batch input file (*_batch_input.jsonl).")
+    execute_parser.add_argument('--output', type=str, default=None, help="Batch output file (default: the matching *_batch_output.jsonl).")
+    execute_parser.add_argument('--concurrency', type=int, default=32, help="Number of requests in flight.")
+    execute_parser.add_argument('--retries', type=int, default=3, help="Retries per request before it is written as an error.")
+    execute_parser.add_argument('--base-url', type=str, default=None, help="OpenAI-compatible base URL (default: $UPSTAGE_BASE_URL or Upstage).")
+    args = parser.parse_args(argv)
+
+    output_path = args.output or output_path_for(args.input)
+    start_time = time.time()
+    try:
+        counts = execute(args.input, output_path, LLM(base_url=args.base_url), args.concurrency, args.retries)
+    except FileNotFoundError as e:
+        print(f"오류: '{e.filename}' 파일을 찾을 수 없습니다.")
+        return 1
+    print(f"배치 완료: 성공 {counts['succeeded']}건, 실패 {counts['failed']}건, 이전 실행분 {counts['skipped']}건, "
+          f"{time.time() - start_time:.1f}초 -> '{output_path}'")
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""
+실행 전체와 항목 단위의 예산(토큰, LLM 호출, 초) 제어.
+
+실행 예산은 LLM 클라이언트 통계와 벽시계 시간으로 재고, 사용률(한도 대비 가장 많이 쓴 자원의 비율)이
+문턱을 넘을 때마다 새로 시작하는 항목을 단계적으로 줄여 실행합니다.
+
+    normal         -> 그대로 실행
+    fewer_turns    -> T3 ReAct 루프 최대 턴을 DEGRADED_MAX_TURNS 로 줄임
+    cheaper_method -> 규칙 해석기로 풀리는 항목은 해석기, T3 ReAct 는 extract-solve, 나머지 ReAct 는 CoT
+    stop           -> LLM 을 부르지 않고 "Error: Run budget exhausted" 로 표시 (결과 파일은 그대로 저장)
+
+항목 예산은 agent.complete 가 호출 직전에 확인합니다. 넘으면 BudgetExceeded 를 던지고, T3 루프는 그때까지 모은 날짜로 끝냅니다.
+적용한 단계와 초과 내역은 항목의 budget 필드에 남고, 실행 요약의 budget 블록에 집계됩니다.
+
+실행 예산은 기본적으로 실행 전체(모든 Task / 메소드 조합)가 나눠 쓰므로 앞 조합이 많이 쓰면 뒤 조합이 일찍 단계를 낮춥니다.
+--budget-scope combination 이면 조합마다 새 제어기를 만들어 같은 한도를 따로 씁니다. 어느 쪽이든 요약의 budget 블록에는
+범위(scope)와 그 조합이 쓴 양(combination_usage)이 남습니다.
+
+샤드 실행(--shard i/N, --processes N)에서는 토큰·호출 한도를 샤드마다 나눠 받고(shard_limits), 벽시계 한도는 모두 같이 씁니다.
+병합할 때는 merge_budget_summaries 가 몫을 다시 합쳐 원래 한도로 되돌리고, 합친 사용량으로 사용률과 단계를 다시 계산합니다.
+"""
+import threading
+import time
+from collections import Counter
+
+
+LEVELS = ("normal", "fewer_turns", "cheaper_method", "stop")
+DEFAULT_THRESHOLDS = (0.7, 0.85)
+DEGRADED_MAX_TURNS = 4
+# 샤드끼리 나눠 쓰는 자원. seconds 는 병렬 샤드가 같은 벽시계를 쓰므로 나누지 않습니다.
+SPLIT_RESOURCES = ("tokens", "calls")
+SCOPES = ("run", "combination")
+
+
+class BudgetExceeded(RuntimeError):
+    def __init__(self, scope: str, resource: str, used, limit):
+        super().__init__(f"{scope} budget exceeded: {resource} {round(used, 1)}/{limit}")
+        self.scope = scope
+        self.resource = resource
+
+
+def shard_limits(run_limits: dict, shard) -> dict:
+    """
+    샤드 i/N 의 실행 한도. 토큰·호출 한도를 N 으로 나누고 나머지는 앞 샤드부터 1 씩 더 줘서 몫의 합이 원래 한도와 같게 합니다.
+    """
+    if not shard:
+        return dict(run_limits)
+    index, count = shard
+    limits = dict(run_limits)
+    for resource in SPLIT_RESOURCES:
+        if limits.get(resource):
+            share, remainder = divmod(int(limits[resource]), count)
+            limits[resource] = max(1, share + (1 if index < remainder else 0))
+    return limits
+
+
+def _level(ratio: float, thresholds) -> str:
+    return LEVELS[min(len(LEVELS) - 1, sum(1 for t in thresholds if ratio >= t))]
+
+
+class BudgetController:
+    """
+    run_limits / item_limits 는 {"tokens": N, "calls": N, "seconds": N} 이고, 값이 없으면 그 자원은 제한하지 않습니다.
+    thresholds 는 fewer_turns, cheaper_method 단계가 시작되는 실행 예산 사용률입니다. 1.0 에서 stop 입니다.
+    scope 는 요약에 남기는 실행 예산의 범위입니다("run": 모든 조합이 공유, "combination": 조합 하나).
+    """
+
+    def __init__(self, llm, run_limits: dict, item_limits: dict, thresholds=DEFAULT_THRESHOLDS, scope: str = "run"):
+        self.llm = llm
+        self.scope = scope
+        self.run_limits = {key: value for key, value in run_limits.items() if value}
+        self.item_limits = {key: value for key, value in item_limits.items() if value}
+        self.thresholds = (*thresholds, 1.0)
+        self._baseline = llm.stats()
+        self._start = time.monotonic()
+        self._items = {}
+        self._lock = threading.Lock()
+        self.degradations = Counter()
+        self.peak_level = 0
+
+    def usage(self) -> dict:
+        stats = self.llm.stats()
+        return {
+            "tokens": stats["total_tokens"] - self._baseline["total_tokens"],
+            "calls": stats["calls"] - self._baseline["calls"],
+            "seconds": time.monotonic() - self._start,
+        }
+
+    def pressure(self) -> tuple:
+        """
+        (사용률, 가장 많이 쓴 자원). 실행 한도가 없으면 (0.0, None) 입니다.
+        """
+        usage = self.usage()
+        ratios = {key: usage[key] / limit for key, limit in self.run_limits.items()}
+        if not ratios:
+            return 0.0, None
+        resource = max(ratios, key=ratios.get)
+        return ratios[resource], resource
+
+    def level(self) -> int:
+        ratio, _ = self.pressure()
+        level = sum(1 for threshold in self.thresholds if ratio >= threshold)
+        with self._lock:
+            self.peak_level = max(self.peak_level, level)
+        return level
+
+    def record(self, item: dict, degradation: str):
+        block = item.setdefault('budget', {"degradations": []})
+        block["degradations"].append(degradation)
+        with self._lock:
+            self.degradations[degradation] += 1
+
+    def begin_item(self, item: dict) -> int:
+        """
+        항목 시작 시 호출합니다. 항목 예산 추적을 시작하고 지금의 단계(LEVELS 의 위치)를 돌려줍니다.
+        """
+        with self._lock:
+            self._items[id(item)] = {"start": time.monotonic(), "calls": 0}
+        return self.level()
+
+    def end_item(self, item: dict):
+        with self._lock:
+            self._items.pop(id(item), None)
+
+    def before_call(self, item: dict):
+        """
+        LLM 호출 직전의 확인. 항목 예산이나 실행 예산을 이미 다 썼으면 항목에 기록하고 BudgetExceeded 를 던집니다.
+        begin_item 으로 시작하지 않은 항목(CoT 묶음의 단건 재요청 등)은 토큰과 실행 예산만 확인합니다.
+        """
+        now = time.monotonic()
+        with self._lock:
+            tracker = self._items.get(id(item))
+            used = {"tokens": sum((item.get('usage') or {}).values())}
+            if tracker is not None:
+                used.update(calls=tracker["calls"], seconds=now - tracker["start"])
+        for resource, limit in self.item_limits.items():
+            if resource in used and used[resource] >= limit:
+                self.record(item, f"item_{resource}_exceeded")
+                raise BudgetExceeded("item", resource, used[resource], limit)
+        ratio, resource = self.pressure()
+        if ratio >= 1.0:
+            self.record(item, f"run_{resource}_exceeded")
+            raise BudgetExceeded("run", resource, self.usage()[resource], self.run_limits[resource])
+        if tracker is not None:
+            with self._lock:
+                tracker["calls"] += 1
+
+    def summary(self, before: Counter = None, usage_before: dict = None) -> dict:
+        """
+        실행 요약의 budget 블록. before 를 주면 그 뒤에 적용된 단계만 세고(Task / 메소드 조합별 요약),
+        usage_before 를 주면 그 뒤에 쓴 양을 combination_usage 로 남깁니다.
+        """
+        ratio, resource = self.pressure()
+        usage = self.usage()
+        degradations = self.degradations - before if before is not None else self.degradations
+        spent = {key: value - (usage_before or {}).get(key, 0) for key, value in usage.items()}
+        return {
+            "scope": self.scope,
+            "run_limits": self.run_limits,
+            "item_limits": self.item_limits,
+            "thresholds": list(self.thresholds),
+            "usage": {key: round(value, 1) for key, value in usage.items()},
+            "combination_usage": {key: round(value, 1) for key, value in spent.items()},
+            "pressure": round(ratio, 4),
+            "pressure_resource": resource,
+            "level": _level(ratio, self.thresholds),
+            "peak_level": LEVELS[self.peak_level],
+            "degradations": dict(degradations.most_common()),
+        }
+
+
+def merge_budget_summaries(blocks: list) -> dict:
+    """
+    샤드 요약의 budget 블록을 합칩니다. 한도는 더하지 않습니다: 토큰·호출은 샤드 몫을 합쳐 원래 한도로, 벽시계 한도와
+    항목 한도는 샤드끼리 같은 값입니다. 사용량은 토큰·호출은 더하고 벽시계는 가장 긴 샤드 기준이며, 사용률과 단계는 합친 값으로 다시 계산합니다.
+    """
+    run_limits, usage, spent = {}, {}, {}
+    for block in blocks:
+        for resource, limit in block.get("run_limits", {}).items():
+            run_limits[resource] = run_limits.get(resource, 0) + limit if resource in SPLIT_RESOURCES else limit
+        for totals, key in ((usage, "usage"), (spent, "combination_usage")):
+            for resource, used in block.get(key, {}).items():
+                totals[resource] = totals.get(resource, 0) + used if resource in SPLIT_RESOURCES else max(totals.get(resource, 0), used)
+    thresholds = blocks[0].get("thresholds") or (*DEFAULT_THRESHOLDS, 1.0)
+    ratios = {resource: usage.get(resource, 0) / limit for resource, limit in run_limits.items()}
+    resource = max(ratios, key=ratios.get) if ratios else None
+    ratio = ratios[resource] if ratios else 0.0
+    degradations = Counter()
+    for block in blocks:
+        degradations.update(block.get("degradations", {}))
+    return {
+        "scope": blocks[0].get("scope", "run"),
+        "run_limits": run_limits,
+        "item_limits": blocks[0].get("item_limits", {}),
+        "thresholds": list(thresholds),
+        "usage": {key: round(value, 1) for key, value in usage.items()},
+        "combination_usage": {key: round(value, 1) for key, value in spent.items()},
+        "pressure": round(ratio, 4),
+        "pressure_resource": resource,
+        "level": _level(ratio, thresholds),
+        "peak_level": LEVELS[max(LEVELS.index(block.get("peak_level", "normal")) for block in blocks)],
+        "degradations": dict(degradations.most_common()),
+    }
+
+
+def budgeted(run, controller: BudgetController, fewer_turns=None, cheaper=None):
+    """
+    항목 처리 함수 run(item) 을 예산 단계에 따라 감쌉니다.
+    fewer_turns(item) 은 줄인 턴으로 같은 메소드를, cheaper(item) 은 더 싼 경로를 실행하고 그런 경로가 없으면 None 을 돌려줍니다.
+    """
+    def handle(item):
+        level = controller.begin_item(item)
+        try:
+            if level >= LEVELS.index("stop"):
+                _, resource = controller.pressure()
+                controller.record(item, "stopped")
+                item['prediction'] = f"Error: Run budget exhausted ({resource})"
+                item['tokens'] = 0
+                return item
+            if level >= LEVELS.index("cheaper_method") and cheaper is not None:
+                result = cheaper(item)
+                if result is not None:
+                    return result
+            if level >= LEVELS.index("fewer_turns") and fewer_turns is not None:
+                controller.record(item, f"max_turns={DEGRADED_MAX_TURNS}")
+                return fewer_turns(item)
+            return run(item)
+        finally:
+            controller.end_item(item)
+    return handle
+
+
+def budgeted_batch(run_batch, controller: BudgetController):
+    """
+    CoT 묶음용. CoT 는 이미 가장 싼 LLM 경로이므로 stop 단계에서만 묶음 전체를 건너뜁니다.
+    """
+    def handle(batch):
+        if controller.level() < LEVELS.index("stop"):
+            return run_batch(batch)
+        _, resource = controller.pressure()
+        for item in batch:
+            controller.record(item, "stopped")
+            item['prediction'] = f"Error: Run budget exhausted ({resource})"
+            item['tokens'] = 0
+        return batch
+    return handle
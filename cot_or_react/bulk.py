@@ -0,0 +1,497 @@
+"""
+T3 제약 대량 계산기: 여러 해에 걸친 NumPy 달력 행렬과 다중 프로세스 풀.
+
+정답 검증이나 부하 시험처럼 제약 묶음 수백만 개를 풀어야 할 때 scheduler.Schedule 의 날짜별 datetime 루프는 너무 느립니다.
+여기서는 기간 전체의 달력을 한 번 행렬(열: ordinal, 요일, 공휴일, 일, 월 번호, 주 시작 요일별 몇째 주 / 그 달의 마지막 주)로
+만들어 두고, 제약 묶음 하나를 불리언 마스크와 간격(stride) 선택으로 풉니다. 행렬은 공유 메모리에 한 번 올려
+작업 프로세스들이 복사 없이 같이 읽습니다. 결과는 Schedule 과 같고(--check 로 항목마다 대조), 행렬 기간을 벗어나는
+묶음과 선호 날짜(preferred_dates)처럼 날짜 몇 개만 보는 경우는 Schedule 로 풉니다.
+
+numpy 는 선택 의존성으로, 이 모듈을 쓸 때만 import 합니다. 공휴일은 기본으로 이벤트 KB 에서 가져오고(KASI 조회 없음),
+--holidays kasi 면 HolidayCalendar 의 KASI 경로(실패한 연도는 KB), --kasi-replay 면 녹화해 둔 카세트(kasi_cassette)에서 가져옵니다.
+KASI 조회는 연도마다 열두 번이므로 --years 를 필요한 기간으로 좁혀 쓰는 것이 좋습니다.
+
+    python -m cot_or_react.bulk --input data/T3_dataset.json --workers 8 --repeat 2000 --check
+    python -m cot_or_react.bulk --input workload.jsonl --workers 8 --output predictions.jsonl
+    python -m cot_or_react.bulk --input data/T3_dataset.json --years 2020-2028 --kasi-replay kasi.jsonl --check
+"""
+import argparse
+import calendar
+import json
+import os
+import sys
+import time
+from collections import Counter, deque
+from datetime import date, timedelta
+
+from cot_or_react.kasi_cassette import parse_replay
+from cot_or_react.scheduler import DEFAULT_COUNT, MAX_SCAN_DAYS, STUCK_STEPS, HolidayCalendar, Schedule
+
+
+# 행렬 열. WOM_k / LAST_WOM_k 는 k 요일(0=월요일) 시작 기준 그 날의 주 번호와 그 달 마지막 날의 주 번호입니다.
+COLUMNS = (
+    "ordinal", "weekday", "holiday", "day", "month_index", "month_length",
+    *(f"wom_{k}" for k in range(7)), *(f"last_wom_{k}" for k in range(7)),
+)
+COLUMN = {name: i for i, name in enumerate(COLUMNS)}
+
+DEFAULT_YEARS = (2000, 2040)
+DEFAULT_BATCH_SIZE = 512
+HOLIDAY_SOURCES = ("kb", "kasi")
+
+
+def _require_numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise RuntimeError("bulk scheduling requires the 'numpy' package (pip install numpy)") from e
+    return numpy
+
+
+def parse_years(spec: str) -> tuple:
+    """
+    'YYYY-YYYY' 를 (첫 해, 마지막 해) 로 바꿉니다. argparse 의 type 으로 사용합니다.
+    """
+    first, _, last = str(spec).partition("-")
+    try:
+        years = (int(first), int(last or first))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"years must look like 'YYYY-YYYY', got '{spec}'") from None
+    if not 1 <= years[0] <= years[1] <= 9999:
+        raise argparse.ArgumentTypeError(f"invalid year span '{spec}'")
+    return years
+
+
+def holiday_calendar(source: str = "kb", replay: dict = None) -> HolidayCalendar:
+    """
+    행렬과 Schedule 대체 경로가 같이 쓰는 공휴일 달력. replay(kasi_cassette.parse_replay 의 결과)를 주면 KASI 호출을
+    카세트로 돌리고 KASI 경로를 씁니다. 작업 프로세스도 같은 인자로 달력을 다시 만듭니다.
+    """
+    if source == "kb" and replay is None:
+        return HolidayCalendar()
+    from cot_or_react.tools import fetch_calendar_month, install_http_session
+
+    if replay is not None:
+        from cot_or_react.kasi_cassette import replay_session
+
+        install_http_session(replay_session(replay))
+    return HolidayCalendar(fetch_calendar_month)
+
+
+class CalendarMatrix:
+    """
+    (열 수, 날 수) int32 행렬. 열 하나가 연속된 메모리라 기간 일부를 잘라 쓰는 연산이 빠릅니다.
+    """
+
+    def __init__(self, array, first_ordinal: int):
+        self.array = array
+        self.first = first_ordinal
+        self.size = array.shape[1]
+
+    @classmethod
+    def build(cls, first_year: int, last_year: int, holidays: HolidayCalendar = None):
+        np = _require_numpy()
+        holidays = holidays or HolidayCalendar()
+        first_day, last_day = date(first_year, 1, 1), date(last_year, 12, 31)
+        ordinals = np.arange(first_day.toordinal(), last_day.toordinal() + 1, dtype=np.int32)
+        days = [date.fromordinal(int(o)) for o in ordinals]
+        array = np.zeros((len(COLUMNS), len(days)), dtype=np.int32)
+        array[COLUMN["ordinal"]] = ordinals
+        array[COLUMN["weekday"]] = (ordinals - 1) % 7
+        array[COLUMN["day"]] = [d.day for d in days]
+        array[COLUMN["month_index"]] = [d.year * 12 + d.month - 1 for d in days]
+        holiday_days = set()
+        for year in range(first_year, last_year + 1):
+            holiday_days |= holidays.year(year)
+        array[COLUMN["holiday"]] = [d in holiday_days for d in days]
+
+        # 1일의 요일과 말일로 주 번호를 계산합니다: (일 + (1일 요일 - 주 시작 요일) % 7 - 1) // 7 + 1
+        day = array[COLUMN["day"]]
+        first_weekday = (array[COLUMN["weekday"]] - day + 1) % 7
+        month_length = np.array([calendar.monthrange(d.year, d.month)[1] for d in days], dtype=np.int32)
+        array[COLUMN["month_length"]] = month_length
+        for k in range(7):
+            offset = (first_weekday - k) % 7
+            array[COLUMN[f"wom_{k}"]] = (day + offset - 1) // 7 + 1
+            array[COLUMN[f"last_wom_{k}"]] = (month_length + offset - 1) // 7 + 1
+        return cls(array, first_day.toordinal())
+
+    def index(self, day: date):
+        i = day.toordinal() - self.first
+        return i if 0 <= i < self.size else None
+
+    def column(self, name: str, start: int, stop: int):
+        return self.array[COLUMN[name], start:stop]
+
+    def is_holiday(self, day: date) -> bool:
+        return bool(self.array[COLUMN["holiday"], day.toordinal() - self.first])
+
+
+class MatrixHolidays:
+    """
+    Schedule 에 넘기는 공휴일 집합. 행렬 기간 안은 행렬에서, 밖은 행렬을 만든 것과 같은 출처의 달력에서 찾습니다.
+    """
+
+    def __init__(self, matrix: CalendarMatrix, outside: HolidayCalendar = None):
+        self.matrix = matrix
+        self._outside = outside or HolidayCalendar()
+
+    def __contains__(self, day: date) -> bool:
+        if self.matrix.index(day) is not None:
+            return self.matrix.is_holiday(day)
+        return day in self._outside
+
+
+class OutOfSpan(Exception):
+    """
+    필요한 기간이 행렬을 벗어났습니다. 호출한 쪽이 Schedule 로 다시 풉니다.
+    """
+
+
+class VectorSchedule:
+    """
+    Schedule 의 제약 해석(필드 파싱, 시작점, 선호 날짜, 공휴일 조정)은 그대로 쓰고 날짜 생성만 행렬 연산으로 바꿉니다.
+    """
+
+    def __init__(self, schedule: Schedule, matrix: CalendarMatrix):
+        self.np = _require_numpy()
+        self.s = schedule
+        self.m = matrix
+
+    def _window(self, start: date, stop: date) -> tuple:
+        a, b = start.toordinal() - self.m.first, stop.toordinal() - self.m.first + 1
+        if a < 0:
+            raise OutOfSpan(start)
+        return a, max(a, min(b, self.m.size)), b > self.m.size
+
+    def _mask(self, a: int, b: int):
+        """
+        Schedule.allowed 를 [a, b) 구간 전체에 한 번에 적용한 마스크.
+        """
+        np, s, m = self.np, self.s, self.m
+        weekday = m.column("weekday", a, b)
+        mask = np.ones(b - a, dtype=bool)
+        low, high = s.range
+        if low:
+            mask[:max(0, min(b, low.toordinal() - m.first) - a)] = False
+        if high:
+            mask[max(0, high.toordinal() - m.first + 1 - a):] = False
+        if s.excluded or s.only:
+            table = np.ones(7, dtype=bool)
+            table[list(s.excluded)] = False
+            if s.only:
+                table[[k for k in range(7) if k not in s.only]] = False
+            mask &= table[weekday]
+        for day in s.exclude_dates:
+            i = day.toordinal() - m.first - a if day else -1
+            if 0 <= i < b - a:
+                mask[i] = False
+        if s.pattern:
+            table = np.array([s.pattern(k) for k in range(32)], dtype=bool)
+            mask &= table[m.column("day", a, b)]
+        if s.week_numbers:
+            if s.only:
+                # Schedule._in_week 처럼 요일이 정해져 있으면 그 요일이 앞(뒤)에서 몇 번째로 나온 날인지로 셉니다.
+                day = m.column("day", a, b)
+                week, from_end = (day - 1) // 7 + 1, (m.column("month_length", a, b) - day) // 7 + 1
+            else:
+                week = m.column(f"wom_{s.week_start}", a, b)
+                from_end = m.column(f"last_wom_{s.week_start}", a, b) + 1 - week
+            in_week = np.zeros(b - a, dtype=bool)
+            for n in s.week_numbers:
+                in_week |= (week == n) if n > 0 else (from_end == -n)
+            mask &= in_week
+        if s.c.get("week_position") == "last":
+            month_end = s._month_end_for_last_week(None)
+            week_first = month_end.toordinal() - (month_end.weekday() - s.week_start) % 7
+            ordinal = m.column("ordinal", a, b)
+            mask &= (ordinal >= week_first) & (ordinal <= week_first + 6)
+        if s.c.get("exclude_holidays"):
+            mask &= m.column("holiday", a, b) == 0
+        return mask
+
+    def _finish(self, a: int, positions, truncated: bool) -> list:
+        if self.s.count:
+            positions = positions[:self.s.count]
+        if truncated and not (self.s.count and len(positions) >= self.s.count):
+            raise OutOfSpan()
+        return [date.fromordinal(self.m.first + a + int(p)) for p in positions]
+
+    def _scan(self, start: date, step_days: int) -> list:
+        stop = start + timedelta(days=MAX_SCAN_DAYS)
+        if self.s.range[1]:
+            stop = min(stop, self.s.range[1])
+        a, b, truncated = self._window(start, stop)
+        mask = self._mask(a, b)
+        positions = self.np.arange(0, b - a, step_days)
+        return self._finish(a, positions[mask[positions]], truncated)
+
+    def _stepped(self, start: date, interval: int) -> list:
+        # Schedule._stepped 와 같은 걸음: 막힌 격자(앞으로 STUCK_STEPS 단계 모두 불가)면 다음 허용일로 옮깁니다.
+        stop = start + timedelta(days=MAX_SCAN_DAYS)
+        if self.s.range[1]:
+            stop = min(stop, self.s.range[1])
+        a, b, truncated = self._window(start, stop)
+        mask = self._mask(a, b)
+        picked, i = [], 0
+        while i < b - a:
+            if mask[i]:
+                picked.append(i)
+                if self.s.count and len(picked) >= self.s.count:
+                    break
+                i += interval
+                continue
+            ahead = range(i + interval, min(b - a, i + interval * STUCK_STEPS + 1), interval)
+            if not any(mask[j] for j in ahead):
+                later = self.np.flatnonzero(mask[i:])
+                if not len(later):
+                    break
+                i += int(later[0])
+                continue
+            i += interval
+        return self._finish(a, picked, truncated)
+
+    def _first_allowed(self, start: date) -> date:
+        a, b, truncated = self._window(start, start + timedelta(days=MAX_SCAN_DAYS - 1))
+        mask = self._mask(a, b)
+        if mask.any():
+            return start + timedelta(days=int(mask.argmax()))
+        if truncated:
+            raise OutOfSpan()
+        return start + timedelta(days=MAX_SCAN_DAYS)
+
+    def _business_steps(self, start: date, steps: int) -> list:
+        np, s = self.np, self.s
+        a, b, truncated = self._window(start, start + timedelta(days=MAX_SCAN_DAYS))
+        table = np.array([k < 5 and k not in s.excluded for k in range(7)], dtype=bool)
+        business = table[self.m.column("weekday", a, b)] & (self.m.column("holiday", a, b) == 0)
+        # 시작일 다음 날부터 센 영업일 순번이 steps 의 배수인 영업일이 고를 날짜입니다.
+        rank = np.cumsum(business) - business[0]
+        picked = business & (rank % steps == 0)
+        if s.range[1]:
+            picked[max(0, s.range[1].toordinal() - self.m.first + 1 - a):] = False
+        # 시작일은 범위와 상관없이 영업일이면 들어갑니다(Schedule._business_steps 와 같음).
+        picked[0] = business[0]
+        count = s.count or DEFAULT_COUNT
+        positions = np.flatnonzero(picked)[:count]
+        if truncated and len(positions) < count:
+            raise OutOfSpan()
+        return [date.fromordinal(self.m.first + a + int(p)) for p in positions]
+
+    def _weekly(self, start: date, weeks: int) -> list:
+        if not self.s.only:
+            return self._scan(self._first_allowed(start), 7 * weeks)
+        week_start = start - timedelta(days=start.weekday())
+        a, b, truncated = self._window(week_start, week_start + timedelta(days=7 * weeks * (MAX_SCAN_DAYS // 7) - 1))
+        positions = self.np.arange(b - a)
+        keep = self._mask(a, b) & ((positions // 7) % weeks == 0) & (positions >= (start - week_start).days)
+        return self._finish(a, self.np.flatnonzero(keep), truncated)
+
+    def _monthly(self, start: date, months: int) -> list:
+        first_month = start.year * 12 + start.month - 1
+        # Schedule._monthly 처럼 120 번째 달까지 봅니다.
+        last_month = min(first_month + 120 * months - 1, 9999 * 12 + 11)
+        year, month = divmod(last_month, 12)
+        a, b, truncated = self._window(start, date(year, month + 1, calendar.monthrange(year, month + 1)[1]))
+        month_index = self.m.column("month_index", a, b)
+        keep = self._mask(a, b) & ((month_index - first_month) % months == 0)
+        return self._finish(a, self.np.flatnonzero(keep), truncated)
+
+    def dates(self) -> list:
+        s = self.s
+        start = s.start()
+        interval = s._interval_days()
+        if s.c.get("preferred_dates"):
+            days = s._preferred()
+        elif s.c.get("interval_business_days"):
+            days = self._business_steps(start, max(1, int(s.c["interval_business_days"])))
+        elif interval:
+            days = self._stepped(start, interval)
+        elif s.c.get("interval_weeks"):
+            days = self._weekly(start, int(s.c["interval_weeks"]))
+        elif s.c.get("interval_months"):
+            days = self._monthly(start, int(s.c["interval_months"]))
+        else:
+            days = self._scan(start, 1)
+        days = s._adjust(days)
+        if s.count:
+            days = days[:s.count]
+        return [day.isoformat() for day in days]
+
+
+def solve(matrix: CalendarMatrix, holidays: MatrixHolidays, constraints: dict, anchor_date: str, check: bool = False) -> dict:
+    """
+    제약 묶음 하나를 풉니다. {"prediction", "path": "vector" | "fallback"} 이고, check 면 Schedule 결과와 대조한 "mismatch" 를 더합니다.
+    """
+    schedule = Schedule(constraints, anchor_date, holidays)
+    try:
+        result = {"prediction": VectorSchedule(schedule, matrix).dates(), "path": "vector"}
+    except OutOfSpan:
+        return {"prediction": schedule.dates(), "path": "fallback"}
+    if check:
+        result["mismatch"] = result["prediction"] != Schedule(constraints, anchor_date, holidays).dates()
+    return result
+
+
+def solve_batch(matrix: CalendarMatrix, holidays: MatrixHolidays, batch: list, check: bool = False) -> list:
+    results = []
+    for constraints, anchor_date in batch:
+        try:
+            results.append(solve(matrix, holidays, constraints, anchor_date, check))
+        except Exception as e:
+            results.append({"prediction": {"error": str(e)}, "path": "error"})
+    return results
+
+
+# --- 다중 프로세스 -------------------------------------------------------------------
+
+_WORKER = {}
+
+
+def _attach(name: str, shape: tuple, first_ordinal: int, source: str, replay: dict):
+    """
+    작업 프로세스 초기화: 부모가 올린 공유 메모리 행렬을 복사 없이 열고, 행렬 밖 날짜용 달력을 같은 출처로 만듭니다.
+    """
+    np = _require_numpy()
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(name=name)
+    matrix = CalendarMatrix(np.ndarray(shape, dtype=np.int32, buffer=shm.buf), first_ordinal)
+    _WORKER.update(shm=shm, matrix=matrix, holidays=MatrixHolidays(matrix, holiday_calendar(source, replay)))
+
+
+def _worker_batch(batch: list, check: bool) -> list:
+    return solve_batch(_WORKER["matrix"], _WORKER["holidays"], batch, check)
+
+
+def _batches(records, batch_size: int):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def solve_bulk(matrix: CalendarMatrix, records, workers: int = 1, batch_size: int = DEFAULT_BATCH_SIZE, check: bool = False,
+               source: str = "kb", replay: dict = None):
+    """
+    (constraints, anchor_date) 들을 입력 순서대로 풀어 결과를 하나씩 내보냅니다. 입력은 스트림으로 읽고,
+    진행 중인 묶음은 작업 프로세스 수의 두 배까지만 두어 메모리를 일정하게 유지합니다.
+    source / replay 는 행렬을 만들 때 쓴 공휴일 출처로, 행렬 밖 날짜를 같은 출처에서 찾는 데 씁니다.
+    """
+    if workers <= 1:
+        holidays = MatrixHolidays(matrix, holiday_calendar(source, replay))
+        for batch in _batches(records, batch_size):
+            yield from solve_batch(matrix, holidays, batch, check)
+        return
+
+    np = _require_numpy()
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(create=True, size=matrix.array.nbytes)
+    try:
+        np.ndarray(matrix.array.shape, dtype=np.int32, buffer=shm.buf)[:] = matrix.array
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                 initargs=(shm.name, matrix.array.shape, matrix.first, source, replay)) as executor:
+            pending = deque()
+            for batch in _batches(records, batch_size):
+                pending.append(executor.submit(_worker_batch, batch, check))
+                while len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def read_records(path: str, repeat: int = 1):
+    """
+    데이터셋 JSON 배열 또는 한 줄에 항목 하나인 JSONL 에서 constraints 가 있는 항목을 읽습니다. repeat 번 반복합니다.
+    """
+    for _ in range(repeat):
+        with open(path, "r", encoding="utf-8") as f:
+            if path.endswith(".jsonl"):
+                items = (json.loads(line) for line in f if line.strip())
+            else:
+                items = iter(json.load(f))
+            for item in items:
+                if isinstance(item.get("constraints"), dict) and item.get("anchor_date"):
+                    yield item
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Solve T3 constraint sets in bulk with a shared NumPy calendar matrix.")
+    parser.add_argument('--input', type=str, required=True, help="Dataset JSON array or JSONL with 'constraints' and 'anchor_date'.")
+    parser.add_argument('--output', type=str, default=None, help="Write {id, prediction} per item as JSONL.")
+    parser.add_argument('--years', type=parse_years, default=DEFAULT_YEARS, help="Calendar matrix span (default: 2000-2040).")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Worker processes (1 solves in-process).")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Constraint sets per worker task.")
+    parser.add_argument('--repeat', type=int, default=1, help="Read the input this many times (stress test).")
+    parser.add_argument('--check', action='store_true', help="Also solve every set with the scalar Schedule and count mismatches.")
+    parser.add_argument('--holidays', type=str, choices=HOLIDAY_SOURCES, default="kb",
+                        help="Holiday source: the event KB (offline) or KASI, falling back to the KB for years that cannot be fetched.")
+    parser.add_argument('--kasi-replay', type=parse_replay, default=None,
+                        metavar='CASSETTE[,latency_ms=MS|recorded][,jitter_ms=MS][,failure_rate=P][,seed=N]',
+                        help="Answer KASI calls from a recorded cassette (implies --holidays kasi).")
+    args = parser.parse_args(argv)
+
+    try:
+        build_start = time.time()
+        holidays = holiday_calendar(args.holidays, args.kasi_replay)
+        matrix = CalendarMatrix.build(*args.years, holidays=holidays)
+        print(f"달력 행렬: {args.years[0]}-{args.years[1]}, {matrix.size}일 x {len(COLUMNS)}열 "
+              f"({matrix.array.nbytes / 1024:.0f}KB, {time.time() - build_start:.2f}초)")
+        sources = Counter(holidays.sources.values())
+        incomplete = [year for year in range(args.years[0], args.years[1] + 1) if not holidays.complete(year)]
+        print(f"  공휴일 출처: {', '.join(f'{name} {n}년' for name, n in sorted(sources.items()))}"
+              + (f" (KB 표 밖이라 고정일 공휴일만 아는 연도 {len(incomplete)}개)" if incomplete else ""))
+
+        items = deque()
+
+        def records():
+            for item in read_records(args.input, args.repeat):
+                items.append((item.get("id"), item.get("gold_standard")))
+                yield item["constraints"], item["anchor_date"]
+
+        counts = {"sets": 0, "vector": 0, "fallback": 0, "error": 0, "mismatch": 0, "gold": 0, "correct": 0}
+        out = open(args.output, "w", encoding="utf-8") if args.output else None
+        start_time = time.time()
+        try:
+            for result in solve_bulk(matrix, records(), args.workers, args.batch_size, args.check,
+                                     args.holidays, args.kasi_replay):
+                item_id, gold = items.popleft()
+                counts["sets"] += 1
+                counts[result["path"]] += 1
+                counts["mismatch"] += bool(result.get("mismatch"))
+                if gold is not None:
+                    counts["gold"] += 1
+                    counts["correct"] += result["prediction"] in (gold, sorted(gold))
+                if out:
+                    out.write(json.dumps({"id": item_id, "prediction": result["prediction"]}, ensure_ascii=False) + "\n")
+        finally:
+            if out:
+                out.close()
+        elapsed = time.time() - start_time
+    except RuntimeError as e:
+        print(f"오류: {e}")
+        return 1
+
+    print(f"제약 묶음 {counts['sets']}개, {elapsed:.2f}초, 초당 {counts['sets'] / elapsed if elapsed else 0:,.0f}개 "
+          f"(작업 프로세스 {max(1, args.workers)}개)")
+    print(f"  행렬 {counts['vector']}, Schedule 대체 {counts['fallback']}, 오류 {counts['error']}")
+    if args.check:
+        print(f"  Schedule 과 다른 결과: {counts['mismatch']}개")
+    if counts["gold"]:
+        print(f"  정답 일치: {counts['correct']}/{counts['gold']}")
+    if args.output:
+        print(f"저장: '{args.output}'")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
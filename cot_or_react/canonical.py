@@ -0,0 +1,40 @@
+"""
+도구 입력 정규화.
+
+같은 의미의 도구 호출(공백·대소문자만 다른 calculator 문자열, 키 순서나 월 표기만 다른
+calendar_db 딕셔너리)이 같은 키를 갖도록 만듭니다. 반복 호출 감지와 메모이제이션이 이 키를 공유합니다.
+"""
+import json
+
+
+def calendar_months(month) -> list:
+    """
+    calendar_db 의 month 값("all", "1,2", "09" 등)을 정렬된 두 자리 월 목록으로 바꿉니다.
+    execute_calendar_db 가 실제로 조회하는 월과 같은 규칙을 따릅니다.
+    """
+    if str(month).lower() == "all":
+        return [f"{i:02d}" for i in range(1, 13)]
+    months = {m.strip().zfill(2) for m in str(month).split(",") if m.strip()}
+    return sorted(months)
+
+
+def canonical_calendar_input(tool_input: dict) -> dict:
+    return {
+        "year": str(tool_input.get("year", "")).strip(),
+        "month": ",".join(calendar_months(tool_input.get("month", ""))),
+        "category": str(tool_input.get("category", "rest")).strip().lower(),
+    }
+
+
+def canonical_tool_input(tool_name: str, tool_input) -> str:
+    """
+    (도구 이름, 입력) 쌍을 비교 가능한 문자열 키로 만듭니다.
+    """
+    if tool_name == "calendar_db" and isinstance(tool_input, dict):
+        tool_input = canonical_calendar_input(tool_input)
+
+    if isinstance(tool_input, str):
+        body = " ".join(tool_input.lower().split())
+    else:
+        body = json.dumps(tool_input, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return f"{tool_name}:{body}"
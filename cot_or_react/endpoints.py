@@ -0,0 +1,212 @@
+"""
+여러 OpenAI 호환 엔드포인트에 호출을 나누는 엔드포인트 풀.
+
+API 키가 여러 개이거나 같은 모델을 서빙하는 자체 서버가 여러 대일 때 한 실행을 나눠 보냅니다.
+각 엔드포인트는 동시 호출 상한(max_concurrency)을 가지며, 풀은 관측한 latency 와 오류율로 정한 가중치를
+진행 중인 호출 수로 나눈 점수가 가장 높은 엔드포인트를 고릅니다. 연속으로 실패한 엔드포인트는 잠시 빼 두고(ejection)
+실패한 호출은 다른 엔드포인트로 다시 보냅니다(failover).
+
+    --endpoint https://api.upstage.ai/v1,api_key_env=UPSTAGE_API_KEY_2,max_concurrency=8
+    --endpoint http://10.0.0.5:8000/v1,max_concurrency=16,weight=2
+"""
+import argparse
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+
+DEFAULT_MAX_CONCURRENCY = 32
+EJECT_AFTER_FAILURES = 3
+EJECT_SECONDS = 30.0
+EWMA_ALPHA = 0.2
+
+ENDPOINT_COUNTERS = ("calls", "errors", "failovers", "ejections", "latency_total")
+
+
+@dataclass
+class EndpointSpec:
+    base_url: str
+    api_key_env: str = "UPSTAGE_API_KEY"
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    weight: float = 1.0
+
+
+def parse_endpoint(spec: str) -> EndpointSpec:
+    """
+    'URL[,api_key_env=NAME][,max_concurrency=N][,weight=W]' 를 EndpointSpec 으로 바꿉니다. argparse 의 type 으로 사용합니다.
+    API 키는 값 대신 환경 변수 이름으로 받아 명령줄과 요약 파일에 남지 않게 합니다.
+    """
+    base_url, *options = [part.strip() for part in str(spec).split(",")]
+    if not base_url.startswith(("http://", "https://")):
+        raise argparse.ArgumentTypeError(f"endpoint must start with http:// or https://, got '{spec}'")
+    endpoint = EndpointSpec(base_url=base_url.rstrip("/"))
+    for option in options:
+        name, _, value = option.partition("=")
+        try:
+            if name == "api_key_env" and value:
+                endpoint.api_key_env = value
+            elif name == "max_concurrency" and int(value) >= 1:
+                endpoint.max_concurrency = int(value)
+            elif name == "weight" and float(value) > 0:
+                endpoint.weight = float(value)
+            else:
+                raise ValueError(option)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid endpoint option '{option}' in '{spec}'") from None
+    return endpoint
+
+
+def is_client_error(error: Exception) -> bool:
+    """
+    요청 자체가 잘못된 오류(400, 401 등)인지 확인합니다. 이런 오류는 다른 엔드포인트로 보내도 같으므로 failover 하지 않습니다.
+    """
+    status = getattr(error, "status_code", None)
+    return isinstance(status, int) and 400 <= status < 500 and status not in (408, 409, 429)
+
+
+class Endpoint:
+    def __init__(self, spec: EndpointSpec, client=None, max_retries: int = None):
+        self.spec = spec
+        self.label = spec.base_url
+        self._client = client
+        self._client_lock = threading.Lock()
+        self._max_retries = max_retries
+        self.in_flight = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.latency_ewma = None
+        self.error_ewma = 0.0
+        self.counts = dict.fromkeys(ENDPOINT_COUNTERS, 0)
+        self.counts["latency_total"] = 0.0
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from openai import OpenAI
+
+                    kwargs = {"api_key": os.getenv(self.spec.api_key_env, "PUT YOUR API KEY HERE"), "base_url": self.spec.base_url}
+                    if self._max_retries is not None:
+                        kwargs["max_retries"] = self._max_retries
+                    self._client = OpenAI(**kwargs)
+        return self._client
+
+    def score(self, default_latency: float) -> float:
+        latency = self.latency_ewma if self.latency_ewma is not None else default_latency
+        return self.spec.weight * (1.0 - self.error_ewma) / max(latency, 1e-3) / (self.in_flight + 1)
+
+
+class EndpointPool:
+    """
+    run(func) 이 고른 엔드포인트의 OpenAI 클라이언트로 func(client) 를 실행합니다. 스트리밍 호출도 func 안에서
+    끝까지 읽으므로 동시 호출 상한은 응답을 모두 받을 때까지 유지됩니다.
+    """
+
+    def __init__(self, specs: list, client=None, eject_after: int = EJECT_AFTER_FAILURES, eject_seconds: float = EJECT_SECONDS):
+        # 엔드포인트가 여럿이면 openai 의 자체 재시도 대신 다른 엔드포인트로 넘깁니다.
+        max_retries = 0 if len(specs) > 1 else None
+        self.endpoints = [Endpoint(spec, client if i == 0 else None, max_retries) for i, spec in enumerate(specs)]
+        # 같은 URL 을 다른 키로 여러 번 쓸 수 있으므로 통계 이름에 키 환경 변수와 순번을 붙여 구분합니다.
+        for i, endpoint in enumerate(self.endpoints):
+            endpoint.label = endpoint.spec.base_url
+            if sum(e.spec.base_url == endpoint.spec.base_url for e in self.endpoints) > 1:
+                endpoint.label = f"{endpoint.spec.base_url} [{i}:{endpoint.spec.api_key_env}]"
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self._cond = threading.Condition()
+
+    def __len__(self):
+        return len(self.endpoints)
+
+    def _pick(self, exclude: set):
+        now = time.time()
+        candidates = [e for e in self.endpoints if e not in exclude]
+        healthy = [e for e in candidates if e.ejected_until <= now]
+        if not healthy and candidates:
+            # 모두 빠져 있으면 가장 먼저 복귀할 엔드포인트로 시도합니다.
+            healthy = [min(candidates, key=lambda e: e.ejected_until)]
+        free = [e for e in healthy if e.in_flight < e.spec.max_concurrency]
+        if not free:
+            return None
+        known = [e.latency_ewma for e in self.endpoints if e.latency_ewma is not None]
+        default_latency = sum(known) / len(known) if known else 1.0
+        return max(free, key=lambda e: e.score(default_latency))
+
+    def acquire(self, exclude: set = frozenset()) -> Endpoint:
+        """
+        상한에 여유가 있는 엔드포인트가 생길 때까지 기다렸다가 하나를 고르고 진행 중 호출 수를 올립니다.
+        """
+        with self._cond:
+            while True:
+                endpoint = self._pick(exclude)
+                if endpoint is not None:
+                    endpoint.in_flight += 1
+                    return endpoint
+                self._cond.wait(timeout=1.0)
+
+    def release(self, endpoint: Endpoint, latency: float, error: Exception = None):
+        with self._cond:
+            endpoint.in_flight -= 1
+            endpoint.counts["calls"] += 1
+            failed = error is not None and not is_client_error(error)
+            endpoint.error_ewma = (1 - EWMA_ALPHA) * endpoint.error_ewma + EWMA_ALPHA * failed
+            if failed:
+                endpoint.counts["errors"] += 1
+                endpoint.consecutive_failures += 1
+                if endpoint.consecutive_failures >= self.eject_after and endpoint.ejected_until <= time.time():
+                    endpoint.ejected_until = time.time() + self.eject_seconds
+                    endpoint.counts["ejections"] += 1
+            else:
+                endpoint.consecutive_failures = 0
+                endpoint.counts["latency_total"] += latency
+                endpoint.latency_ewma = latency if endpoint.latency_ewma is None else (
+                    (1 - EWMA_ALPHA) * endpoint.latency_ewma + EWMA_ALPHA * latency
+                )
+            self._cond.notify_all()
+
+    def run(self, func):
+        """
+        func(client) 를 실행합니다. 실패하면 아직 시도하지 않은 다른 엔드포인트로 다시 보내고, 모두 실패하면 마지막 오류를 올립니다.
+        """
+        tried = set()
+        while True:
+            endpoint = self.acquire(tried)
+            start_time = time.time()
+            try:
+                result = func(endpoint.client)
+            except Exception as e:
+                self.release(endpoint, time.time() - start_time, e)
+                tried.add(endpoint)
+                if is_client_error(e) or len(tried) >= len(self.endpoints):
+                    raise
+                with self._cond:
+                    endpoint.counts["failovers"] += 1
+                continue
+            self.release(endpoint, time.time() - start_time)
+            return result
+
+    def stats(self) -> dict:
+        """
+        {엔드포인트 이름: 누적 통계}. 호출별 평균 latency 는 endpoint_summary 가 계산합니다.
+        """
+        with self._cond:
+            return {e.label: dict(e.counts, latency_total=round(e.counts["latency_total"], 4)) for e in self.endpoints}
+
+
+def endpoint_summary(totals: dict) -> dict:
+    """
+    엔드포인트별 누적 통계에 성공 호출 평균 latency 와 오류율을 더합니다. 합계도 남겨 샤드 병합 때 다시 계산할 수 있게 합니다.
+    """
+    summary = {}
+    for label, counts in totals.items():
+        counts = {key: counts.get(key, 0) for key in ENDPOINT_COUNTERS}
+        successes = counts["calls"] - counts["errors"]
+        summary[label] = dict(
+            counts,
+            latency_total=round(counts["latency_total"], 4),
+            mean_latency=round(counts["latency_total"] / successes, 4) if successes else None,
+            error_rate=round(counts["errors"] / counts["calls"], 4) if counts["calls"] else 0.0,
+        )
+    return summary
@@ -0,0 +1,180 @@
+"""
+한국 문화·학사 이벤트 로컬 지식베이스.
+
+`search` 도구는 원래 매 호출마다 solar-pro2 에게 검색 엔진 흉내를 시켰습니다.
+이 모듈은 data/event_kb.json 에 정리된 반복 이벤트(수능, 어버이날, 김장철, 명절 등)의
+날짜를 바이그램 역색인으로 찾아 바로 돌려주고, KB 에 없는 질의만 LLM 검색으로 넘기게 합니다.
+"""
+import json
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter
+from datetime import date
+
+
+KB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "event_kb.json")
+
+# 별칭 바이그램 중 질의에 포함되어야 하는 최소 비율 (띄어쓰기·조사·오타 한두 글자는 허용)
+MATCH_THRESHOLD = 0.7
+
+WEEKDAYS_KO = "월화수목금토일"
+
+# 공휴일 항목(음력 명절, 대체공휴일, 선거일, 임시공휴일)이 빠짐없이 채워진 연도 범위(양 끝 포함).
+# 이 밖의 연도는 고정일 공휴일만 알 수 있습니다.
+HOLIDAY_YEARS = (2020, 2028)
+
+
+def normalize(text: str) -> str:
+    """
+    NFKC 정규화 후 소문자화하고, 한글/영문/숫자 이외의 문자(공백, 구두점 등)를 제거합니다.
+    """
+    text = unicodedata.normalize("NFKC", str(text)).lower()
+    return re.sub(r"[^0-9a-z가-힣]", "", text)
+
+
+def _bigrams(text: str) -> set:
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _fmt(date_str: str) -> str:
+    d = date.fromisoformat(date_str)
+    return f"{date_str}({WEEKDAYS_KO[d.weekday()]})"
+
+
+class EventKB:
+    """
+    이벤트 목록 위에 별칭 바이그램 역색인을 만들어 퍼지 조회를 제공합니다.
+    조회 적중/미적중 횟수는 스레드 안전하게 집계됩니다.
+    """
+
+    def __init__(self, events: list):
+        self.events = events
+        self._aliases = []   # (event_idx, 정규화된 별칭, 바이그램 집합)
+        self._index = {}     # 바이그램 -> 별칭 인덱스 목록
+        for event_idx, event in enumerate(events):
+            for alias in [event["name"]] + event.get("aliases", []):
+                norm = normalize(alias)
+                grams = _bigrams(norm)
+                alias_idx = len(self._aliases)
+                self._aliases.append((event_idx, norm, grams))
+                for gram in grams:
+                    self._index.setdefault(gram, []).append(alias_idx)
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path: str = KB_PATH) -> "EventKB":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def match(self, query: str) -> list:
+        """
+        질의와 가장 잘 맞는 이벤트들을 반환합니다. 임계값을 넘는 후보가 없으면 빈 리스트입니다.
+        """
+        query_grams = _bigrams(normalize(query))
+        overlap = Counter()
+        for gram in query_grams:
+            for alias_idx in self._index.get(gram, ()):
+                overlap[alias_idx] += 1
+
+        best_by_event = {}
+        for alias_idx, count in overlap.items():
+            event_idx, norm, grams = self._aliases[alias_idx]
+            score = count / len(grams)
+            if score < MATCH_THRESHOLD:
+                continue
+            # 점수가 같으면 더 긴 별칭(더 구체적인 매칭)을 우선합니다.
+            key = (score, len(norm))
+            if key > best_by_event.get(event_idx, (0, 0)):
+                best_by_event[event_idx] = key
+
+        if not best_by_event:
+            return []
+        top = max(best_by_event.values())
+        return [self.events[i] for i, key in sorted(best_by_event.items()) if key == top]
+
+    @staticmethod
+    def occurrences(event: dict, year: int = None) -> list:
+        """
+        이벤트의 날짜 목록을 반환합니다. 고정일 이벤트(`fixed`)는 연도가 주어질 때만 날짜를 만듭니다.
+        """
+        if "fixed" in event:
+            return [{"date": f"{year}-{event['fixed']}"}] if year else []
+        occs = event.get("occurrences", [])
+        if year:
+            occs = [o for o in occs if o["date"].startswith(f"{year}-")]
+        return occs
+
+    def describe(self, event: dict, year: int = None) -> str:
+        """
+        이벤트 정보를 검색 결과처럼 짧은 한 줄로 요약합니다. 해당 연도 기록이 없으면 None 입니다.
+        """
+        if "fixed" in event and not year:
+            return f"{event['name']}: 매년 {event['fixed']}"
+
+        parts = []
+        for occ in self.occurrences(event, year):
+            text = _fmt(occ["date"])
+            if "start" in occ or "end" in occ:
+                text += f", 연휴/기간 {_fmt(occ.get('start', occ['date']))} ~ {_fmt(occ.get('end', occ['date']))}"
+            parts.append(text)
+        if not parts:
+            return None
+        prefix = f"{year}년 {event['name']}" if year else event["name"]
+        return f"{prefix}: " + "; ".join(parts)
+
+    def lookup(self, query: str) -> str:
+        """
+        검색 질의를 KB 에서 찾아 관측 문자열을 반환합니다. 찾지 못하면 None 을 반환합니다.
+        """
+        year_match = re.search(r"(19|20)\d{2}", str(query))
+        year = int(year_match.group(0)) if year_match else None
+        stripped = re.sub(r"(19|20)\d{2}\s*년?", " ", str(query))
+
+        answers = [self.describe(event, year) for event in self.match(stripped)]
+        answers = [a for a in answers if a]
+        with self._lock:
+            if answers:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return " / ".join(answers) if answers else None
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+_default_kb = None
+_default_lock = threading.Lock()
+
+
+def get_kb() -> EventKB:
+    """
+    data/event_kb.json 으로부터 기본 KB 를 한 번만 로드해 공유합니다.
+    """
+    global _default_kb
+    if _default_kb is None:
+        with _default_lock:
+            if _default_kb is None:
+                _default_kb = EventKB.load()
+    return _default_kb
+
+
+def lookup(query: str) -> str:
+    return get_kb().lookup(query)
+
+
+def stats() -> dict:
+    return get_kb().stats()
@@ -0,0 +1,296 @@
+"""
+결과 파일을 열 지향(Parquet) 테이블로 내보내고, 실행 사이를 비교합니다.
+
+실행마다 `{task}_{method}_results*.json` 을 읽어 타입이 정해진 열(id, prediction, gold, correct, latency,
+prompt/completion 토큰, turns, route, cache_hits 등)로 바꾸고, Task / 메소드별 디렉터리에 나눠 씁니다.
+도구 모드가 다른 결과(`t3_react_results.json` 과 `t3_react_results_llm_tools.json`)는 결과 파일처럼 파일 이름으로 나눕니다.
+
+    <table-dir>/task=t1/method=cot/<run>.parquet
+    <table-dir>/task=t3/method=react/<run>_llm_tools.parquet
+
+여러 실행의 집계나 비교는 필요한 열만 읽는 스캔이 되므로 큰 JSON 배열을 통째로 파싱할 필요가 없습니다.
+pyarrow 는 선택 의존성으로, 이 모듈을 쓸 때만 import 합니다.
+
+    python -m cot_or_react.export write --results-dir results/solar --run solar-0601 --table-dir results/table
+    python -m cot_or_react.export summary --table-dir results/table
+    python -m cot_or_react.export diff --table-dir results/table --base solar-0601 --other solar-0605
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+
+from cot_or_react.agent import is_error_prediction
+from cot_or_react.router import is_correct
+from cot_or_react.tasks import DATA_DIR, load_dataset
+from cot_or_react.trace_store import expand, find_trace_file
+
+
+RESULT_FILE_RE = re.compile(r"^(?P<task>t\d+)_(?P<method>[a-z-]+)_results(?:_(?P<tool_mode>[a-z]+)_tools)?\.json$")
+PARTITION_KEYS = ("task", "method")
+# 파티션 디렉터리 안에서 도구 모드는 파일 이름으로 나누고, 집계와 비교는 tool_mode 열로 구분합니다.
+GROUP_KEYS = ("run", "task", "method", "tool_mode")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise RuntimeError("columnar export requires the 'pyarrow' package (pip install pyarrow)") from e
+    return pyarrow, pyarrow.parquet
+
+
+def schema():
+    pa, _ = _require_pyarrow()
+    return pa.schema([
+        ("run", pa.string()),
+        ("id", pa.string()),
+        ("position", pa.int32()),
+        ("model", pa.string()),
+        ("tool_mode", pa.string()),
+        ("prediction", pa.string()),
+        ("gold", pa.string()),
+        ("correct", pa.bool_()),
+        ("error", pa.bool_()),
+        ("latency", pa.float64()),
+        ("tokens", pa.int64()),
+        ("prompt_tokens", pa.int64()),
+        ("completion_tokens", pa.int64()),
+        ("turns", pa.int32()),
+        ("route", pa.string()),
+        ("cache_hits", pa.int32()),
+    ])
+
+
+def _text(value):
+    # 리스트(T3 예측)나 오류 딕셔너리는 JSON 문자열로 저장합니다.
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _turns(item: dict) -> int:
+    turns = sum(1 for key in item if key.startswith("react_turn_"))
+    if turns:
+        return turns
+    return 1 if "react_step1_output" in item else 0
+
+
+def _cache_hits(item: dict) -> int:
+    guard = item.get("react_guard")
+    if isinstance(guard, dict) and "memo_hits" in guard:
+        return guard["memo_hits"]
+    return sum(1 for key, value in item.items() if key.startswith("react_turn_") and isinstance(value, dict) and value.get("source") == "memo")
+
+
+def _route(item: dict):
+    route = item.get("route")
+    return route.get("route") if isinstance(route, dict) else route
+
+
+def item_row(item: dict, position: int, run: str, model: str, tool_mode: str, task: str, method: str) -> dict:
+    prediction = item.get("prediction")
+    usage = item.get("usage") or {}
+    return {
+        "run": run,
+        "task": task,
+        "method": method,
+        "id": item.get("id"),
+        "position": position,
+        "model": model,
+        "tool_mode": tool_mode,
+        "prediction": _text(prediction),
+        "gold": _text(item.get("gold_standard")),
+        "correct": is_correct(prediction, item.get("gold_standard")) if "gold_standard" in item else None,
+        "error": is_error_prediction(prediction),
+        "latency": item.get("latency"),
+        "tokens": item.get("tokens"),
+        "prompt_tokens": usage.get("prompt_tokens"),
+        "completion_tokens": usage.get("completion_tokens"),
+        "turns": _turns(item),
+        "route": _route(item),
+        "cache_hits": _cache_hits(item),
+    }
+
+
+def result_rows(path: str, run: str, data_dir: str = DATA_DIR) -> list:
+    """
+    결과 파일 하나를 행 목록으로 바꿉니다. 슬림 결과 파일이면 트레이스와 데이터셋 입력을 합쳐 읽습니다.
+    """
+    match = RESULT_FILE_RE.match(os.path.basename(path))
+    task, method = match.group("task"), match.group("method")
+    summary_path = path[:-len(".json")] + ".summary.json"
+    summary = {}
+    if os.path.exists(summary_path):
+        with open(summary_path, "r", encoding="utf-8") as f:
+            summary = json.load(f)
+
+    if find_trace_file(path):
+        items = expand(path, load_dataset(task, data_dir))
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            items = json.load(f)
+    model = summary.get("model")
+    tool_mode = summary.get("tool_mode") or match.group("tool_mode") or "real"
+    return [item_row(item, position, run, model, tool_mode, task, method) for position, item in enumerate(items)]
+
+
+def result_files(results_dir: str) -> list:
+    return sorted(
+        path for path in glob.glob(os.path.join(results_dir, "*_results*.json"))
+        if RESULT_FILE_RE.match(os.path.basename(path))
+    )
+
+
+def partition_filename(run: str, tool_mode: str) -> str:
+    """
+    tasks.output_filename 과 같은 규칙: real 도구면 `<run>.parquet`, 아니면 `<run>_<mode>_tools.parquet`.
+    """
+    return f"{run}.parquet" if tool_mode == "real" else f"{run}_{tool_mode}_tools.parquet"
+
+
+def write_run(results_dir: str, run: str, table_dir: str, data_dir: str = DATA_DIR) -> list:
+    """
+    results_dir 의 결과 파일을 모두 읽어 `<table_dir>/task=<t>/method=<m>/<run>[_<mode>_tools].parquet` 로 씁니다.
+    같은 run 으로 다시 쓰면 해당 파티션 파일을 덮어씁니다.
+    """
+    pa, pq = _require_pyarrow()
+    table_schema = schema()
+    written = []
+    partitions = {}
+    for path in result_files(results_dir):
+        for row in result_rows(path, run, data_dir):
+            partitions.setdefault((row.pop("task"), row.pop("method"), row["tool_mode"]), []).append(row)
+    for (task, method, tool_mode), rows in sorted(partitions.items()):
+        partition_dir = os.path.join(table_dir, f"task={task}", f"method={method}")
+        os.makedirs(partition_dir, exist_ok=True)
+        out_path = os.path.join(partition_dir, partition_filename(run, tool_mode))
+        pq.write_table(pa.Table.from_pylist(rows, schema=table_schema), out_path, compression="zstd")
+        written.append(out_path)
+    return written
+
+
+def _dataset(table_dir: str):
+    _require_pyarrow()
+    import pyarrow.dataset as ds
+
+    return ds, ds.dataset(table_dir, format="parquet", partitioning="hive")
+
+
+def _filter(ds, runs=None, task=None, method=None):
+    expr = None
+    for condition in (
+        ds.field("run").isin(runs) if runs else None,
+        ds.field("task") == task if task else None,
+        ds.field("method") == method if method else None,
+    ):
+        if condition is not None:
+            expr = condition if expr is None else expr & condition
+    return expr
+
+
+def summarize_runs(table_dir: str, runs=None, task=None, method=None) -> list:
+    """
+    실행 / Task / 메소드 / 도구 모드별 정확도, 평균 latency, 토큰 합계를 필요한 열만 스캔해 계산합니다.
+    """
+    ds, dataset = _dataset(table_dir)
+    table = dataset.to_table(
+        columns=list(GROUP_KEYS) + ["correct", "error", "latency", "tokens"],
+        filter=_filter(ds, runs, task, method),
+    )
+    grouped = table.group_by(list(GROUP_KEYS)).aggregate([
+        ("correct", "mean"), ("error", "sum"), ("latency", "mean"), ("tokens", "sum"), ("run", "count"),
+    ])
+    return sorted(grouped.to_pylist(), key=lambda row: tuple(row[key] or "" for key in GROUP_KEYS))
+
+
+def diff_runs(table_dir: str, base: str, other: str, task=None, method=None) -> dict:
+    """
+    두 실행을 (task, method, tool_mode, id, position) 으로 맞춰 고쳐진 / 깨진 항목, 예측이 바뀐 항목, latency·토큰 차이를 셉니다.
+    보고서 키는 (task, method, tool_mode) 입니다.
+    """
+    import pyarrow.compute as pc
+
+    ds, dataset = _dataset(table_dir)
+    columns = list(GROUP_KEYS) + ["id", "position", "prediction", "correct", "latency", "tokens"]
+    table = dataset.to_table(columns=columns, filter=_filter(ds, [base, other], task, method))
+    keys = ["task", "method", "tool_mode", "id", "position"]
+    left = table.filter(pc.equal(table["run"], base)).drop_columns(["run"])
+    right = table.filter(pc.equal(table["run"], other)).drop_columns(["run"])
+    joined = left.join(right, keys=keys, join_type="inner", left_suffix="_base", right_suffix="_other")
+
+    report = {}
+    for row in joined.to_pylist():
+        entry = report.setdefault((row["task"], row["method"], row["tool_mode"]), {
+            "items": 0, "fixed": [], "broken": [], "prediction_changed": 0, "latency_delta": 0.0, "tokens_delta": 0,
+        })
+        entry["items"] += 1
+        if row["correct_other"] and not row["correct_base"]:
+            entry["fixed"].append(row["id"])
+        elif row["correct_base"] and not row["correct_other"]:
+            entry["broken"].append(row["id"])
+        if row["prediction_base"] != row["prediction_other"]:
+            entry["prediction_changed"] += 1
+        entry["latency_delta"] += (row["latency_other"] or 0.0) - (row["latency_base"] or 0.0)
+        entry["tokens_delta"] += (row["tokens_other"] or 0) - (row["tokens_base"] or 0)
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Columnar export of result files and run-vs-run comparison.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    write_parser = sub.add_parser("write", help="Export a results directory as one run of the partitioned table.")
+    write_parser.add_argument('--results-dir', type=str, required=True, help="Directory containing *_results*.json files.")
+    write_parser.add_argument('--run', type=str, required=True, help="Run name stored in the 'run' column and used as the file name.")
+    write_parser.add_argument('--table-dir', type=str, required=True, help="Root of the partitioned Parquet table.")
+    write_parser.add_argument('--data-dir', type=str, default=DATA_DIR, help="Dataset directory, used to expand slim result files.")
+
+    summary_parser = sub.add_parser("summary", help="Per run / task / method accuracy, latency and tokens.")
+    summary_parser.add_argument('--table-dir', type=str, required=True)
+    summary_parser.add_argument('--run', type=str, nargs='+', default=None)
+    summary_parser.add_argument('--task', type=str, default=None)
+    summary_parser.add_argument('--method', type=str, default=None)
+
+    diff_parser = sub.add_parser("diff", help="Compare two runs item by item.")
+    diff_parser.add_argument('--table-dir', type=str, required=True)
+    diff_parser.add_argument('--base', type=str, required=True)
+    diff_parser.add_argument('--other', type=str, required=True)
+    diff_parser.add_argument('--task', type=str, default=None)
+    diff_parser.add_argument('--method', type=str, default=None)
+    diff_parser.add_argument('--show', type=int, default=10, help="Number of fixed/broken ids to print per task/method.")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "write":
+            written = write_run(args.results_dir, args.run, args.table_dir, args.data_dir)
+            if not written:
+                print(f"'{args.results_dir}' 에서 결과 파일을 찾지 못했습니다.")
+                return 1
+            for path in written:
+                print(f"저장: '{path}'")
+        elif args.command == "summary":
+            for row in summarize_runs(args.table_dir, args.run, args.task, args.method):
+                print(f"{row['run']:<20} {row['task']:<4} {row['method']:<8} {row['tool_mode'] or '':<5} 항목 {row['run_count']:>5}, "
+                      f"정확도 {row['correct_mean'] or 0:.3f}, 오류 {row['error_sum']}, "
+                      f"평균 latency {row['latency_mean'] or 0:.2f}초, 토큰 {row['tokens_sum'] or 0}")
+        else:
+            report = diff_runs(args.table_dir, args.base, args.other, args.task, args.method)
+            for (task, method, tool_mode), entry in sorted(report.items(), key=lambda pair: tuple(key or "" for key in pair[0])):
+                print(f"[{task} {method} {tool_mode}] 항목 {entry['items']}, 고쳐짐 {len(entry['fixed'])}, 깨짐 {len(entry['broken'])}, "
+                      f"예측 변경 {entry['prediction_changed']}, latency 합 {entry['latency_delta']:+.1f}초, 토큰 {entry['tokens_delta']:+d}")
+                if entry["fixed"]:
+                    print(f"  고쳐짐: {', '.join(entry['fixed'][:args.show])}")
+                if entry["broken"]:
+                    print(f"  깨짐: {', '.join(entry['broken'][:args.show])}")
+    except RuntimeError as e:
+        print(f"오류: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
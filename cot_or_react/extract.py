@@ -0,0 +1,118 @@
+"""
+T3 extract-solve: 한 번의 LLM 호출로 제약을 뽑고 결정적 일정 계산기로 날짜를 계산합니다.
+
+ReAct 루프가 최대 20번의 호출로 하던 날짜 계산을 scheduler 가 대신하므로 항목당 latency 는 LLM 왕복 한 번입니다.
+데이터셋에 정답 제약(constraints)이 있으면 뽑은 제약과의 차이를 항목마다 constraint_diff 로 남깁니다.
+"""
+import json
+import time
+from collections import Counter
+
+from cot_or_react.agent import complete, parse_json
+from cot_or_react.scheduler import WEEKDAY_NAMES, Schedule, parse_date, weekday_set
+
+
+WEEKDAY_KEYS = ("exclude_weekdays", "specific_weekdays", "specific_weekdays_exclude")
+DATE_KEYS = ("start_date",)
+DATE_LIST_KEYS = ("date_range", "exclude_dates", "preferred_dates")
+EXTRACT_SCHEMA = {"thought": "string", "constraints": {"<constraint key>": "value"}}
+
+
+def _normalize_value(key: str, value):
+    """
+    비교용 정규화. 요일은 'Mon' / 'monday' 같은 표기 차이를 없앤 요일 순서 목록으로, 날짜는 YYYY-MM-DD 로, 목록은 정렬합니다.
+    """
+    if key in WEEKDAY_KEYS:
+        return [WEEKDAY_NAMES[index] for index in sorted(weekday_set(value))]
+    if key in DATE_KEYS:
+        day = parse_date(value)
+        return day.isoformat() if day else value
+    if key in DATE_LIST_KEYS and isinstance(value, list):
+        days = [(parse_date(v) or v) for v in value]
+        days = [d.isoformat() if hasattr(d, "isoformat") else d for d in days]
+        return days if key == "date_range" else sorted(days)
+    if isinstance(value, list):
+        return sorted(value, key=str)
+    return value
+
+
+def _active(constraints) -> dict:
+    if not isinstance(constraints, dict):
+        return {}
+    return {key: _normalize_value(key, value) for key, value in constraints.items() if value not in (None, False, 0, "", [])}
+
+
+def constraint_diff(extracted, gold) -> dict:
+    """
+    뽑은 제약과 정답 제약의 차이. 값이 비어 있거나 False 인 키는 없는 것으로 봅니다.
+    """
+    extracted, gold = _active(extracted), _active(gold)
+    return {
+        "missing": sorted(key for key in gold if key not in extracted),
+        "extra": sorted(key for key in extracted if key not in gold),
+        "mismatched": {
+            key: {"extracted": extracted[key], "gold": gold[key]}
+            for key in sorted(gold) if key in extracted and extracted[key] != gold[key]
+        },
+    }
+
+
+def run_extract_solve(item: dict, ctx) -> dict:
+    if not item.get("input_text") or not item.get("anchor_date"):
+        item['prediction'] = {"error": "Missing input_text or anchor_date"}
+        return item
+    input_text = item.get("input_text")
+    anchor_date = item.get("anchor_date")
+    start_time = time.time()
+
+    user_input_json = {"input_text": input_text, "anchor_date": anchor_date}
+    messages = [
+        {"role": "system", "content": ctx.prompts["system"]},
+        {"role": "user", "content": json.dumps(user_input_json, ensure_ascii=False, indent=2)}
+    ]
+    try:
+        response = complete(ctx, item, messages, required_keys=("constraints",))
+        item['tokens'] = response.total_tokens
+        try:
+            output, item['tokens'] = parse_json(ctx, item, response, EXTRACT_SCHEMA, "extract")
+        except json.JSONDecodeError:
+            output = None
+        constraints = output.get("constraints") if isinstance(output, dict) else None
+        if not isinstance(constraints, dict):
+            item['prediction'] = f"Error: Invalid constraints response: {response.content.strip()}"
+            item['thought'] = "N/A due to invalid JSON response"
+        else:
+            item['thought'] = output.get("thought")
+            item['extracted_constraints'] = constraints
+            schedule = Schedule(constraints, anchor_date, ctx.toolbox.holidays)
+            item['prediction'] = schedule.dates()
+            if schedule.unsupported:
+                item['unsupported_constraints'] = schedule.unsupported
+            if isinstance(item.get("constraints"), dict):
+                item['constraint_diff'] = constraint_diff(constraints, item["constraints"])
+        item['latency'] = time.time() - start_time
+    except Exception as e:
+        print(f"ID {item.get('id')} 처리 중 오류 발생: {e}")
+        item['prediction'] = f"Error: {str(e)}"
+    return item
+
+
+def constraint_summary(diffs: list) -> dict:
+    """
+    실행 요약의 constraints 블록: 정답 제약과 완전히 같은 항목 수와, 키별로 빠진/남는/다른 횟수.
+    """
+    compared = exact = 0
+    missing, extra, mismatched = Counter(), Counter(), Counter()
+    for diff in diffs:
+        compared += 1
+        exact += not (diff["missing"] or diff["extra"] or diff["mismatched"])
+        missing.update(diff["missing"])
+        extra.update(diff["extra"])
+        mismatched.update(list(diff["mismatched"]))
+    return {
+        "compared": compared,
+        "exact": exact,
+        "missing": dict(missing.most_common()),
+        "extra": dict(extra.most_common()),
+        "mismatched": dict(mismatched.most_common()),
+    }
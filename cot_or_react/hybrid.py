@@ -0,0 +1,113 @@
+"""
+t3_llm.py 용 하이브리드 도구 실행기.
+
+LLM 시뮬레이션 도구 실험은 모든 calculator / calendar_db / search 호출을 solar-pro2 에 맡깁니다.
+HybridExecutor 는 결정적 경로(날짜 계산기, KASI 조회, 이벤트 KB)를 먼저 시도하고, 입력을 해석하지
+못했거나 실패한 경우에만 LLM 시뮬레이션으로 넘깁니다. 표본 호출에 대해 두 경로를 함께 실행해
+결과가 일치하는지(shadow compare) 기록할 수도 있습니다.
+"""
+import random
+import re
+import threading
+
+from cot_or_react.tool_memo import is_cacheable
+
+
+TOOL_SOURCE = "tool"
+LLM_SOURCE = "llm"
+
+_DATE_RE = re.compile(r"(\d{4})-?(\d{2})-?(\d{2})")
+
+
+def observation_dates(text) -> set:
+    """
+    관측 문자열에 등장하는 날짜('2025-01-29', locdate '20250129')를 YYYY-MM-DD 집합으로 뽑습니다.
+    """
+    return {f"{y}-{m}-{d}" for y, m, d in _DATE_RE.findall(str(text))}
+
+
+def is_failed(observation) -> bool:
+    return observation is None or not is_cacheable(observation)
+
+
+def observations_agree(tool_name: str, deterministic: str, simulated: str) -> bool:
+    """
+    결정적 결과와 LLM 시뮬레이션 결과가 같은 답을 담고 있는지 판단합니다.
+    calculator 는 날짜 하나, calendar_db 는 날짜 집합, search 는 날짜가 하나라도 겹치는지를 봅니다.
+    """
+    det_dates, sim_dates = observation_dates(deterministic), observation_dates(simulated)
+    if tool_name == "search":
+        return bool(det_dates & sim_dates) or (not det_dates and not sim_dates)
+    if tool_name == "calendar_db" and not det_dates:
+        return not sim_dates
+    return det_dates == sim_dates
+
+
+class HybridExecutor:
+    """
+    simulate(tool_name, tool_input) 는 LLM 시뮬레이션, deterministic 은 도구 이름 -> 결정적 함수 매핑입니다.
+    execute() 는 (관측 결과, 메타 정보) 를 반환하며 메타의 `source` 로 어느 경로의 결과인지 표시합니다.
+    """
+
+    def __init__(self, simulate, deterministic: dict, shadow_rate: float = 0.0, seed: int = 0):
+        self.simulate = simulate
+        self.deterministic = deterministic
+        self.shadow_rate = shadow_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {}
+        self.mismatches = []
+
+    def _count(self, tool_name: str, field: str):
+        with self._lock:
+            counts = self._stats.setdefault(
+                tool_name, {"tool": 0, "llm_fallback": 0, "shadow_checks": 0, "shadow_mismatches": 0}
+            )
+            counts[field] += 1
+
+    def _sample_shadow(self) -> bool:
+        if self.shadow_rate <= 0:
+            return False
+        with self._lock:
+            return self._rng.random() < self.shadow_rate
+
+    def execute(self, tool_name: str, tool_input):
+        func = self.deterministic.get(tool_name)
+        observation = None
+        if func is not None:
+            try:
+                observation = func(tool_input)
+            except Exception:
+                observation = None
+
+        if is_failed(observation):
+            self._count(tool_name, "llm_fallback")
+            return self.simulate(tool_name, tool_input), {"source": LLM_SOURCE}
+
+        self._count(tool_name, "tool")
+        meta = {"source": TOOL_SOURCE}
+        if self._sample_shadow():
+            simulated = self.simulate(tool_name, tool_input)
+            agree = observations_agree(tool_name, observation, simulated)
+            self._count(tool_name, "shadow_checks")
+            meta["shadow"] = {"agree": agree, "llm_observation": simulated}
+            if not agree:
+                self._count(tool_name, "shadow_mismatches")
+                with self._lock:
+                    self.mismatches.append(
+                        {"tool": tool_name, "input": tool_input, "tool_observation": observation, "llm_observation": simulated}
+                    )
+        return observation, meta
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {name: dict(counts) for name, counts in sorted(self._stats.items())}
+
+    def format_stats(self) -> str:
+        lines = ["하이브리드 도구 실행:"]
+        for name, c in self.stats().items():
+            line = f"  {name}: 결정적 {c['tool']} / LLM 대체 {c['llm_fallback']}"
+            if c["shadow_checks"]:
+                line += f", 비교 {c['shadow_checks']}건 중 불일치 {c['shadow_mismatches']}건"
+            lines.append(line)
+        return "\n".join(lines)
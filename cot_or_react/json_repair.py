@@ -0,0 +1,184 @@
+"""
+LLM 응답의 관대한 JSON 해석과 복구.
+
+json_mode 로 요청해도 모델은 가끔 코드 펜스로 감싸거나, JSON 앞뒤에 설명을 붙이거나, 작은따옴표·끝 쉼표를 쓴 응답을 돌려줍니다.
+예전에는 이런 응답 하나로 항목 전체가 "Error" 가 되어 그 항목에 쓴 호출이 모두 버려졌습니다.
+
+repair_json() 은 API 호출 없이 고칠 수 있는 것(코드 펜스, 앞뒤 텍스트, 작은따옴표, 끝 쉼표, 문자열 안의 줄바꿈)을 고치고,
+그래도 안 되면 agent.parse_json 이 깨진 출력과 스키마만 담은 짧은 재요청(REASK_PROMPT)을 한 번 보냅니다.
+복구 횟수는 항목의 json_repairs 필드와 실행 요약의 json_repairs 블록에 남습니다.
+"""
+import json
+import re
+import threading
+from collections import Counter
+
+
+JSON_REPAIR_MODES = ("off", "local", "reask")
+
+REASK_PROMPT = (
+    "The text below was meant to be a single JSON object with this schema:\n{schema}\n"
+    "It could not be parsed. Return only the corrected JSON object, keeping the original content. Do not add any explanation."
+)
+
+_FENCE = re.compile(r"```[a-zA-Z]*\s*(.*?)\s*```", re.DOTALL)
+
+
+def _extract_object(text: str):
+    """
+    text 안의 첫 번째 균형 잡힌 {...} 구간. 문자열 안의 괄호는 세지 않습니다. 없으면 None.
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+    depth, quote, escaped = 0, None, False
+    for index in range(start, len(text)):
+        ch = text[index]
+        if quote:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:index + 1]
+    return None
+
+
+def _normalize(text: str) -> tuple:
+    """
+    작은따옴표 문자열을 큰따옴표 문자열로 바꾸고 끝 쉼표를 지웁니다. (고친 텍스트, 적용한 수정 목록).
+    """
+    out, fixes = [], set()
+    index, length = 0, len(text)
+    while index < length:
+        ch = text[index]
+        if ch == '"':
+            end = index + 1
+            while end < length and text[end] != '"':
+                end += 2 if text[end] == "\\" else 1
+            out.append(text[index:end + 1])
+            index = end + 1
+            continue
+        if ch == "'":
+            fixes.add("single_quotes")
+            pieces = []
+            index += 1
+            while index < length and text[index] != "'":
+                if text[index] == "\\" and index + 1 < length:
+                    pieces.append(text[index + 1] if text[index + 1] == "'" else text[index:index + 2])
+                    index += 2
+                    continue
+                pieces.append('\\"' if text[index] == '"' else text[index])
+                index += 1
+            out.append('"' + "".join(pieces) + '"')
+            index += 1
+            continue
+        if ch == ",":
+            rest = text[index + 1:].lstrip()
+            if rest[:1] in ("}", "]"):
+                fixes.add("trailing_comma")
+                index += 1
+                continue
+        out.append(ch)
+        index += 1
+    return "".join(out), sorted(fixes)
+
+
+def _loads(text: str):
+    try:
+        return json.loads(text), []
+    except json.JSONDecodeError:
+        # 문자열 안의 날것 줄바꿈·탭 같은 제어 문자는 strict=False 로 받아 줍니다.
+        return json.loads(text, strict=False), ["control_chars"]
+
+
+def repair_json(text: str) -> tuple:
+    """
+    (값, 적용한 수정 목록). 그대로 해석되면 수정 목록은 비어 있습니다. 고칠 수 없으면 json.JSONDecodeError 를 던집니다.
+    """
+    try:
+        return json.loads(text), []
+    except json.JSONDecodeError as e:
+        error = e
+    candidate = (text or "").strip()
+    fixes = []
+    fence = _FENCE.search(candidate)
+    if fence:
+        candidate = fence.group(1)
+        fixes.append("code_fence")
+    extracted = _extract_object(candidate)
+    if extracted is not None and extracted != candidate:
+        candidate = extracted
+        fixes.append("surrounding_text")
+    try:
+        value, extra = _loads(candidate)
+        return value, fixes + extra
+    except json.JSONDecodeError:
+        pass
+    normalized, applied = _normalize(candidate)
+    if applied:
+        try:
+            value, extra = _loads(normalized)
+            return value, fixes + applied + extra
+        except json.JSONDecodeError:
+            pass
+    raise error
+
+
+def reask_messages(content: str, schema: dict) -> list:
+    return [
+        {"role": "system", "content": REASK_PROMPT.format(schema=json.dumps(schema, ensure_ascii=False))},
+        {"role": "user", "content": content},
+    ]
+
+
+class RepairStats:
+    """
+    실행 전체의 복구 집계. LLM 호출 통계처럼 조합 시작 전 snapshot() 과의 차이로 조합별 요약을 만듭니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = Counter()
+
+    def record(self, step: str, fixes: list, reasked: bool, ok: bool):
+        with self._lock:
+            if ok and not reasked:
+                self.counts["repaired_locally"] += 1
+            if reasked:
+                self.counts["reasked" if ok else "reask_failed"] += 1
+            if not ok and not reasked:
+                self.counts["unrepaired"] += 1
+            self.counts[f"step:{step}"] += 1
+            self.counts.update(f"fix:{fix}" for fix in fixes)
+
+    def snapshot(self) -> Counter:
+        with self._lock:
+            return Counter(self.counts)
+
+    def summary(self, before: Counter = None) -> dict:
+        """
+        실행 요약의 json_repairs 블록. 복구가 한 번도 없었으면 빈 딕셔너리입니다.
+        """
+        counts = self.snapshot() - (before or Counter())
+        if not counts:
+            return {}
+        return {
+            "repaired_locally": counts["repaired_locally"],
+            "reasked": counts["reasked"],
+            "reask_failed": counts["reask_failed"],
+            "unrepaired": counts["unrepaired"],
+            "steps": {key[5:]: n for key, n in counts.most_common() if key.startswith("step:")},
+            "fixes": {key[4:]: n for key, n in counts.most_common() if key.startswith("fix:")},
+        }
+
+
+REPAIR_STATS = RepairStats()
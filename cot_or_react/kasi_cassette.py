@@ -0,0 +1,310 @@
+"""
+KASI 특일 정보 API 녹화·재생(카세트).
+
+calendar_db 도구와 공휴일 달력이 쓰는 KASI 호출은 apis.data.go.kr 의 latency·가용성과 KASI_API_KEY 에 묶여 있어
+벤치마크 시간이 흔들리고 오프라인에서는 재현할 수 없습니다. 이 모듈은 원본 응답을 요청 파라미터(오퍼레이션, 연도, 월)별로
+JSONL 카세트에 녹화하고, 같은 응답을 로컬에서 돌려줍니다. 재생 쪽은 지연(고정 + 흔들림, 또는 녹화 당시 latency)과
+실패율을 주입할 수 있습니다.
+
+    # 실행하면서 녹화 / 미리 연도 단위로 녹화
+    python -m cot_or_react --task t3 --method react --kasi-record kasi.jsonl
+    python -m cot_or_react.kasi_cassette record --years 2023 2026 --output kasi.jsonl
+
+    # 프로세스 안에서 재생(전송 어댑터)
+    python -m cot_or_react --task t3 --method react --kasi-replay kasi.jsonl,latency_ms=80,jitter_ms=20,failure_rate=0.02
+
+    # 로컬 대역 서버로 재생 (다른 프로세스·머신에서 KASI_BASE_URL 만 바꿔 사용)
+    python -m cot_or_react.kasi_cassette serve --cassette kasi.jsonl --port 8089 --latency-ms recorded
+    KASI_BASE_URL=http://127.0.0.1:8089/B090041/openapi/service/SpcdeInfoService python t3.py --method react
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+DEFAULT_PORT = 8089
+RECORDED = "recorded"
+
+
+def request_key(url: str, params: dict) -> tuple:
+    """
+    카세트 키 (오퍼레이션, 연도, 월). 서비스 키나 응답 형식 파라미터는 키에 넣지 않습니다.
+    """
+    operation = urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1]
+    params = params or {}
+    month = str(params.get("solMonth", "")).strip()
+    return operation, str(params.get("solYear", "")).strip(), month.zfill(2) if month else ""
+
+
+class Cassette:
+    """
+    녹화된 응답 모음. 파일은 한 줄에 응답 하나인 JSONL 이고, 같은 키가 여러 번 나오면 마지막 줄을 씁니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[(entry["operation"], entry["solYear"], entry["solMonth"])] = entry
+
+    def get(self, key: tuple):
+        return self.entries.get(key)
+
+    def add(self, key: tuple, status: int, body: str, elapsed: float):
+        entry = {
+            "operation": key[0], "solYear": key[1], "solMonth": key[2],
+            "status": status, "body": body, "elapsed": round(elapsed, 4),
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        with self._lock:
+            self.entries[key] = entry
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+class Faults:
+    """
+    재생 시 주입하는 지연과 실패. latency_ms 가 'recorded' 면 녹화 당시의 latency 를 그대로 재현합니다.
+    같은 seed 면 같은 순서의 요청에 같은 지연·실패가 주입됩니다.
+    """
+
+    def __init__(self, latency_ms=0.0, jitter_ms: float = 0.0, failure_rate: float = 0.0, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counts = {"requests": 0, "hits": 0, "misses": 0, "injected_failures": 0}
+
+    def draw(self, entry) -> tuple:
+        """
+        (지연 초, 실패 여부). 난수는 잠금 안에서 뽑아 동시 요청에서도 seed 별 순서가 정해집니다.
+        """
+        with self._lock:
+            self.counts["requests"] += 1
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+            failed = self.failure_rate > 0 and self._random.random() < self.failure_rate
+            self.counts["injected_failures"] += failed
+            if entry is None:
+                self.counts["misses"] += 1
+            elif not failed:
+                self.counts["hits"] += 1
+        if self.latency_ms == RECORDED:
+            base = (entry or {}).get("elapsed", 0.0) * 1000
+        else:
+            base = float(self.latency_ms)
+        return max(0.0, base + jitter) / 1000, failed
+
+
+def respond(cassette: Cassette, faults: Faults, key: tuple) -> tuple:
+    """
+    (상태 코드, 본문). 주입된 실패는 503, 카세트에 없는 요청은 404 입니다.
+    """
+    entry = cassette.get(key)
+    delay, failed = faults.draw(entry)
+    if delay:
+        time.sleep(delay)
+    if failed:
+        return 503, json.dumps({"error": "injected failure"})
+    if entry is None:
+        return 404, json.dumps({"error": f"no recording for {key[0]} {key[1]}-{key[2]}"})
+    return entry["status"], entry["body"]
+
+
+class CassetteHTTPError(OSError):
+    pass
+
+
+class CassetteResponse:
+    """
+    tools.fetch_calendar_month 가 쓰는 만큼의 requests.Response 흉내(status_code, text, json(), raise_for_status()).
+    """
+
+    def __init__(self, url: str, status_code: int, text: str):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise CassetteHTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+class RecordingSession:
+    """
+    실제 세션을 감싸 성공한 응답의 원문을 카세트에 덧붙입니다.
+    """
+
+    def __init__(self, cassette: Cassette, session):
+        self.cassette = cassette
+        self.session = session
+
+    def get(self, url: str, params=None, timeout=None):
+        start = time.perf_counter()
+        response = self.session.get(url, params=params, timeout=timeout)
+        if response.status_code == 200:
+            self.cassette.add(request_key(url, params), response.status_code, response.text, time.perf_counter() - start)
+        return response
+
+
+class ReplaySession:
+    """
+    네트워크 없이 카세트에서 응답하는 전송 어댑터. tools.install_http_session 으로 설치합니다.
+    """
+
+    def __init__(self, cassette: Cassette, faults: Faults):
+        self.cassette = cassette
+        self.faults = faults
+
+    def get(self, url: str, params=None, timeout=None):
+        status, body = respond(self.cassette, self.faults, request_key(url, params))
+        return CassetteResponse(url, status, body)
+
+
+def parse_replay(spec: str) -> dict:
+    """
+    'PATH[,latency_ms=MS|recorded][,jitter_ms=MS][,failure_rate=P][,seed=N]' 를 옵션 딕셔너리로 바꿉니다. argparse 의 type 으로 사용합니다.
+    """
+    path, *options = [part.strip() for part in str(spec).split(",")]
+    parsed = {"path": path, "latency_ms": 0.0, "jitter_ms": 0.0, "failure_rate": 0.0, "seed": 0}
+    for option in options:
+        name, _, value = option.partition("=")
+        try:
+            if name == "latency_ms":
+                parsed[name] = RECORDED if value == RECORDED else float(value)
+            elif name == "jitter_ms" and float(value) >= 0:
+                parsed[name] = float(value)
+            elif name == "failure_rate" and 0 <= float(value) <= 1:
+                parsed[name] = float(value)
+            elif name == "seed":
+                parsed[name] = int(value)
+            else:
+                raise ValueError(option)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid replay option '{option}' in '{spec}'") from None
+    if not os.path.exists(path):
+        raise argparse.ArgumentTypeError(f"cassette '{path}' does not exist")
+    return parsed
+
+
+def replay_session(options: dict) -> ReplaySession:
+    faults = Faults(options["latency_ms"], options["jitter_ms"], options["failure_rate"], options["seed"])
+    return ReplaySession(Cassette(options["path"]), faults)
+
+
+def make_handler(cassette: Cassette, faults: Faults):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body: str):
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            if url.path == "/_cassette/stats":
+                self._send(200, json.dumps(dict(faults.counts, entries=len(cassette.entries))))
+                return
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+            self._send(*respond(cassette, faults, request_key(url.path, params)))
+
+    return Handler
+
+
+def record(years: list, categories: list, output: str, workers: int) -> dict:
+    """
+    years 의 모든 월을 categories 별로 실제 KASI 에서 조회해 카세트에 녹화합니다. {"recorded", "failed"} 를 돌려줍니다.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from cot_or_react import tools
+
+    cassette = Cassette(output)
+    tools.install_http_session(RecordingSession(cassette, tools.http_session()))
+    jobs = [(str(year), f"{month:02d}", category) for year in years for month in range(1, 13) for category in categories]
+    failures = []
+
+    def fetch(job):
+        try:
+            tools.fetch_calendar_month(*job)
+        except Exception as e:
+            failures.append(f"{job[0]}-{job[1]} {job[2]}: {e}")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(fetch, jobs))
+    for failure in failures:
+        print(f"  실패: {failure}")
+    return {"recorded": len(jobs) - len(failures), "failed": len(failures)}
+
+
+def main(argv=None) -> int:
+    from cot_or_react.tools import CATEGORY_OPERATIONS
+
+    parser = argparse.ArgumentParser(description="Record KASI special-day responses to a cassette, or serve a cassette locally.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    record_parser = sub.add_parser("record", help="Fetch every month of the given years from KASI and append them to a cassette.")
+    record_parser.add_argument('--years', type=int, nargs=2, required=True, metavar=('FIRST', 'LAST'))
+    record_parser.add_argument('--categories', type=str, nargs='+', choices=sorted(CATEGORY_OPERATIONS), default=["rest"])
+    record_parser.add_argument('--output', type=str, required=True, help="Cassette file (JSONL, appended).")
+    record_parser.add_argument('--workers', type=int, default=4)
+    serve_parser = sub.add_parser("serve", help="Serve a cassette as a stand-in for the KASI API.")
+    serve_parser.add_argument('--cassette', type=str, required=True)
+    serve_parser.add_argument('--host', type=str, default="127.0.0.1")
+    serve_parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument('--latency-ms', type=str, default="0", help=f"Injected latency per request in ms, or '{RECORDED}' to replay the recorded latency.")
+    serve_parser.add_argument('--jitter-ms', type=float, default=0.0, help="Uniform jitter (+/-) added to the latency.")
+    serve_parser.add_argument('--failure-rate', type=float, default=0.0, help="Fraction of requests answered with HTTP 503.")
+    serve_parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        start_time = time.time()
+        counts = record(list(range(args.years[0], args.years[1] + 1)), args.categories, args.output, args.workers)
+        print(f"녹화 완료: {counts['recorded']}건 (실패 {counts['failed']}건), {time.time() - start_time:.1f}초 -> '{args.output}'")
+        return 1 if counts["failed"] else 0
+
+    if args.latency_ms != RECORDED:
+        try:
+            args.latency_ms = float(args.latency_ms)
+        except ValueError:
+            parser.error(f"--latency-ms must be a number or '{RECORDED}'")
+    cassette = Cassette(args.cassette)
+    faults = Faults(args.latency_ms, args.jitter_ms, args.failure_rate, args.seed)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(cassette, faults))
+    server.daemon_threads = True
+    print(f"KASI 대역 서버: http://{args.host}:{server.server_port}/B090041/openapi/service/SpcdeInfoService "
+          f"(녹화 {len(cassette.entries)}건, 지연 {args.latency_ms}ms ±{args.jitter_ms}, 실패율 {args.failure_rate})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"요청 {faults.counts['requests']}건: 적중 {faults.counts['hits']}, 미녹화 {faults.counts['misses']}, 주입 실패 {faults.counts['injected_failures']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
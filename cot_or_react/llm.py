@@ -0,0 +1,255 @@
+"""
+OpenAI 호환 Chat Completions 호출 래퍼.
+
+실행 전체에서 LLM 인스턴스 하나(= OpenAI 클라이언트와 HTTP 커넥션 풀 하나)를 공유하고,
+호출 수와 토큰 사용량을 스레드 안전하게 집계합니다. openai 패키지는 첫 호출 때 import 합니다.
+
+stream=True 면 응답을 스트리밍으로 받아 첫 토큰까지의 시간(TTFT)과 초당 토큰 수를 재고,
+호출하는 쪽이 지정한 키(required_keys)가 모두 완성되거나 출력이 max_output_chars 를 넘으면 생성을 중단합니다.
+
+endpoints 를 주면 EndpointPool 이 호출마다 엔드포인트를 골라 보내고, 실패하면 다른 엔드포인트로 넘깁니다.
+
+coalesce=True 면 같은 요청(모델, 메시지, 옵션이 모두 같은 호출)이 진행 중일 때 새로 보내지 않고 그 응답을 함께 받습니다.
+"""
+import dataclasses
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from cot_or_react.endpoints import EndpointPool
+from cot_or_react.singleflight import SingleFlight
+from cot_or_react.stream_json import IncrementalJSONObject
+
+
+DEFAULT_MODEL = "solar-pro2"
+DEFAULT_BASE_URL = "https://api.upstage.ai/v1"
+
+STREAM_STATS = ("stream_calls", "early_stops", "truncated", "ttft_total", "generation_time_total")
+
+
+@dataclass
+class Completion:
+    content: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    latency: float = 0.0
+    ttft: Optional[float] = None
+    tokens_per_sec: Optional[float] = None
+    stop_reason: Optional[str] = None   # 스트리밍: "complete", "keys"(필요한 키 완성), "max_chars"(길이 초과)
+    coalesced: bool = False             # 진행 중이던 같은 요청의 응답을 함께 받은 경우(추가 비용 없음)
+
+    def call_record(self) -> dict:
+        """
+        스트리밍 호출의 항목별 기록(결과 파일의 llm_calls 필드).
+        """
+        return {
+            "latency": round(self.latency, 4),
+            "ttft": round(self.ttft, 4) if self.ttft is not None else None,
+            "tokens_per_sec": round(self.tokens_per_sec, 1) if self.tokens_per_sec is not None else None,
+            "completion_tokens": self.completion_tokens,
+            "stop_reason": self.stop_reason,
+        }
+
+
+def approx_tokens(text: str) -> int:
+    """
+    토크나이저 없이 쓰는 대략적인 토큰 수. 한글은 글자당 약 1 토큰, ASCII 는 약 4 글자당 1 토큰으로 셉니다.
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (len(text) - ascii_chars) + ascii_chars // 4 + 1
+
+
+class LLM:
+    def __init__(self, model: str = DEFAULT_MODEL, api_key: str = None, base_url: str = None, client=None,
+                 stream: bool = False, max_output_chars: int = None, coalesce: bool = True, endpoints: list = None):
+        self.model = model
+        self.api_key = api_key or os.getenv("UPSTAGE_API_KEY", "PUT YOUR API KEY HERE")
+        self.base_url = base_url or os.getenv("UPSTAGE_BASE_URL", DEFAULT_BASE_URL)
+        self.stream = stream
+        self.max_output_chars = max_output_chars
+        self._client = client
+        self.pool = EndpointPool(endpoints, client) if endpoints else None
+        self.flight = SingleFlight() if coalesce else None
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.total_tokens = 0
+        self.stream_calls = 0
+        self.early_stops = 0
+        self.truncated = 0
+        self.ttft_total = 0.0
+        self.generation_time_total = 0.0
+        self.coalesced = 0
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from openai import OpenAI
+
+                    self._client = OpenAI(api_key=self.api_key, base_url=self.base_url)
+        return self._client
+
+    def complete(self, messages: list, json_mode: bool = True, temperature: float = 0, required_keys=None) -> Completion:
+        """
+        messages 로 한 번 호출하고 응답 본문과 사용량을 돌려줍니다. json_mode 면 JSON 객체 응답을 요청합니다.
+        스트리밍 모드에서 required_keys 가 주어지면 그 키들이 완성되는 즉시 생성을 중단합니다.
+        """
+        kwargs = self.request_kwargs(messages, json_mode, temperature)
+        if self.flight is None:
+            return self._complete(kwargs, required_keys)
+
+        key = json.dumps([kwargs, list(required_keys or ())], ensure_ascii=False, sort_keys=True)
+        completion, coalesced = self.flight.do("llm", key, lambda: self._complete(kwargs, required_keys))
+        if not coalesced:
+            return completion
+        with self._lock:
+            self.coalesced += 1
+        return dataclasses.replace(completion, coalesced=True)
+
+    def request_kwargs(self, messages: list, json_mode: bool = True, temperature: float = 0) -> dict:
+        """
+        complete() 가 chat.completions.create 에 넘기는 인자. 오프라인 배치 요청 본문도 이것으로 만듭니다.
+        """
+        kwargs = {"model": self.model, "messages": messages, "temperature": temperature}
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+        return kwargs
+
+    def _complete(self, kwargs: dict, required_keys) -> Completion:
+        if self.pool is None:
+            return self._request(self.client, kwargs, required_keys)
+        return self.pool.run(lambda client: self._request(client, kwargs, required_keys))
+
+    def _request(self, client, kwargs: dict, required_keys) -> Completion:
+        if self.stream:
+            return self._complete_stream(client, kwargs, required_keys if "response_format" in kwargs else None)
+
+        start_time = time.time()
+        response = client.chat.completions.create(**kwargs)
+        latency = time.time() - start_time
+
+        usage = getattr(response, "usage", None)
+        completion = Completion(
+            content=response.choices[0].message.content or "",
+            prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+            completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+            total_tokens=getattr(usage, "total_tokens", 0) or 0,
+            latency=latency,
+        )
+        self._record(completion)
+        return completion
+
+    def _complete_stream(self, client, kwargs: dict, required_keys) -> Completion:
+        start_time = time.time()
+        stream = client.chat.completions.create(stream=True, stream_options={"include_usage": True}, **kwargs)
+        parser = IncrementalJSONObject() if kwargs.get("response_format") else None
+        pieces = []
+        length = 0
+        first_token_time = None
+        usage = None
+        stop_reason = "complete"
+        try:
+            for chunk in stream:
+                if getattr(chunk, "usage", None):
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                if not delta:
+                    continue
+                if first_token_time is None:
+                    first_token_time = time.time()
+                pieces.append(delta)
+                length += len(delta)
+                if parser is not None:
+                    parser.feed(delta)
+                    if parser.done:
+                        continue
+                    if required_keys and parser.complete(required_keys):
+                        stop_reason = "keys"
+                        break
+                if self.max_output_chars and length > self.max_output_chars:
+                    stop_reason = "max_chars"
+                    break
+        finally:
+            # 조기 중단, 예외, 정상 종료 어느 경우든 응답 스트림(HTTP 연결)을 닫아 커넥션 풀로 돌려줍니다.
+            stream.close()
+        end_time = time.time()
+
+        content = "".join(pieces)
+        if stop_reason == "keys" or (stop_reason == "max_chars" and parser is not None and required_keys and parser.complete(required_keys)):
+            # 중단된 응답은 완성된 키만으로 올바른 JSON 을 만들어 돌려줍니다.
+            content = json.dumps(parser.values, ensure_ascii=False)
+
+        if usage is not None:
+            prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+            completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        else:
+            # 중간에 끊으면 서버가 사용량을 보내지 않으므로 대략적으로 셉니다.
+            prompt_tokens = sum(approx_tokens(str(m.get("content", ""))) for m in kwargs["messages"])
+            completion_tokens = approx_tokens("".join(pieces))
+        generation_time = end_time - first_token_time if first_token_time is not None else 0.0
+        completion = Completion(
+            content=content,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+            latency=end_time - start_time,
+            ttft=first_token_time - start_time if first_token_time is not None else None,
+            tokens_per_sec=completion_tokens / generation_time if generation_time > 0 else None,
+            stop_reason=stop_reason,
+        )
+        self._record(completion, generation_time)
+        return completion
+
+    def _record(self, completion: Completion, generation_time: float = 0.0):
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += completion.prompt_tokens
+            self.completion_tokens += completion.completion_tokens
+            self.total_tokens += completion.total_tokens
+            if completion.stop_reason is not None:
+                self.stream_calls += 1
+                self.early_stops += completion.stop_reason == "keys"
+                self.truncated += completion.stop_reason == "max_chars"
+                self.ttft_total += completion.ttft or 0.0
+                self.generation_time_total += generation_time
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "total_tokens": self.total_tokens,
+                "stream_calls": self.stream_calls,
+                "early_stops": self.early_stops,
+                "truncated": self.truncated,
+                "ttft_total": round(self.ttft_total, 4),
+                "generation_time_total": round(self.generation_time_total, 4),
+                "coalesced": self.coalesced,
+            }
+
+    def endpoint_stats(self) -> dict:
+        return self.pool.stats() if self.pool is not None else {}
+
+
+def stream_summary(totals: dict) -> dict:
+    """
+    스트리밍 합계에서 평균 TTFT 와 초당 토큰 수를 계산합니다. 합계도 함께 남겨 샤드 병합 때 다시 계산할 수 있게 합니다.
+    """
+    generation_time = totals["generation_time_total"]
+    return dict(
+        totals,
+        ttft_total=round(totals["ttft_total"], 4),
+        generation_time_total=round(generation_time, 4),
+        ttft_mean=round(totals["ttft_total"] / totals["stream_calls"], 4),
+        tokens_per_sec=round(totals["completion_tokens"] / generation_time, 1) if generation_time > 0 else None,
+    )
@@ -0,0 +1,291 @@
+"""
+실행 전 비용 추정(--dry-run).
+
+API 를 호출하지 않고 항목마다 첫 턴 메시지를 실제 실행과 똑같이 만들어 approx_tokens 로 세고,
+지난 결과 파일에서 메소드별로 학습한 항목당 호출 수·토큰 배율·호출당 latency 분포를 곱해
+LLM 호출 수, 토큰, 벽시계 시간을 추정합니다. 벽시계 시간은 동시 실행 수(--workers x --processes)와
+분당 요청 / 토큰 한도(--rate-limit / --token-rate-limit) 중 가장 좁은 병목으로 계산합니다.
+
+    python -m cot_or_react --task t3 --method react --dry-run --history-dir results/solar --workers 8 --rate-limit 600
+"""
+import json
+import math
+import os
+
+from cot_or_react.batch import batch_messages, batch_payloads, pack_batches
+from cot_or_react.llm import approx_tokens
+from cot_or_react.router import LLM_ROUTES, Router, percentile
+from cot_or_react.shard import select_shard
+from cot_or_react.tasks import RESULTS_DIR, TASKS, load_dataset, load_prompts, output_filename
+from cot_or_react.trace_store import expand, find_trace_file
+
+
+# 채팅 템플릿이 메시지마다 붙이는 역할·구분 토큰의 대략적인 수
+MESSAGE_OVERHEAD = 4
+PLAN_FILENAME = "dry_run_plan.json"
+
+
+def first_turn_messages(item: dict, task: str, method: str, prompts: dict) -> list:
+    """
+    agent / extract 가 항목의 첫 LLM 호출에 보내는 메시지와 같은 메시지를 만듭니다.
+    """
+    input_text = item.get("input_text")
+    anchor_date = item.get("anchor_date")
+    if method == "react" and TASKS[task]["react"] == "loop":
+        user_input = {"user_query": input_text, "anchor_date": anchor_date, "current_summary_thought": ""}
+        content = json.dumps(user_input, ensure_ascii=False, indent=2)
+    elif method == "react":
+        content = json.dumps({"input_text": input_text, "anchor_date": anchor_date}, ensure_ascii=False)
+    else:
+        content = json.dumps({"input_text": input_text, "anchor_date": anchor_date}, ensure_ascii=False, indent=2)
+    return [
+        {"role": "system", "content": prompts["system"]},
+        {"role": "user", "content": content}
+    ]
+
+
+def message_tokens(messages: list) -> int:
+    return sum(approx_tokens(m["content"]) + MESSAGE_OVERHEAD for m in messages)
+
+
+def _runnable(item: dict) -> bool:
+    return bool(item.get("input_text") and item.get("anchor_date"))
+
+
+def item_usage(record: dict, task: str, method: str) -> tuple:
+    """
+    지난 결과 항목 하나의 (LLM 호출 수, latency 몫). CoT 묶음 항목은 묶음 호출·latency 를 묶음 크기로 나눈 몫입니다.
+    """
+    latency = record.get("latency") or 0.0
+    if isinstance(record.get("llm_calls"), list):
+        return len(record["llm_calls"]), latency
+    if method == "cot":
+        batch = record.get("cot_batch")
+        if isinstance(batch, dict) and batch.get("size", 1) > 1:
+            # latency 는 묶음 응답 시간 + (재요청했다면) 단건 응답 시간입니다. 재요청 몫은 나누지 않습니다.
+            return 1 / batch["size"] + bool(batch.get("retried")), latency / batch["size"]
+        return 1, latency
+    if method == "react" and TASKS[task]["react"] == "loop":
+        turns = [value for key, value in record.items() if key.startswith("react_turn_") and isinstance(value, dict)]
+        if not turns:
+            return 1, latency
+        return len(turns) + sum(1 for turn in turns if not turn.get("repeated")), latency
+    if method == "react":
+        step1 = record.get("react_step1_output")
+        if not isinstance(step1, dict):
+            return 1, latency
+        return 1 + (step1.get("tool") != "finish"), latency
+    return 1, latency
+
+
+def _history_records(path: str, task: str, data_dir: str) -> list:
+    if find_trace_file(path):
+        # 슬림 결과에는 입력이 없으므로 데이터셋 항목·트레이스와 합쳐 읽습니다.
+        try:
+            dataset = load_dataset(task, data_dir)
+        except FileNotFoundError:
+            dataset = []
+        return expand(path, dataset)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def learn_history(history_dir: str, task: str, method: str, tool_mode: str, prompts: dict, data_dir: str):
+    """
+    history_dir 의 `{task}_{method}_results.json` 에서 항목당 분포를 모읍니다. 쓸 만한 항목이 없으면 None.
+
+    token_ratio 는 (실제 토큰 합) / (같은 항목의 첫 턴 approx_tokens 합) 으로, 이후 턴의 토큰과
+    근사 토크나이저의 편향을 함께 흡수합니다. 입력이 남아 있지 않은 항목은 배율 계산에서 빠집니다.
+    """
+    path = os.path.join(history_dir, output_filename(task, method, tool_mode))
+    if not os.path.exists(path):
+        return None
+    records = [r for r in _history_records(path, task, data_dir) if r.get("tokens")]
+    if not records:
+        return None
+
+    calls, tokens, latencies, completions = [], [], [], []
+    measured_tokens = measured_prompt = 0
+    for record in records:
+        record_calls, record_latency = item_usage(record, task, method)
+        calls.append(record_calls)
+        tokens.append(record["tokens"])
+        latencies.append(record_latency)
+        if _runnable(record):
+            prompt = message_tokens(first_turn_messages(record, task, method, prompts))
+            measured_tokens += record["tokens"]
+            measured_prompt += prompt
+            usage = record.get("usage")
+            if isinstance(usage, dict) and "completion_tokens" in usage:
+                completions.append(usage["completion_tokens"])
+            else:
+                completions.append(max(0, record["tokens"] - prompt))
+    total_calls = sum(calls)
+    return {
+        "source": os.path.basename(path),
+        "items": len(records),
+        "calls_per_item": round(total_calls / len(records), 3),
+        "p90_calls": percentile(calls, 0.9),
+        "tokens_per_item": round(sum(tokens) / len(records), 1),
+        "p90_tokens": percentile(tokens, 0.9),
+        "token_ratio": round(measured_tokens / measured_prompt, 4) if measured_prompt else None,
+        "completion_per_item": round(sum(completions) / len(completions), 1) if completions else None,
+        "seconds_per_call": round(sum(latencies) / total_calls, 4) if total_calls else None,
+        "p90_item_latency": round(percentile(latencies, 0.9), 4),
+    }
+
+
+def _project(items: list, task: str, method: str, prompts: dict, history, args) -> dict:
+    """
+    한 메소드로 실행할 항목들의 호출 수·토큰 추정. history 가 없으면 첫 턴만 센 하한입니다.
+    """
+    runnable = [item for item in items if _runnable(item)]
+    first_turn = [message_tokens(first_turn_messages(item, task, method, prompts)) for item in runnable]
+    block = {"items": len(items), "runnable": len(runnable), "first_turn_tokens": sum(first_turn)}
+    batched = method == "cot" and args.cot_batch_size > 1
+    if batched:
+        batches = pack_batches(runnable, args.cot_batch_size, args.cot_batch_tokens)
+        block["batches"] = len(batches)
+        block["first_turn_tokens"] = sum(message_tokens(batch_messages(batch_payloads(batch), prompts)) for batch in batches)
+
+    if history is None:
+        block["calls"] = block.get("batches", len(runnable))
+        block["tokens"] = block["first_turn_tokens"]
+        block["lower_bound"] = True
+        return block
+
+    if batched:
+        # 묶음 입력은 정확히 셀 수 있으므로 출력 토큰만 이력에서 가져옵니다.
+        block["calls"] = len(batches)
+        block["tokens"] = round(block["first_turn_tokens"] + len(runnable) * (history["completion_per_item"] or 0))
+    else:
+        block["calls"] = round(len(runnable) * history["calls_per_item"])
+        if history["token_ratio"]:
+            block["tokens"] = round(block["first_turn_tokens"] * history["token_ratio"])
+        else:
+            block["tokens"] = round(len(runnable) * history["tokens_per_item"])
+    if history["seconds_per_call"]:
+        block["call_seconds"] = round(block["calls"] * history["seconds_per_call"], 1)
+    return block
+
+
+def wall_time(calls: int, tokens: int, call_seconds, concurrency: int, rate_limit, token_rate_limit) -> dict:
+    """
+    동시 실행 수·분당 요청 한도·분당 토큰 한도 각각이 허용하는 최소 시간 중 가장 긴 것을 벽시계 시간으로 봅니다.
+    """
+    bounds = {}
+    if call_seconds is not None:
+        bounds["concurrency"] = call_seconds / max(1, concurrency)
+    if rate_limit:
+        bounds["rate_limit"] = calls / rate_limit * 60
+    if token_rate_limit:
+        bounds["token_rate_limit"] = tokens / token_rate_limit * 60
+    if call_seconds is None:
+        # 호출당 latency 를 모르면 동시 실행 한계를 알 수 없으므로 한도에서 나온 값은 하한일 뿐입니다.
+        return {"seconds": None, "bottleneck": None, "bounds": {k: round(v, 1) for k, v in bounds.items()}}
+    bottleneck = max(bounds, key=bounds.get)
+    block = {"seconds": round(bounds[bottleneck], 1), "bottleneck": bottleneck, "bounds": {k: round(v, 1) for k, v in bounds.items()}}
+    if rate_limit and calls:
+        # 요청 한도를 채우는 데 필요한 동시 실행 수. 이보다 늘려도 빨라지지 않습니다.
+        block["saturating_concurrency"] = math.ceil(rate_limit / 60 * call_seconds / calls)
+    return block
+
+
+def plan_combination(task: str, method: str, args) -> dict:
+    """
+    한 Task / 메소드 조합의 추정. 라우팅은 항목마다 경로를 고른 뒤(API 호출 없음) 경로별로 추정해 합칩니다.
+    """
+    methods = LLM_ROUTES if method == "route" else (method,)
+    prompts = {m: load_prompts(task, m, args.prompt_dir) for m in methods}
+    dataset = select_shard(load_dataset(task, args.data_dir), args.shard)
+    history_dir = args.history_dir or args.output_dir or "."
+
+    if method == "route":
+        router = Router.load(args.router_table, task, args.route_tolerance)
+        groups = {}
+        for item in dataset:
+            groups.setdefault(router.decide(item)[0], []).append(item)
+    else:
+        groups = {method: dataset}
+
+    plan = {"task": task, "method": method, "items": len(dataset), "routes": {}}
+    for route, items in groups.items():
+        if route == "solver":
+            plan["routes"][route] = {"items": len(items), "runnable": len(items), "first_turn_tokens": 0, "calls": 0, "tokens": 0}
+            continue
+        history = learn_history(history_dir, task, route, args.tool_mode, prompts[route], args.data_dir)
+        block = _project(items, task, route, prompts[route], history, args)
+        block["history"] = history
+        plan["routes"][route] = block
+
+    blocks = plan["routes"].values()
+    plan["calls"] = sum(b["calls"] for b in blocks)
+    plan["tokens"] = sum(b["tokens"] for b in blocks)
+    plan["first_turn_tokens"] = sum(b["first_turn_tokens"] for b in blocks)
+    plan["lower_bound"] = any(b.get("lower_bound") for b in blocks)
+    timed = [b for b in blocks if b["calls"]]
+    call_seconds = None
+    if all("call_seconds" in b for b in timed):
+        call_seconds = sum(b["call_seconds"] for b in timed)
+    concurrency = args.workers * max(1, args.processes)
+    plan["concurrency"] = concurrency
+    plan["wall_time"] = wall_time(plan["calls"], plan["tokens"], call_seconds, concurrency, args.rate_limit, args.token_rate_limit)
+    return plan
+
+
+def _duration(seconds) -> str:
+    if seconds is None:
+        return "알 수 없음"
+    hours, rest = divmod(int(round(seconds)), 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours}시간 {minutes}분 {secs}초" if hours else f"{minutes}분 {secs}초"
+
+
+def format_plan(plan: dict) -> str:
+    lines = [f"[{plan['task']} {plan['method']}] 항목 {plan['items']}개, 동시 실행 {plan['concurrency']}"]
+    for route, block in plan["routes"].items():
+        history = block.get("history")
+        if route == "solver":
+            source = "규칙 해석기 (LLM 호출 없음)"
+        elif history:
+            source = f"이력 {history['source']} (n={history['items']}, 항목당 호출 {history['calls_per_item']}, 토큰 배율 {history['token_ratio']})"
+        else:
+            source = "이력 없음: 첫 턴만 센 하한"
+        lines.append(f"  {route:<13} 항목 {block['items']}개, 첫 턴 토큰 {block['first_turn_tokens']}, "
+                     f"예상 호출 {block['calls']}회, 예상 토큰 {block['tokens']} — {source}")
+    wall = plan["wall_time"]
+    lines.append(f"  합계: 호출 {plan['calls']}회, 토큰 {plan['tokens']}{' (하한)' if plan['lower_bound'] else ''}, "
+                 f"벽시계 {_duration(wall['seconds'])}" + (f" (병목: {wall['bottleneck']})" if wall["bottleneck"] else ""))
+    if "saturating_concurrency" in wall:
+        lines.append(f"  요청 한도를 채우는 동시 실행 수: 약 {wall['saturating_concurrency']}")
+    return "\n".join(lines)
+
+
+def dry_run(args) -> int:
+    """
+    --dry-run: 모든 Task / 메소드 조합을 추정해 출력하고 --output-dir(주지 않으면 저장소의 results/)에 dry_run_plan.json 을 남깁니다.
+    저장소 루트에서 실행해도 작업 트리에 파일을 남기지 않도록 현재 디렉터리에는 쓰지 않습니다.
+    """
+    plans, failed = [], False
+    for task in args.task:
+        for method in args.method:
+            try:
+                plan = plan_combination(task, method, args)
+            except FileNotFoundError as e:
+                print(f"오류: '{e.filename}' 파일을 찾을 수 없습니다.")
+                failed = True
+                continue
+            except (OSError, ValueError) as e:
+                print(f"오류: {e}")
+                failed = True
+                continue
+            plans.append(plan)
+            print(format_plan(plan))
+
+    directory = args.output_dir or RESULTS_DIR
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, PLAN_FILENAME)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"plans": plans}, f, ensure_ascii=False, indent=2)
+    print(f"추정 결과 저장: '{path}'")
+    return 1 if failed else 0
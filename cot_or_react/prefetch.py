@@ -0,0 +1,106 @@
+"""
+ReAct 항목 시작 시 공휴일 월 데이터를 미리 조회하는 선조회기(speculative prefetch).
+
+공휴일이 걸린 항목에서 에이전트는 보통 두세 번째 행동으로 앵커 연도의 calendar_db 를 조회합니다.
+HolidayPrefetcher 는 항목이 시작될 때 첫 Thought 호출과 병렬로 앵커 연도(12월 근처면 다음 해까지)의
+월별 특일을 백그라운드에서 가져와 두고, 실제 도구 호출이 그 결과를 바로 쓰게 합니다.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+
+# 이 단어가 들어간 질의만 공휴일 조회가 필요하다고 보고 선조회합니다.
+HOLIDAY_HINTS = (
+    "공휴일", "휴일", "연휴", "영업일", "명절", "설날", "추석", "어린이날", "크리스마스", "성탄절",
+    "한글날", "광복절", "개천절", "현충일", "삼일절", "부처님", "신정", "대체",
+)
+
+PREFETCH_CATEGORY = "rest"
+
+
+def needs_holidays(input_text: str) -> bool:
+    return any(hint in str(input_text) for hint in HOLIDAY_HINTS)
+
+
+def prefetch_targets(anchor_date: str) -> list:
+    """
+    선조회할 (year, month, category) 목록. 앵커 연도 전체에, 11~12월이면 다음 해를 더합니다.
+    """
+    anchor = date.fromisoformat(anchor_date)
+    years = [anchor.year, anchor.year + 1] if anchor.month >= 11 else [anchor.year]
+    return [(str(y), f"{m:02d}", PREFETCH_CATEGORY) for y in years for m in range(1, 13)]
+
+
+class HolidayPrefetcher:
+    """
+    fetch_month(year, month, category) 를 백그라운드 스레드로 미리 실행합니다.
+    track() 으로 감싼 함수가 실제 도구 경로에서 쓰이며, 선조회된 월이면 그 결과(진행 중이면 완료를 기다려)를 돌려줍니다.
+    """
+
+    def __init__(self, fetch_month, max_workers: int = 4):
+        self._fetch_month = fetch_month
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="holiday-prefetch")
+        self._futures = {}   # (year, month, category) -> Future
+        self._used = set()
+        self._lock = threading.Lock()
+        self.demand_hits = 0
+        self.demand_misses = 0
+
+    def start(self, anchor_date: str):
+        """
+        항목 시작 시 호출합니다. 아직 선조회하지 않은 월만 제출하므로 같은 연도는 실행당 한 번만 가져옵니다.
+        """
+        try:
+            targets = prefetch_targets(anchor_date)
+        except ValueError:
+            return
+        with self._lock:
+            for key in targets:
+                if key not in self._futures:
+                    self._futures[key] = self._executor.submit(self._fetch_month, *key)
+
+    def track(self, fetch_month):
+        """
+        도구 경로의 월 조회 함수를 감싸 선조회 결과를 재사용하고 적중/미적중을 집계합니다.
+        """
+        def tracked(year, month, category="rest"):
+            key = (str(year), str(month).zfill(2), category)
+            with self._lock:
+                future = self._futures.get(key)
+                if future is not None:
+                    self._used.add(key)
+                    self.demand_hits += 1
+                else:
+                    self.demand_misses += 1
+            if future is not None:
+                try:
+                    return future.result()
+                except Exception:
+                    # 선조회가 실패했으면 도구 경로에서 다시 시도합니다.
+                    pass
+            return fetch_month(year, month, category)
+
+        return tracked
+
+    def stats(self) -> dict:
+        with self._lock:
+            demanded = self.demand_hits + self.demand_misses
+            return {
+                "prefetched": len(self._futures),
+                "used": len(self._used),
+                "wasted": len(self._futures) - len(self._used),
+                "demand_hits": self.demand_hits,
+                "demand_misses": self.demand_misses,
+                "hit_rate": round(self.demand_hits / demanded, 4) if demanded else 0.0,
+            }
+
+    def format_stats(self) -> str:
+        s = self.stats()
+        return (
+            f"공휴일 선조회: {s['prefetched']}개월 조회 / 사용 {s['used']} / 낭비 {s['wasted']}, "
+            f"도구 요청 적중 {s['demand_hits']} / 미적중 {s['demand_misses']} (적중률 {s['hit_rate']:.1%})"
+        )
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
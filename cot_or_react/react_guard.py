@@ -0,0 +1,121 @@
+"""
+T3 ReAct 턴 루프의 반복·정체(stall) 감지.
+
+항목마다 StallGuard 를 하나 만들어 두고, 매 턴의 (tool, tool_input) 과 관측 결과를 넘깁니다.
+이미 실행한 호출(이미 조회한 공휴일 월 포함)은 항목 단위 메모에서 바로 돌려주고,
+진전 없는 턴이 연속으로 max_stall_turns 번 쌓이면 루프를 강제로 끝내도록 알려줍니다.
+"""
+import json
+
+from cot_or_react.canonical import calendar_months, canonical_calendar_input, canonical_tool_input
+
+
+DEFAULT_MAX_STALL_TURNS = 3
+
+
+class StallGuard:
+    def __init__(self, max_stall_turns: int = DEFAULT_MAX_STALL_TURNS):
+        self.max_stall_turns = max_stall_turns
+        self._memo = {}            # 정규화된 호출 키 -> 관측 결과
+        self._calendar_items = {}  # (year, month, category) -> 해당 월의 특일 목록
+        self._observations = set()
+        self._last_dates = None
+        self._hinted = set()       # 이미 Planner 에게 안내한 호출 키
+
+        self.stall_turns = 0       # 연속 정체 턴 수
+        self.total_stall_turns = 0
+        self.memo_hits = 0
+        self.stall_reason = None
+
+    def _calendar_keys(self, tool_input: dict) -> list:
+        canon = canonical_calendar_input(tool_input)
+        return [(canon["year"], m, canon["category"]) for m in calendar_months(canon["month"])]
+
+    def recall(self, tool_name: str, tool_input):
+        """
+        이 항목에서 이미 실행한 호출이면 저장된 관측 결과를, 처음 보는 호출이면 None 을 반환합니다.
+        calendar_db 는 요청한 월이 모두 이전에 조회된 경우에도 반복으로 봅니다.
+        """
+        key = canonical_tool_input(tool_name, tool_input)
+        if key in self._memo:
+            self.memo_hits += 1
+            return self._memo[key]
+
+        if tool_name == "calendar_db" and isinstance(tool_input, dict):
+            month_keys = self._calendar_keys(tool_input)
+            if month_keys and all(k in self._calendar_items for k in month_keys):
+                items = [item for k in month_keys for item in self._calendar_items[k]]
+                self.memo_hits += 1
+                return json.dumps(items, ensure_ascii=False) if items else "No special days found."
+        return None
+
+    def remember(self, tool_name: str, tool_input, observation: str):
+        self._memo[canonical_tool_input(tool_name, tool_input)] = observation
+
+        if tool_name == "calendar_db" and isinstance(tool_input, dict):
+            # 월별로 쪼개 둘 수 있는 관측(특일 JSON 배열 / 없음)만 월 단위로 기억합니다.
+            if observation == "No special days found.":
+                items = []
+            else:
+                try:
+                    items = json.loads(observation)
+                except (TypeError, ValueError):
+                    return
+                if not isinstance(items, list) or not all(isinstance(i, dict) for i in items):
+                    return
+            for year, month, category in self._calendar_keys(tool_input):
+                self._calendar_items[(year, month, category)] = [
+                    i for i in items if str(i.get("locdate", ""))[4:6] == month
+                ]
+
+    def record_turn(self, tool_name: str, tool_input, observation: str, repeated: bool, dates=None) -> bool:
+        """
+        한 턴의 결과를 기록합니다. 정체 턴이 연속 max_stall_turns 번에 도달하면 True 를 반환합니다(stalled).
+        진전이란 새로운 관측을 얻었거나, 관측 단계가 모은 날짜 목록이 바뀐 경우를 말합니다.
+        """
+        new_observation = not repeated and observation not in self._observations
+        self._observations.add(observation)
+        dates_changed = dates is not None and dates != self._last_dates
+        if dates is not None:
+            self._last_dates = dates
+
+        if new_observation or dates_changed:
+            self.stall_turns = 0
+            return False
+
+        self.stall_turns += 1
+        self.total_stall_turns += 1
+        kind = "repeated_action" if repeated else "no_progress"
+        self.stall_reason = f"{kind}: {canonical_tool_input(tool_name, tool_input)}"
+        return self.stalled
+
+    @property
+    def stalled(self) -> bool:
+        """
+        정체 한도에 도달했는지. max_stall_turns 가 0 이면 정체로 끝내지 않습니다(기록만 합니다).
+        """
+        return self.max_stall_turns > 0 and self.stall_turns >= self.max_stall_turns
+
+    @property
+    def last_dates(self):
+        return self._last_dates
+
+    def hint(self, tool_name: str, tool_input, observation: str):
+        """
+        반복 호출 시 Planner 에게 전달할 안내 문구입니다. 같은 호출에 대한 안내는 한 번만 돌려주고 이후에는 None 입니다.
+        """
+        key = canonical_tool_input(tool_name, tool_input)
+        if key in self._hinted:
+            return None
+        self._hinted.add(key)
+        return (
+            f"[Controller] The action {tool_name} {json.dumps(tool_input, ensure_ascii=False)} was already executed "
+            f"in this task and returned: {observation}. Do not repeat it; choose a different next step."
+        )
+
+    def summary(self) -> dict:
+        return {
+            "stall_turns": self.total_stall_turns,
+            "memo_hits": self.memo_hits,
+            "stall_reason": self.stall_reason,
+        }
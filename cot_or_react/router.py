@@ -0,0 +1,256 @@
+"""
+항목별 실행 경로(solver / cot / react) 라우터.
+
+지난 실행의 결과 파일에서 특징 버킷별로 경로마다 정확도, 평균 토큰, p95 latency 를 학습해 두고,
+실행할 때는 항목의 특징(temporal_pattern, input_text 어휘 분류, T3 제약 키)으로 버킷을 찾아
+"가장 정확한 경로보다 tolerance 이상 덜 정확하지 않은 경로 중 가장 싼 경로" 를 고릅니다.
+
+    python -m cot_or_react.router learn --results-dir results/solar --output router_table.json
+    python -m cot_or_react --task t1 t2 --method route --router-table router_table.json --route-tolerance 0.02
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+from cot_or_react import event_kb
+from cot_or_react.agent import run_item
+from cot_or_react.solver import solve
+from cot_or_react.tasks import TASKS, output_filename
+
+
+ROUTES = ("solver", "cot", "react")
+LLM_ROUTES = ("cot", "react")
+DEFAULT_TOLERANCE = 0.02
+MIN_SAMPLES = 3
+
+# input_text 어휘 분류. 앞쪽 분류가 우선합니다.
+LEXICAL_CLASSES = (
+    ("business_day", re.compile(r"영업일|평일|공휴일|휴일")),
+    ("quarter_fiscal", re.compile(r"분기|회계")),
+    ("month_scope", re.compile(r"달|월|말일")),
+    ("week_scope", re.compile(r"주|요일")),
+    ("relative_day", re.compile(r"일|어제|내일|모레|그저께|그제|글피|오늘|보름|사흘|열흘|이틀")),
+)
+
+_INVISIBLE = re.compile(r"[​‌‍﻿]")
+
+
+def lexical_class(text: str) -> str:
+    if event_kb.get_kb().match(text or ""):
+        return "event"
+    for name, pattern in LEXICAL_CLASSES:
+        if pattern.search(text or ""):
+            return name
+    return "other"
+
+
+def constraint_signature(constraints) -> str:
+    """
+    T3 제약에서 실제로 켜진 키만 모은 서명. 예: 'exclude_holidays+interval_days+min_count'.
+    """
+    if not isinstance(constraints, dict):
+        return ""
+    return "+".join(sorted(key for key, value in constraints.items() if value not in (None, False, 0, "", [])))
+
+
+def item_features(item: dict) -> list:
+    """
+    구체적인 것부터 일반적인 것 순으로 특징 버킷 키를 돌려줍니다. 마지막은 항상 'all' 입니다.
+    """
+    keys = []
+    pattern = (item.get("metadata") or {}).get("temporal_pattern")
+    if pattern:
+        keys.append(f"pattern:{pattern}")
+    signature = constraint_signature(item.get("constraints"))
+    if signature:
+        keys.append(f"constraints:{signature}")
+    solvable = solve(item.get("input_text"), item.get("anchor_date")) is not None
+    keys.append(f"lex:{lexical_class(item.get('input_text'))}:{'solvable' if solvable else 'open'}")
+    keys.append("all")
+    return keys
+
+
+def _normalize_answer(value):
+    if isinstance(value, list):
+        return sorted(_normalize_answer(v) for v in value)
+    if isinstance(value, str):
+        return _INVISIBLE.sub("", value).strip()
+    return value
+
+
+def is_correct(prediction, gold) -> bool:
+    return gold is not None and _normalize_answer(prediction) == _normalize_answer(gold)
+
+
+def percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def _route_stats(records: list) -> dict:
+    latencies = [r["latency"] for r in records]
+    return {
+        "n": len(records),
+        "accuracy": round(sum(r["correct"] for r in records) / len(records), 4),
+        "mean_tokens": round(sum(r["tokens"] for r in records) / len(records), 1),
+        "p95_latency": round(percentile(latencies, 0.95), 4),
+    }
+
+
+def choose_route(bucket: dict, tolerance: float, allowed) -> str:
+    """
+    버킷 통계에서 경로를 고릅니다. 최고 정확도와의 차이가 tolerance 이내인 경로 중 토큰, p95 latency 순으로 가장 싼 경로입니다.
+    """
+    candidates = {route: stats for route, stats in bucket.items() if route in allowed and stats["n"] >= MIN_SAMPLES}
+    if not candidates:
+        return None
+    best_accuracy = max(stats["accuracy"] for stats in candidates.values())
+    eligible = [route for route, stats in candidates.items() if stats["accuracy"] >= best_accuracy - tolerance]
+    return min(eligible, key=lambda route: (candidates[route]["mean_tokens"], candidates[route]["p95_latency"], ROUTES.index(route)))
+
+
+def _collect_records(results_dir: str, task: str) -> dict:
+    """
+    {item_key: {"item": item, "routes": {route: record}}}. 결과 파일의 LLM 경로와, 같은 항목에 대한 solver 결과를 모읍니다.
+    """
+    records = {}
+    for method in LLM_ROUTES:
+        path = os.path.join(results_dir, output_filename(task, method))
+        if not os.path.exists(path):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            results = json.load(f)
+        for position, item in enumerate(results):
+            key = (item.get("id"), position)
+            entry = records.setdefault(key, {"item": item, "routes": {}})
+            entry["routes"][method] = {
+                "correct": is_correct(item.get("prediction"), item.get("gold_standard")),
+                "tokens": item.get("tokens") or 0,
+                "latency": item.get("latency") or 0.0,
+            }
+
+    for entry in records.values():
+        item = entry["item"]
+        start_time = time.perf_counter()
+        prediction = solve(item.get("input_text"), item.get("anchor_date"))
+        if prediction is not None:
+            entry["routes"]["solver"] = {
+                "correct": is_correct(prediction, item.get("gold_standard")),
+                "tokens": 0,
+                "latency": time.perf_counter() - start_time,
+            }
+    return records
+
+
+def learn(results_dir: str, tasks=None) -> dict:
+    """
+    results_dir 의 `{task}_{cot,react}_results.json` 에서 Task 별 결정 테이블(버킷 -> 경로 -> 통계)을 만듭니다.
+    """
+    table = {"min_samples": MIN_SAMPLES, "tasks": {}}
+    for task in tasks or sorted(TASKS):
+        records = _collect_records(results_dir, task)
+        if not records:
+            continue
+        grouped = {}
+        for entry in records.values():
+            for key in item_features(entry["item"]):
+                for route, record in entry["routes"].items():
+                    grouped.setdefault(key, {}).setdefault(route, []).append(record)
+        table["tasks"][task] = {
+            key: {route: _route_stats(route_records) for route, route_records in routes.items()}
+            for key, routes in sorted(grouped.items())
+        }
+    return table
+
+
+class Router:
+    def __init__(self, buckets: dict, tolerance: float = DEFAULT_TOLERANCE):
+        self.buckets = buckets
+        self.tolerance = tolerance
+
+    @classmethod
+    def load(cls, path: str, task: str, tolerance: float = DEFAULT_TOLERANCE):
+        with open(path, "r", encoding="utf-8") as f:
+            table = json.load(f)
+        if task not in table.get("tasks", {}):
+            raise ValueError(f"router table '{path}' has no entries for task '{task}'")
+        return cls(table["tasks"][task], tolerance)
+
+    def decide(self, item: dict) -> tuple:
+        """
+        (경로, 근거 버킷 키). 충분한 표본이 있는 가장 구체적인 버킷을 씁니다. solver 는 해석 가능한 항목에만 허용합니다.
+        """
+        keys = item_features(item)
+        allowed = ROUTES if keys[-2].endswith(":solvable") else LLM_ROUTES
+        for key in keys:
+            route = choose_route(self.buckets.get(key, {}), self.tolerance, allowed)
+            if route:
+                return route, key
+        return "react", None
+
+    def run(self, item: dict, task_config: dict, contexts: dict) -> dict:
+        route, key = self.decide(item)
+        if route == "solver":
+            start_time = time.time()
+            prediction = solve(item.get("input_text"), item.get("anchor_date"))
+            item['thought'] = "Rule-based solver"
+            item['prediction'] = prediction
+            item['latency'] = time.time() - start_time
+            item['tokens'] = 0
+        else:
+            run_item(item, task_config, route, contexts[route])
+        item['route'] = {"route": route, "bucket": key, "tolerance": self.tolerance}
+        return item
+
+
+def project(table: dict, results_dir: str, tolerance: float) -> dict:
+    """
+    학습에 쓴 결과 파일 위에서 tolerance 로 라우팅했을 때의 정확도·토큰·p95 latency 를 항상-CoT / 항상-ReAct 와 비교합니다.
+    """
+    report = {}
+    for task, buckets in table["tasks"].items():
+        router = Router(buckets, tolerance)
+        chosen = {"route": []}
+        for entry in _collect_records(results_dir, task).values():
+            route, _ = router.decide(entry["item"])
+            if route in entry["routes"]:
+                chosen["route"].append(entry["routes"][route])
+            for method in LLM_ROUTES:
+                if method in entry["routes"]:
+                    chosen.setdefault(method, []).append(entry["routes"][method])
+        report[task] = {name: _route_stats(records) for name, records in chosen.items() if records}
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Learn or inspect the per-item method router.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    learn_parser = sub.add_parser("learn", help="Build a router table from past result files.")
+    learn_parser.add_argument('--results-dir', type=str, required=True, help="Directory containing {task}_{cot,react}_results.json.")
+    learn_parser.add_argument('--task', type=str, nargs='+', choices=sorted(TASKS), default=None, help="Tasks to learn (default: all found).")
+    learn_parser.add_argument('--output', type=str, default="router_table.json", help="Where to write the router table.")
+    learn_parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help="Accuracy drop allowed for the projection report.")
+    args = parser.parse_args(argv)
+
+    table = learn(args.results_dir, args.task)
+    if not table["tasks"]:
+        print(f"'{args.results_dir}' 에서 결과 파일을 찾지 못했습니다.")
+        return 1
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(table, f, ensure_ascii=False, indent=2)
+    print(f"라우터 테이블 저장: '{args.output}'")
+
+    for task, rows in project(table, args.results_dir, args.tolerance).items():
+        print(f"[{task}] tolerance={args.tolerance}")
+        for name, stats in rows.items():
+            print(f"  {name:<6} 정확도 {stats['accuracy']:.3f}, 평균 토큰 {stats['mean_tokens']:.0f}, p95 latency {stats['p95_latency']:.2f}초 (n={stats['n']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,654 @@
+"""
+여러 Task / 메소드 조합을 한 프로세스에서 실행하는 진입점.
+
+    python -m cot_or_react --task t1 t2 t3 --method cot react
+
+LLM 클라이언트(HTTP 커넥션 풀), 도구 메모, 선조회 스레드, 이벤트 KB 를 모든 조합이 공유하므로
+스윕 전체가 콜드 스타트를 한 번만 치릅니다. t1.py / t2.py / t3.py / t3_llm.py 는 이 모듈을 감싼 얇은 래퍼입니다.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
+from cot_or_react.agent import RunContext, is_error_prediction, run_item
+from cot_or_react.batch import DEFAULT_BATCH_TOKENS, pack_batches, run_cot_batch
+from cot_or_react.batch_job import BATCH_PHASES, BatchLLM, find_batch_files, load_responses, prepare
+from cot_or_react.budget import DEFAULT_THRESHOLDS, DEGRADED_MAX_TURNS, SCOPES, BudgetController, budgeted, budgeted_batch, shard_limits
+from cot_or_react.endpoints import ENDPOINT_COUNTERS, endpoint_summary, parse_endpoint
+from cot_or_react.extract import constraint_summary, run_extract_solve
+from cot_or_react.json_repair import JSON_REPAIR_MODES, REPAIR_STATS
+from cot_or_react.kasi_cassette import Cassette, RecordingSession, parse_replay, replay_session
+from cot_or_react.llm import DEFAULT_MODEL, LLM, STREAM_STATS, stream_summary
+from cot_or_react.planner import dry_run
+from cot_or_react.react_guard import DEFAULT_MAX_STALL_TURNS
+from cot_or_react.router import DEFAULT_TOLERANCE, LLM_ROUTES, Router
+from cot_or_react.stamp import carry_forward, item_stamp, load_previous, previous_results_path, run_fingerprint
+from cot_or_react.shard import launch, merge_stem, parse_shard, select_shard, shard_filename
+from cot_or_react.singleflight import SingleFlight
+from cot_or_react.solver import solve
+from cot_or_react.tasks import DATA_DIR, METHODS, PROMPT_DIR, TASKS, load_dataset, load_prompts, output_filename
+from cot_or_react.tool_memo import DEFAULT_CACHE_SIZE, ToolMemo
+from cot_or_react.tools import Toolbox, http_session, install_http_session
+from cot_or_react.trace_store import TraceStore, trace_path, write_slim_results
+from cot_or_react.verifier import VERIFIER_MODES, calibrate, verifier_summary
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run model with CoT or ReAct method.")
+    parser.add_argument(
+        '--task',
+        type=str,
+        nargs='+',
+        choices=sorted(TASKS),
+        required=True,
+        help="Task(s) to run: t1, t2, t3."
+    )
+    parser.add_argument(
+        '--method',
+        type=str,
+        nargs='+',
+        choices=(*METHODS, "route", "extract-solve"),
+        required=True,
+        help="Method(s) to use: 'cot' for Chain-of-Thought, 'react' for ReAct, 'route' to pick solver/CoT/ReAct per item, "
+             "'extract-solve' (T3) for one constraint-extraction call plus a deterministic scheduler."
+    )
+    parser.add_argument(
+        '--router-table',
+        type=str,
+        default=None,
+        help="Route method: decision table built by 'python -m cot_or_react.router learn'."
+    )
+    parser.add_argument(
+        '--route-tolerance',
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Route method: accuracy drop allowed (vs. the most accurate route) in exchange for fewer tokens / lower latency."
+    )
+    parser.add_argument(
+        '--tool-mode',
+        type=str,
+        choices=['real', 'llm', 'hybrid'],
+        default='real',
+        help="'real': deterministic tools and KASI API. 'llm': simulate every tool with the LLM. 'hybrid': deterministic path first, LLM simulation only when it fails."
+    )
+    parser.add_argument(
+        '--shadow-rate',
+        type=float,
+        default=0.0,
+        help="Hybrid mode: fraction of deterministic tool calls that are also simulated by the LLM and compared."
+    )
+    parser.add_argument(
+        '--max-stall-turns',
+        type=int,
+        default=DEFAULT_MAX_STALL_TURNS,
+        help="ReAct: stop an item after this many consecutive turns without progress (repeated actions or no new information). 0 disables the stop."
+    )
+    parser.add_argument(
+        '--react-verifier',
+        type=str,
+        choices=VERIFIER_MODES,
+        default='off',
+        help="T3 ReAct: check the Decider's candidate dates locally against the rules parsed from the request. "
+             "'on' finishes as soon as a verified list exists (only for constraint shapes whose parsed rules reproduce the dataset "
+             "gold), 'shadow' only records when it would have."
+    )
+    parser.add_argument(
+        '--json-repair',
+        type=str,
+        choices=JSON_REPAIR_MODES,
+        default='reask',
+        help="Malformed JSON responses: 'local' fixes code fences, surrounding text, single quotes and trailing commas; "
+             "'reask' also sends one short re-ask with only the malformed output and the step's schema; 'off' fails the item."
+    )
+    parser.add_argument(
+        '--tool-cache-size',
+        type=int,
+        default=DEFAULT_CACHE_SIZE,
+        help="Number of tool results memoized across items (0 disables the memo)."
+    )
+    parser.add_argument(
+        '--tool-cache-dir',
+        type=str,
+        default=None,
+        help="Optional directory where memoized tool results are also written, so later runs can reuse them."
+    )
+    parser.add_argument(
+        '--prefetch-holidays',
+        action='store_true',
+        help="ReAct: when a holiday-related item starts, fetch its anchor year's holidays in the background."
+    )
+    kasi = parser.add_mutually_exclusive_group()
+    kasi.add_argument(
+        '--kasi-record',
+        type=str,
+        default=None,
+        metavar='CASSETTE',
+        help="Append every successful KASI response to a cassette (JSONL) for later offline replay."
+    )
+    kasi.add_argument(
+        '--kasi-replay',
+        type=parse_replay,
+        default=None,
+        metavar='CASSETTE[,latency_ms=MS|recorded][,jitter_ms=MS][,failure_rate=P][,seed=N]',
+        help="Serve KASI calls from a cassette instead of the network, with optional injected latency and HTTP 503 failures."
+    )
+    parser.add_argument(
+        '--cot-batch-size',
+        type=int,
+        default=1,
+        help="CoT: pack up to N items into one request (1 sends each item separately)."
+    )
+    parser.add_argument(
+        '--cot-batch-tokens',
+        type=int,
+        default=DEFAULT_BATCH_TOKENS,
+        help="CoT batching: approximate ceiling on the item input tokens packed into one request."
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help="Stream completions: stop as soon as the keys a step needs are complete and record TTFT / tokens per second."
+    )
+    parser.add_argument(
+        '--max-output-chars',
+        type=int,
+        default=None,
+        help="Streaming: cancel generation once a response grows past this many characters."
+    )
+    parser.add_argument(
+        '--no-coalesce',
+        action='store_true',
+        help="Send every LLM / tool request even when an identical one is already in flight (by default concurrent duplicates share one call)."
+    )
+    parser.add_argument(
+        '--trace-store',
+        type=str,
+        choices=['inline', 'gzip', 'zstd', 'plain'],
+        default='inline',
+        help="'inline' keeps full records in the results file. Otherwise results hold only id/prediction/latency/tokens and traces go to a deduplicated <results>.traces.jsonl[.gz|.zst] file."
+    )
+    parser.add_argument(
+        '--incremental',
+        nargs='?',
+        const='',
+        default=None,
+        metavar='PREVIOUS',
+        help="Re-run only items whose input_hash (prompts, model, options, tool sources, item fields) changed, carrying the rest forward from PREVIOUS (a results file or directory; default: the existing file in --output-dir)."
+    )
+    parser.add_argument('--model', type=str, default=DEFAULT_MODEL, help="Model name passed to the chat completions API.")
+    parser.add_argument('--base-url', type=str, default=None, help="OpenAI-compatible base URL (default: $UPSTAGE_BASE_URL or Upstage).")
+    parser.add_argument(
+        '--endpoint',
+        type=parse_endpoint,
+        action='append',
+        default=None,
+        metavar='URL[,api_key_env=NAME][,max_concurrency=N][,weight=W]',
+        help="Spread LLM calls over several OpenAI-compatible endpoints (repeat the option). Overrides --base-url."
+    )
+    parser.add_argument('--data-dir', type=str, default=DATA_DIR, help="Directory containing T*_dataset.json.")
+    parser.add_argument('--prompt-dir', type=str, default=PROMPT_DIR, help="Directory containing the prompt files.")
+    parser.add_argument('--output-dir', type=str, default=None,
+                        help="Directory where result files are written (default: the current directory; "
+                             "--dry-run writes its plan to results/ in the repo).")
+    parser.add_argument('--workers', type=int, default=1, help="Number of items processed concurrently per task/method.")
+    parser.add_argument(
+        '--shard',
+        type=parse_shard,
+        default=None,
+        help="Process only shard i of N ('i/N'): items i, i+N, i+2N, ... Output files get a .shard-i-of-N suffix."
+    )
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=1,
+        help="Run N shard processes locally and merge their outputs. Share --tool-cache-dir to share tool results."
+    )
+    parser.add_argument('--max-run-tokens', type=int, default=None,
+                        help="Run budget: total LLM tokens (see --budget-scope; split evenly between shards).")
+    parser.add_argument('--max-run-calls', type=int, default=None,
+                        help="Run budget: total LLM calls (see --budget-scope; split evenly between shards).")
+    parser.add_argument('--max-run-seconds', type=float, default=None, help="Run budget: wall time in seconds.")
+    parser.add_argument(
+        '--budget-scope',
+        type=str,
+        choices=SCOPES,
+        default="run",
+        help="What the --max-run-* limits cover. 'run': one budget shared by every task/method combination, in order, "
+             "so later combinations degrade earlier. 'combination': each combination gets the full limits. "
+             "Each summary reports what its combination used either way."
+    )
+    parser.add_argument('--max-item-tokens', type=int, default=None, help="Per-item budget: LLM tokens one item may use.")
+    parser.add_argument('--max-item-calls', type=int, default=None, help="Per-item budget: LLM calls one item may make.")
+    parser.add_argument('--max-item-seconds', type=float, default=None, help="Per-item budget: seconds one item may run.")
+    parser.add_argument(
+        '--budget-thresholds',
+        type=float,
+        nargs=2,
+        default=DEFAULT_THRESHOLDS,
+        metavar=('FEWER_TURNS', 'CHEAPER_METHOD'),
+        help="Run budget usage at which new items get fewer ReAct turns, then a cheaper method (solver / extract-solve / CoT). "
+             "At 1.0 remaining items are not run."
+    )
+    parser.add_argument(
+        '--batch-phase',
+        type=str,
+        choices=BATCH_PHASES,
+        default=None,
+        help="Offline batch mode. 'prepare' writes every first-stage request (CoT call, first ReAct thought, extraction) to "
+             "{task}_{method}_batch_input.jsonl without calling the API; 'ingest' answers those calls from the matching "
+             "_batch_output.jsonl (see python -m cot_or_react.batch_job execute) and runs the rest of the pipeline."
+    )
+    parser.add_argument('--batch-dir', type=str, default=None, help="Directory for batch input/output files (default: --output-dir).")
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help="Do not call the API: build every first-turn prompt, count tokens locally and project calls, tokens and wall time from past results."
+    )
+    parser.add_argument(
+        '--history-dir',
+        type=str,
+        default=None,
+        help="Dry run: directory with past result files used for per-method turn / token / latency distributions "
+             "(default: --output-dir, else the current directory)."
+    )
+    parser.add_argument(
+        '--rate-limit',
+        type=float,
+        default=None,
+        help="Dry run: requests per minute allowed by the provider."
+    )
+    parser.add_argument(
+        '--token-rate-limit',
+        type=float,
+        default=None,
+        help="Dry run: tokens per minute allowed by the provider."
+    )
+    return parser
+
+
+def process_items(dataset: list, handle, workers: int, desc: str) -> list:
+    """
+    handle(item) 을 모든 항목에 적용합니다. workers > 1 이면 스레드 풀을 쓰되 결과 순서는 데이터셋 순서를 유지합니다.
+    """
+    from tqdm import tqdm
+
+    if workers <= 1:
+        return [handle(item) for item in tqdm(dataset, desc=desc)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(tqdm(pool.map(handle, dataset), total=len(dataset), desc=desc))
+
+
+def summarize(results: list, task: str, method: str, args, llm_before: dict, llm_after: dict, wall_time: float) -> dict:
+    errors = sum(1 for r in results if is_error_prediction(r.get("prediction")))
+    # 정체·예산으로 멈춰 그때까지 모은 날짜를 답으로 낸 항목. Decider 가 끝낸 답과 따로 셉니다.
+    forced = Counter(r.get("forced_finish") for r in results if r.get("forced_finish"))
+    llm_delta = {key: llm_after[key] - llm_before[key] for key in llm_after}
+    stream = {key: llm_delta.pop(key) for key in STREAM_STATS}
+    summary = {
+        "task": task,
+        "method": method,
+        "tool_mode": args.tool_mode,
+        "model": args.model,
+        "items": len(results),
+        "errors": errors,
+        "forced_finishes": dict(forced),
+        "wall_time": round(wall_time, 3),
+        "llm": llm_delta,
+    }
+    if stream["stream_calls"]:
+        summary["stream"] = stream_summary(dict(stream, completion_tokens=llm_delta["completion_tokens"]))
+    return summary
+
+
+def endpoint_delta(before: dict, after: dict) -> dict:
+    return {
+        label: {key: counts[key] - before.get(label, {}).get(key, 0) for key in ENDPOINT_COUNTERS}
+        for label, counts in after.items()
+    }
+
+
+def slimmed(handle, store, batched: bool = False):
+    """
+    트레이스 저장소를 쓰면 handle 이 끝낸 항목을 바로 슬림 레코드로 바꿔, 실행 중 메모리에는 슬림 레코드만 남깁니다.
+    데이터셋 항목은 복사본으로 처리해 원본에 실행 기록이 쌓이지 않게 합니다.
+    """
+    if store is None:
+        return handle
+    if batched:
+        def run_batch(batch):
+            copies = [dict(item) for item in batch]
+            input_keys = [set(item) for item in copies]
+            return [store.slim(item, keys) for item, keys in zip(handle(copies), input_keys)]
+        return run_batch
+
+    def run(item):
+        copy = dict(item)
+        input_keys = set(copy)
+        return store.slim(handle(copy), input_keys)
+    return run
+
+
+def route_name(result) -> str:
+    route = result.get("route")
+    if isinstance(route, dict):
+        return route.get("route", "none")
+    return route or "none"
+
+
+def cheaper_runner(task: str, method: str, args, llm: LLM, toolbox: Toolbox, budget: BudgetController):
+    """
+    예산 cheaper_method 단계에서 쓸 경로. T1/T2 는 규칙 해석기(풀리지 않으면 ReAct 대신 CoT),
+    T3 ReAct 는 extract-solve(프롬프트가 없으면 CoT) 입니다. 더 싼 경로가 없으면 None 을 돌려주는 함수를 반환합니다.
+    """
+    task_config = TASKS[task]
+    fallback = {}
+    for m in ("cot", "extract-solve"):
+        try:
+            fallback[m] = RunContext(llm=llm, toolbox=toolbox, prompts=load_prompts(task, m, args.prompt_dir),
+                                     max_stall_turns=args.max_stall_turns, budget=budget, json_repair=args.json_repair)
+        except FileNotFoundError:
+            continue
+
+    def run(item):
+        if method == "extract-solve":
+            return None
+        if task_config["react"] == "single_step":
+            start_time = time.time()
+            prediction = solve(item.get("input_text"), item.get("anchor_date"))
+            if prediction is not None:
+                budget.record(item, "method=solver")
+                item['thought'] = "Rule-based solver"
+                item['prediction'] = prediction
+                item['latency'] = time.time() - start_time
+                item['tokens'] = 0
+                return item
+        if method == "cot":
+            return None
+        if task_config["react"] == "loop" and "extract-solve" in fallback:
+            budget.record(item, "method=extract-solve")
+            return run_extract_solve(item, fallback["extract-solve"])
+        if "cot" in fallback:
+            budget.record(item, "method=cot")
+            return run_item(item, task_config, "cot", fallback["cot"])
+        return None
+    return run
+
+
+def run_combination(task: str, method: str, args, llm: LLM, toolbox: Toolbox, budget: BudgetController = None):
+    """
+    한 Task / 메소드 조합을 실행하고 결과 파일과 요약 파일을 저장합니다. 실패하면 None 을 반환합니다.
+    """
+    try:
+        prompts = {m: load_prompts(task, m, args.prompt_dir) for m in (LLM_ROUTES if method == "route" else (method,))}
+    except FileNotFoundError as e:
+        print(f"오류: '{e.filename}' 파일을 찾을 수 없습니다.")
+        return None
+    router = None
+    if method == "route":
+        try:
+            router = Router.load(args.router_table, task, args.route_tolerance)
+        except (OSError, ValueError) as e:
+            print(f"오류: 라우터 테이블을 읽을 수 없습니다: {e}")
+            return None
+    try:
+        dataset = select_shard(load_dataset(task, args.data_dir), args.shard)
+    except FileNotFoundError as e:
+        print(f"오류: '{e.filename}' 파일을 찾을 수 없습니다.")
+        return None
+    batch_llm = None
+    if args.batch_phase == "ingest":
+        try:
+            input_path, batch_output = find_batch_files(args.batch_dir or args.output_dir, task, method, args.shard)
+            batch_llm = llm = BatchLLM(llm, load_responses(input_path, batch_output), os.path.basename(batch_output))
+        except FileNotFoundError as e:
+            print(f"오류: '{e.filename}' 파일을 찾을 수 없습니다. 먼저 --batch-phase prepare 와 batch_job execute 를 실행하세요.")
+            return None
+
+    task_config = TASKS[task]
+    calibration = None
+    if args.react_verifier == "on" and task_config["react"] == "loop":
+        # on 모드는 데이터셋 전체(샤드와 상관없이)에서 expected 가 gold 와 맞은 제약 모양에서만 루프를 일찍 끝냅니다.
+        calibration = calibrate(load_dataset(task, args.data_dir), toolbox.holidays)
+    contexts = {
+        m: RunContext(llm=llm, toolbox=toolbox, prompts=m_prompts, max_stall_turns=args.max_stall_turns,
+                      verifier=args.react_verifier, verifier_trusted=tuple(calibration["trusted"]) if calibration else (),
+                      budget=budget, json_repair=args.json_repair)
+        for m, m_prompts in prompts.items()
+    }
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    output_path = os.path.join(args.output_dir, shard_filename(output_filename(task, method, args.tool_mode), args.shard))
+
+    fingerprint = run_fingerprint(method, prompts, args, args.router_table if router is not None else None)
+    for item in dataset:
+        item["input_hash"] = item_stamp(item, fingerprint)
+    carried = {}
+    previous_path = None
+    if args.incremental is not None:
+        # 이전 결과는 새 결과·트레이스 파일을 열기 전에 읽어야 같은 경로를 덮어써도 안전합니다.
+        previous_path = previous_results_path(
+            args.incremental, args.output_dir,
+            [os.path.basename(output_path), output_filename(task, method, args.tool_mode)],
+        )
+        if previous_path:
+            carried = carry_forward(dataset, load_previous(previous_path, dataset))
+        else:
+            print("증분 실행: 이전 결과 파일이 없어 모든 항목을 실행합니다.")
+    stale = [item for position, item in enumerate(dataset) if position not in carried]
+
+    try:
+        store = TraceStore(trace_path(output_path, args.trace_store)) if args.trace_store != "inline" else None
+    except RuntimeError as e:
+        print(f"오류: {e}")
+        return None
+
+    batched = router is None and method == "cot" and args.cot_batch_size > 1
+    diffs, verdicts = [], []
+
+    def item_runner(run_contexts: dict):
+        if router is not None:
+            return lambda item: router.run(item, task_config, run_contexts)
+        if method == "extract-solve":
+            def extract_item(item):
+                item = run_extract_solve(item, run_contexts[method])
+                if "constraint_diff" in item:
+                    diffs.append(item["constraint_diff"])
+                return item
+            return extract_item
+
+        def method_item(item):
+            item = run_item(item, task_config, method, run_contexts[method])
+            if "react_verifier" in item:
+                verdicts.append(item["react_verifier"])
+            return item
+        return method_item
+
+    if batched:
+        run_batch = lambda batch: run_cot_batch(batch, contexts[method])
+        handle = slimmed(budgeted_batch(run_batch, budget) if budget is not None else run_batch, store, batched=True)
+    elif budget is not None:
+        fewer_turns = None
+        if task_config["react"] == "loop" and method in ("react", "route"):
+            fewer_turns = item_runner({m: replace(ctx, max_turns=DEGRADED_MAX_TURNS) for m, ctx in contexts.items()})
+        cheaper = cheaper_runner(task, method, args, llm, toolbox, budget)
+        handle = slimmed(budgeted(item_runner(contexts), budget, fewer_turns, cheaper), store)
+    else:
+        handle = slimmed(item_runner(contexts), store)
+
+    llm_before = llm.stats()
+    endpoints_before = llm.endpoint_stats()
+    degradations_before = Counter(budget.degradations) if budget is not None else None
+    budget_before = budget.usage() if budget is not None else None
+    repairs_before = REPAIR_STATS.snapshot()
+    start_time = time.time()
+    desc = f"데이터 처리 중 ({task.upper()} {method.upper()})"
+    try:
+        if batched:
+            batches = pack_batches(stale, args.cot_batch_size, args.cot_batch_tokens)
+            fresh = [item for batch in process_items(batches, handle, args.workers, desc) for item in batch]
+        else:
+            fresh = process_items(stale, handle, args.workers, desc)
+        fresh = iter(fresh)
+        results = []
+        for position, item in enumerate(dataset):
+            if position not in carried:
+                results.append(next(fresh))
+                continue
+            if "constraint_diff" in carried[position]:
+                diffs.append(carried[position]["constraint_diff"])
+            if "react_verifier" in carried[position]:
+                verdicts.append(carried[position]["react_verifier"])
+            if store is not None:
+                results.append(store.slim(dict(carried[position]), set(item)))
+            else:
+                results.append(carried[position])
+    finally:
+        if store is not None:
+            store.close()
+    summary = summarize(results, task, method, args, llm_before, llm.stats(), time.time() - start_time)
+    if endpoints_before:
+        summary["endpoints"] = endpoint_summary(endpoint_delta(endpoints_before, llm.endpoint_stats()))
+    if router is not None:
+        summary["routes"] = dict(Counter(route_name(r) for r in results))
+    if method == "extract-solve":
+        summary["constraints"] = constraint_summary(diffs)
+    if verdicts:
+        summary["verifier"] = verifier_summary(verdicts)
+    if calibration is not None:
+        summary.setdefault("verifier", {})["calibration"] = {key: calibration[key] for key in ("items", "agreed", "trusted")}
+    if budget is not None:
+        summary["budget"] = budget.summary(degradations_before, budget_before)
+    if batch_llm is not None:
+        summary["batch"] = batch_llm.summary()
+    repairs = REPAIR_STATS.summary(repairs_before)
+    if repairs:
+        summary["json_repairs"] = repairs
+    if args.incremental is not None:
+        summary["incremental"] = {
+            "previous": os.path.basename(previous_path) if previous_path else None,
+            "carried": len(carried),
+            "rerun": len(stale),
+        }
+    if store is not None:
+        summary["trace_store"] = dict(store.stats(), path=os.path.basename(store.path))
+    if args.shard:
+        summary["shard"] = list(args.shard)
+
+    if store is not None:
+        write_slim_results(output_path, [r.to_dict() for r in results])
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    with open(output_path[:-len(".json")] + ".summary.json", 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    print(f"\n작업 완료. 결과가 '{output_path}' 파일에 저장되었습니다.")
+    print(f"  항목 {summary['items']}개, 오류 {summary['errors']}개, LLM 호출 {summary['llm']['calls']}회, "
+          f"토큰 {summary['llm']['total_tokens']}, 소요 {summary['wall_time']:.1f}초")
+    if summary['forced_finishes']:
+        print("  강제 종료(모은 날짜로 답함): " + ", ".join(f"{reason} {n}개" for reason, n in sorted(summary['forced_finishes'].items())))
+    if summary['llm']['coalesced']:
+        print(f"  동시 중복 요청 합류 {summary['llm']['coalesced']}회 (추가 호출 없이 진행 중인 응답을 공유)")
+    if batch_llm is not None:
+        print(f"  배치 응답 사용 {summary['batch']['served']}회 (토큰 {summary['batch']['prompt_tokens'] + summary['batch']['completion_tokens']}, "
+              f"'{summary['batch']['source']}'), 나머지 호출은 API 로 실행")
+    if repairs:
+        print(f"  JSON 복구: 로컬 {repairs['repaired_locally']}회, 재요청 {repairs['reasked']}회 "
+              f"(실패 {repairs['reask_failed'] + repairs['unrepaired']}회), 수정 {repairs['fixes']}")
+    if budget is not None:
+        spent = summary["budget"]["combination_usage"]
+        print(f"  예산({summary['budget']['scope']}) 중 이 조합 사용: 토큰 {spent['tokens']}, 호출 {spent['calls']}회, {spent['seconds']}초 "
+              f"(사용률 {summary['budget']['pressure']:.0%})")
+    if budget is not None and summary["budget"]["degradations"]:
+        print(f"  예산 조정 {summary['budget']['degradations']} (최고 단계: {summary['budget']['peak_level']})")
+    return summary
+
+
+def run_processes(argv: list, args) -> int:
+    """
+    --processes N: 샤드 프로세스 N 개를 띄워 실행한 뒤 Task / 메소드 조합별로 결과를 병합합니다.
+    """
+    failed = launch(argv, args.processes)
+    for task in args.task:
+        for method in args.method:
+            stem = output_filename(task, method, args.tool_mode)[:-len(".json")]
+            try:
+                merged_path = merge_stem(args.output_dir, stem)
+            except ValueError as e:
+                print(f"오류: {e}")
+                failed = 1
+                continue
+            print(f"병합 완료: '{merged_path}'")
+    return failed
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if "route" in args.method and not args.router_table:
+        parser.error("--method route requires --router-table")
+    if "extract-solve" in args.method and set(args.task) - {"t3"}:
+        parser.error("--method extract-solve only applies to --task t3 (got: %s)" % ", ".join(sorted(set(args.task) - {"t3"})))
+    if args.max_stall_turns < 0:
+        parser.error("--max-stall-turns must be >= 0 (0 disables the stall stop)")
+    if args.dry_run:
+        return dry_run(args)
+    args.output_dir = args.output_dir or "."
+    if args.batch_phase and args.cot_batch_size > 1:
+        parser.error("--batch-phase sends one request per item; drop --cot-batch-size")
+    if args.batch_phase == "prepare":
+        return prepare(args, LLM(model=args.model))
+    if args.processes > 1 and not args.shard:
+        return run_processes(argv, args)
+
+    if args.kasi_record:
+        install_http_session(RecordingSession(Cassette(args.kasi_record), http_session()))
+    replay = None
+    if args.kasi_replay:
+        replay = replay_session(args.kasi_replay)
+        install_http_session(replay)
+
+    llm = LLM(model=args.model, base_url=args.base_url, stream=args.stream, max_output_chars=args.max_output_chars,
+              coalesce=not args.no_coalesce, endpoints=args.endpoint)
+    toolbox = Toolbox(
+        llm,
+        mode=args.tool_mode,
+        memo=ToolMemo(args.tool_cache_size, args.tool_cache_dir),
+        prefetch=args.prefetch_holidays and ("react" in args.method or "route" in args.method),
+        shadow_rate=args.shadow_rate,
+        flight=None if args.no_coalesce else SingleFlight(),
+    )
+
+    run_limits = shard_limits({"tokens": args.max_run_tokens, "calls": args.max_run_calls, "seconds": args.max_run_seconds}, args.shard)
+    item_limits = {"tokens": args.max_item_tokens, "calls": args.max_item_calls, "seconds": args.max_item_seconds}
+    budgeted_run = any(run_limits.values()) or any(item_limits.values())
+    budget = None
+    if budgeted_run and args.budget_scope == "run":
+        budget = BudgetController(llm, run_limits, item_limits, args.budget_thresholds, "run")
+
+    failed = False
+    try:
+        for task in args.task:
+            for method in args.method:
+                if budgeted_run and args.budget_scope == "combination":
+                    budget = BudgetController(llm, run_limits, item_limits, args.budget_thresholds, "combination")
+                if run_combination(task, method, args, llm, toolbox, budget) is None:
+                    failed = True
+    finally:
+        tool_stats = toolbox.format_stats()
+        if tool_stats:
+            print(tool_stats)
+        if replay is not None:
+            print(f"KASI 재생: {replay.faults.counts}")
+        toolbox.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,412 @@
+"""
+T3 제약(constraints) 기반 결정적 일정 계산기.
+
+데이터셋의 `constraints` 스키마(start_date, interval_days, exclude_weekdays, weekdays_only, exclude_holidays,
+date_range, week_numbers, specific_weekdays, date_pattern, preferred_dates ...)를 받아 날짜 목록을 계산합니다.
+--method extract-solve 에서 LLM 이 한 번의 호출로 뽑은 제약을 여기서 풉니다.
+
+공휴일은 HolidayCalendar 가 KASI 특일 정보(도구 계층의 월 단위 조회, 메모 공유)에서 가져오고,
+조회할 수 없으면 이벤트 KB 의 공휴일 항목으로 대신합니다.
+"""
+import calendar
+import json
+import re
+import threading
+from datetime import date, timedelta
+
+from cot_or_react import event_kb
+
+
+WEEKDAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# 제약 키 중 값이 하나라도 이 목록에 없으면 계산기가 다룰 수 없는 제약으로 기록합니다.
+KNOWN_KEYS = (
+    "start_date", "date_range", "min_count", "interval_days", "interval", "interval_business_days",
+    "interval_weeks", "interval_months", "exclude_weekdays", "specific_weekdays_exclude", "weekdays_only",
+    "exclude_holidays", "exclude_dates", "specific_weekdays", "week_numbers", "week_start_day", "week_position",
+    "date_pattern", "preferred_dates", "fallback_strategy", "adjust_if_holiday", "adjust_for_holidays",
+)
+
+DEFAULT_COUNT = 5
+MAX_SCAN_DAYS = 3 * 366
+# N 일 간격에서 다음 몇 단계를 내다봐도 허용일이 없으면 격자가 막힌 것으로 보고 다음 허용일로 옮깁니다.
+STUCK_STEPS = 3
+
+
+class HolidayCalendar:
+    """
+    연도별 공휴일(쉬는 날) 집합. fetch_month(year, month, category) 는 tools.fetch_calendar_month 와 같은 모양입니다.
+    한 달이라도 조회에 실패한 연도는 이벤트 KB 의 공휴일(고정일, 설날·추석 연휴, 부처님오신날, 대체공휴일, 선거일, 임시공휴일)로 대신합니다.
+    KB 는 event_kb.HOLIDAY_YEARS 안의 연도만 빠짐없이 알고 있으므로, 그 밖의 연도는 complete() 가 False 입니다.
+    """
+
+    def __init__(self, fetch_month=None):
+        self._fetch_month = fetch_month
+        self._years = {}
+        self._lock = threading.Lock()
+        self.sources = {}
+
+    def _from_kasi(self, year: int) -> set:
+        days = set()
+        for month in range(1, 13):
+            for entry in json.loads(self._fetch_month(str(year), f"{month:02d}", "rest")):
+                if entry.get("isHoliday") == "Y":
+                    days.add(date.fromisoformat(f"{entry['locdate'][:4]}-{entry['locdate'][4:6]}-{entry['locdate'][6:]}"))
+        return days
+
+    @staticmethod
+    def _from_kb(year: int) -> set:
+        days = set()
+        kb = event_kb.get_kb()
+        for event in kb.events:
+            if event.get("category") != "holiday":
+                continue
+            for occurrence in kb.occurrences(event, year):
+                start = date.fromisoformat(occurrence.get("start", occurrence["date"]))
+                end = date.fromisoformat(occurrence.get("end", occurrence["date"]))
+                days.update(start + timedelta(days=i) for i in range((end - start).days + 1))
+        return days
+
+    def year(self, year: int) -> set:
+        with self._lock:
+            if year in self._years:
+                return self._years[year]
+        source = "kb"
+        days = None
+        if self._fetch_month is not None:
+            try:
+                days, source = self._from_kasi(year), "kasi"
+            except Exception:
+                days = None
+        if days is None:
+            days = self._from_kb(year)
+        with self._lock:
+            self._years.setdefault(year, days)
+            self.sources[year] = source
+        return days
+
+    def complete(self, year: int) -> bool:
+        """
+        year 의 공휴일을 빠짐없이 아는지. KASI 에서 받았거나 KB 표가 채워진 연도면 True 입니다.
+        """
+        self.year(year)
+        first, last = event_kb.HOLIDAY_YEARS
+        return self.sources.get(year) == "kasi" or first <= year <= last
+
+    def __contains__(self, day: date) -> bool:
+        return day in self.year(day.year)
+
+
+def parse_date(value):
+    """
+    'YYYY-MM-DD' 를 date 로 바꿉니다. '2024-02-30' 처럼 없는 날은 그 달 말일로 맞춥니다.
+    """
+    if isinstance(value, date):
+        return value
+    match = re.fullmatch(r"(\d{4})-(\d{1,2})-(\d{1,2})", str(value).strip())
+    if not match:
+        return None
+    year, month, day = (int(part) for part in match.groups())
+    if not 1 <= month <= 12:
+        return None
+    return date(year, month, min(day, calendar.monthrange(year, month)[1]))
+
+
+def weekday_set(names) -> set:
+    if isinstance(names, str):
+        names = [names]
+    result = set()
+    for name in names or ():
+        name = str(name).strip().capitalize()
+        for index, full in enumerate(WEEKDAY_NAMES):
+            if full.startswith(name[:3]) and len(name) >= 3:
+                result.add(index)
+    return result
+
+
+def _pattern_days(pattern: str):
+    """
+    date_pattern 을 '일(day)' 조건 함수로 바꿉니다. 모르는 패턴이면 None 입니다.
+    """
+    pattern = str(pattern or "").strip().lower()
+    if pattern == "odd_day":
+        return lambda day: day % 2 == 1
+    if pattern == "even_day":
+        return lambda day: day % 2 == 0
+    if pattern == "prime_number":
+        return lambda day: day > 1 and all(day % k for k in range(2, int(day ** 0.5) + 1))
+    match = re.fullmatch(r"multiple_of_(\d+)", pattern)
+    if match:
+        return lambda day, n=int(match.group(1)): day % n == 0
+    match = re.fullmatch(r"ends_with_(\d)(?:_or_(\d))?", pattern)
+    if match:
+        digits = {int(d) for d in match.groups() if d is not None}
+        return lambda day: day % 10 in digits
+    days = [int(d) for d in re.findall(r"(\d+)(?:st|nd|rd|th)", pattern)]
+    if days:
+        return lambda day: day in days
+    return None
+
+
+def week_of_month(day: date, week_start: int = 0) -> int:
+    """
+    week_start 요일(기본 월요일) 시작 기준 그 달의 몇째 주인지. 1일이 속한 주가 1주차입니다.
+    """
+    first = day.replace(day=1)
+    return (day.day + (first.weekday() - week_start) % 7 - 1) // 7 + 1
+
+
+class Schedule:
+    """
+    constraints 하나를 해석한 결과. allowed(day) 는 날짜 필터, dates() 는 최종 날짜 목록입니다.
+    """
+
+    def __init__(self, constraints: dict, anchor_date: str, holidays: HolidayCalendar):
+        self.c = {key: value for key, value in (constraints or {}).items() if value not in (None, "", [])}
+        self.anchor = parse_date(anchor_date)
+        self.holidays = holidays
+        self.unsupported = sorted(key for key in self.c if key not in KNOWN_KEYS)
+
+        date_range = self.c.get("date_range")
+        if isinstance(date_range, (list, tuple)) and len(date_range) == 2:
+            self.range = (parse_date(date_range[0]), parse_date(date_range[1]))
+        else:
+            self.range = (None, None)
+        self.excluded = weekday_set(self.c.get("exclude_weekdays")) | weekday_set(self.c.get("specific_weekdays_exclude"))
+        if self.c.get("weekdays_only"):
+            self.excluded |= {5, 6}
+        self.only = weekday_set(self.c.get("specific_weekdays"))
+        self.exclude_dates = {parse_date(value) for value in self.c.get("exclude_dates") or ()}
+        self.pattern = _pattern_days(self.c.get("date_pattern")) if self.c.get("date_pattern") else None
+        if self.c.get("date_pattern") and self.pattern is None:
+            self.unsupported.append("date_pattern")
+        self.week_start = min(weekday_set(self.c.get("week_start_day")) or {0})
+        self.week_numbers = [int(n) for n in self.c.get("week_numbers") or () if str(n).lstrip("-").isdigit()]
+        try:
+            self.count = max(1, int(self.c.get("min_count") or 0)) if self.c.get("min_count") else None
+        except (TypeError, ValueError):
+            self.count = None
+        if self.count is None and self.range[1] is None and not self.c.get("preferred_dates"):
+            # 개수도 끝 날짜도 없으면 목록이 끝없이 길어지므로 DEFAULT_COUNT 개로 자르고 다루지 못한 제약으로 남깁니다.
+            self.count = DEFAULT_COUNT
+            self.unsupported.append("min_count")
+
+    # --- 필터 -------------------------------------------------------------------------
+
+    def is_holiday(self, day: date) -> bool:
+        return day in self.holidays
+
+    def _in_week(self, day: date) -> bool:
+        if self.week_numbers:
+            month_end = day.replace(day=calendar.monthrange(day.year, day.month)[1])
+            if self.only:
+                # '첫째 월요일'처럼 요일이 정해져 있으면 그 달에서 그 요일이 앞(뒤)에서 몇 번째로 나온 날인지로 셉니다.
+                week, from_end = (day.day - 1) // 7 + 1, (month_end.day - day.day) // 7 + 1
+            else:
+                week = week_of_month(day, self.week_start)
+                from_end = week_of_month(month_end, self.week_start) + 1 - week
+            if not any(week == n if n > 0 else from_end == -n for n in self.week_numbers):
+                return False
+        if self.c.get("week_position") == "last":
+            # 그 달 마지막 날이 속한 주(다음 달 날짜 포함).
+            month_end = self._month_end_for_last_week(day)
+            week_start = month_end - timedelta(days=(month_end.weekday() - self.week_start) % 7)
+            if not week_start <= day <= week_start + timedelta(days=6):
+                return False
+        return True
+
+    def _month_end_for_last_week(self, day: date) -> date:
+        month_day = self.range[0] or self.anchor
+        return month_day.replace(day=calendar.monthrange(month_day.year, month_day.month)[1])
+
+    def allowed(self, day: date, check_holidays: bool = True) -> bool:
+        low, high = self.range
+        if (low and day < low) or (high and day > high):
+            return False
+        if day.weekday() in self.excluded or day in self.exclude_dates:
+            return False
+        if self.only and day.weekday() not in self.only:
+            return False
+        if self.pattern and not self.pattern(day.day):
+            return False
+        if not self._in_week(day):
+            return False
+        if check_holidays and self.c.get("exclude_holidays") and self.is_holiday(day):
+            return False
+        return True
+
+    # --- 시작점과 생성 -------------------------------------------------------------------
+
+    def start(self) -> date:
+        return parse_date(self.c.get("start_date")) or self.range[0] or self.anchor
+
+    def _scan(self, start: date, step):
+        """
+        start 부터 step 씩 나아가며 허용되는 날짜를 count 개(범위가 있으면 범위 끝까지) 모읍니다.
+        """
+        high = self.range[1]
+        limit = start + timedelta(days=MAX_SCAN_DAYS)
+        found = []
+        day = start
+        while day <= limit and (high is None or day <= high):
+            if self.allowed(day):
+                found.append(day)
+                if self.count and len(found) >= self.count and high is None:
+                    break
+            day = step(day)
+        return found
+
+    def _first_allowed(self, day: date) -> date:
+        for _ in range(MAX_SCAN_DAYS):
+            if self.allowed(day):
+                return day
+            day += timedelta(days=1)
+        return day
+
+    def _stepped(self, start: date, interval: int) -> list:
+        """
+        N 일 간격. 시작일에서 N 일씩 나아가며 단계마다 제외 규칙을 적용해 허용되지 않는 날은 건너뜁니다.
+        건너뛴 날이 간격을 아무리 더해도 벗어날 수 없는 제외 요일이면(토요일 + 7일 간격 등) 그 단계에서
+        다음 허용일로 옮기고 거기서부터 다시 셉니다.
+        """
+        high = self.range[1]
+        limit = start + timedelta(days=MAX_SCAN_DAYS)
+        found = []
+        day = start
+        while day <= limit and (high is None or day <= high):
+            if not self.allowed(day):
+                ahead = [day + timedelta(days=interval * n) for n in range(1, STUCK_STEPS + 1)]
+                if not any(later <= limit and self.allowed(later) for later in ahead):
+                    day = self._first_allowed(day)
+                    continue
+                day += timedelta(days=interval)
+                continue
+            found.append(day)
+            if self.count and len(found) >= self.count and high is None:
+                break
+            day += timedelta(days=interval)
+        return found
+
+    def _interval_days(self):
+        for key in ("interval_days", "interval"):
+            value = self.c.get(key)
+            if isinstance(value, (int, float)) and value > 0:
+                return int(value)
+        return None
+
+    def _business_day(self, day: date) -> bool:
+        return day.weekday() < 5 and day.weekday() not in self.excluded and not self.is_holiday(day)
+
+    def _business_steps(self, start: date, steps: int) -> list:
+        """
+        영업일(주말·공휴일 제외) 기준 간격. 시작일이 영업일이면 그 날부터, 아니면 시작일 이후 steps 번째 영업일부터 고릅니다.
+        """
+        found = [start] if self._business_day(start) else []
+        day = start
+        limit = start + timedelta(days=MAX_SCAN_DAYS)
+        while len(found) < (self.count or DEFAULT_COUNT) and day <= limit:
+            moved = 0
+            while moved < steps and day <= limit:
+                day += timedelta(days=1)
+                moved += self._business_day(day)
+            if day > limit or (self.range[1] and day > self.range[1]):
+                break
+            found.append(day)
+        return found
+
+    def _weekly(self, start: date, weeks: int) -> list:
+        """
+        k 주마다: specific_weekdays 가 있으면 해당 주의 그 요일들, 없으면 시작일에서 7k 일씩.
+        """
+        if not self.only:
+            return self._scan(self._first_allowed(start), lambda day: day + timedelta(days=7 * weeks))
+        week_start = start - timedelta(days=start.weekday())
+        found = []
+        for _ in range(MAX_SCAN_DAYS // 7):
+            for offset in sorted(self.only):
+                day = week_start + timedelta(days=offset)
+                if day >= start and self.allowed(day):
+                    found.append(day)
+            if (self.count and len(found) >= self.count) or (self.range[1] and week_start > self.range[1]):
+                break
+            week_start += timedelta(days=7 * weeks)
+        return found
+
+    def _monthly(self, start: date, months: int) -> list:
+        found = []
+        year, month = start.year, start.month
+        for _ in range(120):
+            last = calendar.monthrange(year, month)[1]
+            for day_number in range(1, last + 1):
+                day = date(year, month, day_number)
+                if day >= start and self.allowed(day):
+                    found.append(day)
+            if self.count and len(found) >= self.count:
+                break
+            month += months
+            year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+        return found
+
+    def _preferred(self) -> list:
+        """
+        선호 날짜가 공휴일·제외 요일이면 fallback_strategy(다음/이전 평일)로 옮깁니다.
+        """
+        backward = self.c.get("fallback_strategy") == "previous_weekday"
+        found = []
+        for value in self.c.get("preferred_dates") or ():
+            day = parse_date(value)
+            if day is None:
+                continue
+            while not self._usable_weekday(day):
+                day += timedelta(days=-1 if backward else 1)
+            found.append(day)
+        return found
+
+    def _usable_weekday(self, day: date) -> bool:
+        if day.weekday() in self.excluded or (self.c.get("fallback_strategy") and day.weekday() >= 5):
+            return False
+        return not (self.c.get("exclude_holidays") and self.is_holiday(day))
+
+    def _adjust(self, days: list) -> list:
+        """
+        adjust_if_holiday / adjust_for_holidays: 공휴일에 걸린 날짜를 다음(또는 이전) 평일로 옮깁니다.
+        """
+        rule = self.c.get("adjust_if_holiday")
+        if not rule and not self.c.get("adjust_for_holidays"):
+            return days
+        step = timedelta(days=-1 if isinstance(rule, dict) and rule.get("shift_to") == "previous_weekday" else 1)
+        adjusted = []
+        for day in days:
+            if self.is_holiday(day):
+                day += step
+                while self.is_holiday(day) or day.weekday() >= 5:
+                    day += step
+            adjusted.append(day)
+        return adjusted
+
+    def dates(self) -> list:
+        start = self.start()
+        interval = self._interval_days()
+        if self.c.get("preferred_dates"):
+            days = self._preferred()
+        elif self.c.get("interval_business_days"):
+            days = self._business_steps(start, max(1, int(self.c["interval_business_days"])))
+        elif interval:
+            days = self._stepped(start, interval)
+        elif self.c.get("interval_weeks"):
+            days = self._weekly(start, int(self.c["interval_weeks"]))
+        elif self.c.get("interval_months"):
+            days = self._monthly(start, int(self.c["interval_months"]))
+        else:
+            days = self._scan(start, lambda day: day + timedelta(days=1))
+        days = self._adjust(days)
+        if self.count:
+            days = days[:self.count]
+        return [day.isoformat() for day in days]
+
+
+def schedule(constraints: dict, anchor_date: str, holidays: HolidayCalendar = None) -> list:
+    """
+    제약과 앵커 날짜로 날짜 목록(YYYY-MM-DD)을 계산합니다.
+    """
+    return Schedule(constraints, anchor_date, holidays or HolidayCalendar()).dates()
@@ -0,0 +1,432 @@
+"""
+상주 HTTP 서비스 모드.
+
+다른 서비스가 요청마다 `python t1.py` 를 띄우면 시작, 프롬프트 로딩, 클라이언트 생성을 매번 치릅니다.
+서버는 LLM 클라이언트(HTTP 커넥션 풀), 도구 메모, single-flight, 이벤트 KB, 공휴일 달력, 프롬프트를 한 번만 올려 두고
+요청을 받습니다.
+
+    POST /normalize  (T1)  {"input_text": "다음 주 금요일", "anchor_date": "2025-01-01"}
+    POST /extract    (T2)  {"input_text": "다음 주 금요일 날짜 좀 알려줘", "anchor_date": "2025-01-01"}
+    POST /schedule   (T3)  {"input_text": "...", "anchor_date": "..."} 또는 {"constraints": {...}, "anchor_date": "..."}
+    GET  /metrics          경로별 latency 히스토그램, 마이크로 배치 크기, LLM·도구 통계 (Prometheus 텍스트, ?format=json)
+    GET  /healthz
+
+T1/T2 는 규칙 기반 해석기로 풀리면 LLM 없이 바로 답하고, 아니면 CoT 마이크로 배치로 보냅니다. 동시에 들어온 요청은
+--batch-wait-ms 동안(또는 --batch-size 개가 찰 때까지) 모았다가 run_cot_batch 한 번으로 처리합니다.
+T3 는 제약이 주어지면 scheduler 로 바로 계산하고, 요청문이면 extract-solve(추출 호출 한 번 + scheduler)로 풉니다.
+"method": "react" 를 주면 해당 Task 의 ReAct 로 처리합니다.
+
+    python -m cot_or_react.server --port 8080 --batch-size 8 --batch-wait-ms 20
+"""
+import argparse
+import json
+import re
+import signal
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from cot_or_react import event_kb
+from cot_or_react.agent import RunContext, is_error_prediction, run_item
+from cot_or_react.batch import run_cot_batch
+from cot_or_react.endpoints import parse_endpoint
+from cot_or_react.extract import run_extract_solve
+from cot_or_react.llm import DEFAULT_MODEL, LLM
+from cot_or_react.scheduler import Schedule
+from cot_or_react.singleflight import SingleFlight
+from cot_or_react.solver import solve
+from cot_or_react.tasks import PROMPT_DIR, TASKS, load_prompts
+from cot_or_react.tool_memo import DEFAULT_CACHE_SIZE, ToolMemo
+from cot_or_react.tools import Toolbox
+
+
+DEFAULT_BATCH_SIZE = 8
+DEFAULT_BATCH_WAIT_MS = 20
+MAX_BODY_BYTES = 1 << 20
+
+# latency 히스토그램 구간(초). Prometheus 기본 구간에 LLM 호출 규모의 긴 구간을 더했습니다.
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+ROUTES = {"/normalize": "t1", "/extract": "t2", "/schedule": "t3"}
+ANCHOR_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+class BadRequest(ValueError):
+    pass
+
+
+class MicroBatcher:
+    """
+    여러 스레드가 submit 한 항목을 묶어 run_batch(items) 한 번으로 처리합니다. 첫 항목이 들어온 뒤 max_wait 초가 지나거나
+    max_size 개가 차면 묶음을 보냅니다. 묶음 처리는 별도 스레드 풀에서 하므로 다음 묶음을 모으는 동안 앞 묶음이 진행됩니다.
+    """
+
+    def __init__(self, run_batch, max_size: int, max_wait: float, workers: int, on_batch=None):
+        self.run_batch = run_batch
+        self.max_size = max(1, max_size)
+        self.max_wait = max_wait
+        self.on_batch = on_batch
+        self._pending = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def submit(self, item: dict) -> Future:
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("batcher is closed")
+            self._pending.append((item, future, time.time()))
+            self._cond.notify()
+        return future
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                deadline = self._pending[0][2] + self.max_wait
+                while len(self._pending) < self.max_size and not self._closed:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._pending = self._pending[:self.max_size], self._pending[self.max_size:]
+            self._executor.submit(self._run, batch)
+
+    def _run(self, batch: list):
+        if self.on_batch:
+            self.on_batch(len(batch))
+        try:
+            results = self.run_batch([item for item, _, _ in batch])
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+
+
+class Metrics:
+    """
+    (경로, 처리 방식) 별 latency 히스토그램과 요청 수, 마이크로 배치 크기 분포.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency = {}      # (route, path) -> {"buckets": [...], "sum": float, "count": int}
+        self._status = {}       # (route, status) -> count
+        self._batch_sizes = {}  # size -> count
+        self.started = time.time()
+
+    def observe(self, route: str, path: str, status: int, seconds: float):
+        with self._lock:
+            entry = self._latency.setdefault((route, path), {"buckets": [0] * len(LATENCY_BUCKETS), "sum": 0.0, "count": 0})
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    entry["buckets"][i] += 1
+            entry["sum"] += seconds
+            entry["count"] += 1
+            self._status[(route, status)] = self._status.get((route, status), 0) + 1
+
+    def batch(self, size: int):
+        with self._lock:
+            self._batch_sizes[size] = self._batch_sizes.get(size, 0) + 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "uptime": round(time.time() - self.started, 3),
+                "latency": [
+                    {"route": route, "path": path, "count": e["count"], "sum": round(e["sum"], 6),
+                     "buckets": dict(zip(LATENCY_BUCKETS, e["buckets"]))}
+                    for (route, path), e in sorted(self._latency.items())
+                ],
+                "requests": [{"route": route, "status": status, "count": count} for (route, status), count in sorted(self._status.items())],
+                "batch_sizes": dict(sorted(self._batch_sizes.items())),
+            }
+
+
+def prometheus_text(snapshot: dict, llm_stats: dict, tool_stats: dict) -> str:
+    lines = [
+        "# TYPE cot_or_react_request_seconds histogram",
+    ]
+    for entry in snapshot["latency"]:
+        labels = f'route="{entry["route"]}",path="{entry["path"]}"'
+        for bound, count in entry["buckets"].items():
+            lines.append(f'cot_or_react_request_seconds_bucket{{{labels},le="{bound}"}} {count}')
+        lines.append(f'cot_or_react_request_seconds_bucket{{{labels},le="+Inf"}} {entry["count"]}')
+        lines.append(f"cot_or_react_request_seconds_sum{{{labels}}} {entry['sum']}")
+        lines.append(f"cot_or_react_request_seconds_count{{{labels}}} {entry['count']}")
+    lines.append("# TYPE cot_or_react_requests_total counter")
+    for entry in snapshot["requests"]:
+        lines.append(f'cot_or_react_requests_total{{route="{entry["route"]}",status="{entry["status"]}"}} {entry["count"]}')
+    lines.append("# TYPE cot_or_react_batch_size histogram")
+    total = 0
+    for size, count in snapshot["batch_sizes"].items():
+        total += count
+        lines.append(f'cot_or_react_batch_size_bucket{{le="{size}"}} {total}')
+    lines.append(f'cot_or_react_batch_size_bucket{{le="+Inf"}} {total}')
+    lines.append(f"cot_or_react_batch_size_sum {sum(size * count for size, count in snapshot['batch_sizes'].items())}")
+    lines.append(f"cot_or_react_batch_size_count {total}")
+    for key, value in llm_stats.items():
+        lines.append(f"cot_or_react_llm_{key} {value}")
+    for group, stats in tool_stats.items():
+        for name, value in _flatten(stats):
+            lines.append(f'cot_or_react_tool_stat{{group="{group}",name="{name}"}} {value}')
+    lines.append(f"cot_or_react_uptime_seconds {snapshot['uptime']}")
+    return "\n".join(lines) + "\n"
+
+
+def _flatten(stats, prefix: str = ""):
+    """
+    도구 통계처럼 중첩된 딕셔너리에서 숫자 값만 ('a.b.c', 값) 으로 꺼냅니다.
+    """
+    if isinstance(stats, dict):
+        for key, value in stats.items():
+            yield from _flatten(value, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(stats, (int, float)) and not isinstance(stats, bool):
+        yield prefix, stats
+
+
+def _parse_item(payload, require_text: bool = True) -> dict:
+    if not isinstance(payload, dict):
+        raise BadRequest("request body must be a JSON object")
+    anchor_date = payload.get("anchor_date")
+    # date.fromisoformat 은 "20250101", "2025-W01-1" 도 받지만 하위 모듈은 YYYY-MM-DD 문자열만 다룹니다.
+    if not isinstance(anchor_date, str) or not ANCHOR_DATE.fullmatch(anchor_date):
+        raise BadRequest("anchor_date must be YYYY-MM-DD")
+    try:
+        date.fromisoformat(anchor_date)
+    except ValueError:
+        raise BadRequest("anchor_date must be YYYY-MM-DD") from None
+    input_text = payload.get("input_text")
+    if require_text and (not isinstance(input_text, str) or not input_text.strip()):
+        raise BadRequest("input_text must be a non-empty string")
+    return {"id": str(payload.get("id") or uuid.uuid4().hex), "input_text": input_text, "anchor_date": anchor_date}
+
+
+class Service:
+    """
+    요청 처리 로직. HTTP 계층과 분리해 두어 테스트나 다른 서버에서 그대로 쓸 수 있습니다.
+    """
+
+    def __init__(self, llm: LLM, toolbox: Toolbox, prompt_dir: str = PROMPT_DIR, batch_size: int = DEFAULT_BATCH_SIZE,
+                 batch_wait: float = DEFAULT_BATCH_WAIT_MS / 1000, batch_workers: int = 8, react: bool = True):
+        self.llm = llm
+        self.toolbox = toolbox
+        self.metrics = Metrics()
+        self.contexts = {}
+        methods = {"t1": ("cot", "react"), "t2": ("cot", "react"), "t3": ("extract-solve", "react")}
+        for task, task_methods in methods.items():
+            for method in task_methods:
+                if method == "react" and not react:
+                    continue
+                self.contexts[(task, method)] = RunContext(llm=llm, toolbox=toolbox, prompts=load_prompts(task, method, prompt_dir))
+        self.batchers = {
+            task: MicroBatcher(lambda items, ctx=self.contexts[(task, "cot")]: run_cot_batch(items, ctx),
+                               batch_size, batch_wait, batch_workers, on_batch=self.metrics.batch)
+            for task in ("t1", "t2")
+        }
+
+    def warm_up(self, years=()):
+        """
+        이벤트 KB 색인, LLM 클라이언트(커넥션 풀), 공휴일 달력을 미리 올립니다.
+        """
+        event_kb.get_kb()
+        if self.llm.pool is None:
+            self.llm.client
+        for year in years:
+            self.toolbox.holidays.year(year)
+
+    def _react(self, task: str, item: dict) -> dict:
+        ctx = self.contexts.get((task, "react"))
+        if ctx is None:
+            raise BadRequest("react is disabled on this server")
+        return run_item(item, TASKS[task], "react", ctx)
+
+    def normalize(self, task: str, payload) -> tuple:
+        """
+        T1/T2: (결과 항목, 처리 방식). 처리 방식은 solver / batch / react 중 하나입니다.
+        """
+        item = _parse_item(payload)
+        method = payload.get("method", "auto")
+        if method not in ("auto", "cot", "react", "solver"):
+            raise BadRequest("method must be one of auto, cot, react, solver")
+        if method in ("auto", "solver"):
+            start_time = time.time()
+            prediction = solve(item["input_text"], item["anchor_date"])
+            if prediction is not None or method == "solver":
+                item.update(thought="Rule-based solver", prediction=prediction, latency=time.time() - start_time, tokens=0)
+                return item, "solver"
+        if method == "react":
+            return self._react(task, item), "react"
+        return self.batchers[task].submit(item).result(), "batch"
+
+    def schedule(self, payload) -> tuple:
+        """
+        T3: 제약이 있으면 scheduler 로 바로(deterministic), 없으면 extract-solve 또는 react 로 풉니다.
+        """
+        if isinstance(payload, dict) and isinstance(payload.get("constraints"), dict):
+            item = _parse_item(payload, require_text=False)
+            start_time = time.time()
+            schedule = Schedule(payload["constraints"], item["anchor_date"], self.toolbox.holidays)
+            item.update(constraints=payload["constraints"], prediction=schedule.dates(), latency=time.time() - start_time, tokens=0)
+            if schedule.unsupported:
+                item["unsupported_constraints"] = schedule.unsupported
+            return item, "deterministic"
+        item = _parse_item(payload)
+        if payload.get("method") == "react":
+            return self._react("t3", item), "react"
+        return run_extract_solve(item, self.contexts[("t3", "extract-solve")]), "extract-solve"
+
+    def handle(self, route: str, payload) -> tuple:
+        """
+        (HTTP 상태, 응답 본문). 요청 처리 중 latency 를 경로·처리 방식별로 기록합니다.
+        """
+        task = ROUTES[route]
+        start_time = time.time()
+        path = "invalid"
+        try:
+            item, path = self.schedule(payload) if task == "t3" else self.normalize(task, payload)
+            status = 502 if is_error_prediction(item.get("prediction")) else 200
+            body = {key: item[key] for key in ("id", "prediction", "thought", "latency", "tokens", "usage", "unsupported_constraints",
+                                               "extracted_constraints") if key in item}
+            body["path"] = path
+        except BadRequest as e:
+            status, body = 400, {"error": str(e)}
+        except Exception as e:
+            status, body, path = 500, {"error": str(e)}, "error"
+        self.metrics.observe(route.strip("/"), path, status, time.time() - start_time)
+        return status, body
+
+    def metrics_text(self, as_json: bool = False) -> tuple:
+        snapshot = self.metrics.snapshot()
+        llm_stats = self.llm.stats()
+        tool_stats = self.toolbox.stats()
+        if as_json:
+            return "application/json", json.dumps(dict(snapshot, llm=llm_stats, tools=tool_stats, endpoints=self.llm.endpoint_stats()),
+                                                  ensure_ascii=False, default=str)
+        return "text/plain; version=0.0.4", prometheus_text(snapshot, llm_stats, tool_stats)
+
+    def close(self):
+        for batcher in self.batchers.values():
+            batcher.close()
+        self.toolbox.close()
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # 기본 대기열(5)로는 동시 연결이 몰릴 때 연결이 끊깁니다.
+    request_queue_size = 128
+
+
+def make_handler(service: Service):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status: int, content_type: str, body: str):
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _send_json(self, status: int, body: dict):
+            self._send(status, "application/json; charset=utf-8", json.dumps(body, ensure_ascii=False))
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/healthz":
+                self._send_json(200, {"status": "ok"})
+            elif url.path == "/metrics":
+                as_json = parse_qs(url.query).get("format") == ["json"]
+                self._send(200, *service.metrics_text(as_json))
+            else:
+                self._send_json(404, {"error": f"unknown path {url.path}"})
+
+        def do_POST(self):
+            route = urlparse(self.path).path
+            if route not in ROUTES:
+                self._send_json(404, {"error": f"unknown path {route}"})
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            if length > MAX_BODY_BYTES:
+                self._send_json(413, {"error": "request body too large"})
+                return
+            try:
+                payload = json.loads(self.rfile.read(length) or b"null")
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                self._send_json(400, {"error": "request body must be JSON"})
+                return
+            self._send_json(*service.handle(route, payload))
+
+        def log_message(self, format, *args):
+            # 요청마다 stderr 에 찍지 않습니다. 요청 통계는 /metrics 로 봅니다.
+            pass
+
+    return Handler
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve T1/T2/T3 over HTTP with warm clients and CoT micro-batching.")
+    parser.add_argument('--host', type=str, default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="CoT micro-batch: max items per LLM request.")
+    parser.add_argument('--batch-wait-ms', type=float, default=DEFAULT_BATCH_WAIT_MS, help="CoT micro-batch: how long the first item waits for company.")
+    parser.add_argument('--batch-workers', type=int, default=8, help="Micro-batches processed concurrently per task.")
+    parser.add_argument('--no-react', action='store_true', help="Do not load ReAct prompts; 'method': 'react' requests get 400.")
+    parser.add_argument('--tool-cache-size', type=int, default=DEFAULT_CACHE_SIZE)
+    parser.add_argument('--tool-cache-dir', type=str, default=None)
+    parser.add_argument('--warm-years', type=int, nargs='*', default=None, help="Load these years' holidays at startup (default: this year and the next).")
+    parser.add_argument('--model', type=str, default=DEFAULT_MODEL)
+    parser.add_argument('--base-url', type=str, default=None, help="OpenAI-compatible base URL (default: $UPSTAGE_BASE_URL or Upstage).")
+    parser.add_argument('--endpoint', type=parse_endpoint, action='append', default=None,
+                        metavar='URL[,api_key_env=NAME][,max_concurrency=N][,weight=W]', help="Spread LLM calls over several endpoints.")
+    parser.add_argument('--prompt-dir', type=str, default=PROMPT_DIR)
+    args = parser.parse_args(argv)
+
+    llm = LLM(model=args.model, base_url=args.base_url, endpoints=args.endpoint)
+    toolbox = Toolbox(llm, memo=ToolMemo(args.tool_cache_size, args.tool_cache_dir), flight=SingleFlight())
+    try:
+        service = Service(llm, toolbox, args.prompt_dir, args.batch_size, args.batch_wait_ms / 1000, args.batch_workers, not args.no_react)
+    except FileNotFoundError as e:
+        print(f"오류: '{e.filename}' 파일을 찾을 수 없습니다.")
+        toolbox.close()
+        return 1
+    this_year = date.today().year
+    service.warm_up(args.warm_years if args.warm_years is not None else (this_year, this_year + 1))
+
+    server = Server((args.host, args.port), make_handler(service))
+    # SIGTERM 에도 진행 중인 마이크로 배치를 마치고 정리하도록 serve_forever 를 멈춥니다.
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+    print(f"서버 시작: http://{args.host}:{server.server_address[1]} (마이크로 배치 {args.batch_size}개 / {args.batch_wait_ms:g}ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
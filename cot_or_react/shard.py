@@ -0,0 +1,230 @@
+"""
+데이터셋 샤딩, 로컬 다중 프로세스 실행, 샤드 결과 병합.
+
+`--shard i/N` 은 데이터셋의 i, i+N, i+2N, ... 번째 항목만 처리하고 결과 파일 이름에
+`.shard-i-of-N` 을 붙입니다. 여러 코어(`--processes N`)나 여러 머신이 샤드를 나눠 실행한 뒤,
+merge 가 샤드 결과를 id 순서로 합치고 요약 통계를 더해 샤딩하지 않은 실행과 같은 파일을 만듭니다.
+
+    python -m cot_or_react --task t3 --method react --shard 0/4    # 머신별로 0~3
+    python -m cot_or_react.shard merge --output-dir results/solar
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+from cot_or_react.budget import merge_budget_summaries
+from cot_or_react.endpoints import endpoint_summary
+from cot_or_react.llm import STREAM_STATS, stream_summary
+from cot_or_react.trace_store import COMPRESSIONS, find_trace_file, trace_path, write_slim_results
+
+
+SHARD_FILE_RE = re.compile(r"^(?P<stem>.+)\.shard-(?P<index>\d+)-of-(?P<count>\d+)\.json$")
+
+
+def parse_shard(spec: str) -> tuple:
+    """
+    'i/N' 형식의 샤드 지정을 (i, N) 으로 바꿉니다. argparse 의 type 으로 사용합니다.
+    """
+    match = re.fullmatch(r"(\d+)/(\d+)", str(spec).strip())
+    if not match:
+        raise argparse.ArgumentTypeError(f"shard must look like 'i/N', got '{spec}'")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"shard index must satisfy 0 <= i < N, got '{spec}'")
+    return index, count
+
+
+def select_shard(dataset: list, shard) -> list:
+    if not shard:
+        return dataset
+    index, count = shard
+    return dataset[index::count]
+
+
+def shard_filename(filename: str, shard) -> str:
+    if not shard:
+        return filename
+    index, count = shard
+    stem = filename[:-len(".json")]
+    return f"{stem}.shard-{index}-of-{count}.json"
+
+
+def _strip_option(argv: list, option: str) -> list:
+    stripped = []
+    skip_next = False
+    for arg in argv:
+        if skip_next:
+            skip_next = False
+            continue
+        if arg == option:
+            skip_next = True
+            continue
+        if arg.startswith(option + "="):
+            continue
+        stripped.append(arg)
+    return stripped
+
+
+def launch(argv: list, processes: int) -> int:
+    """
+    같은 인자로 `python -m cot_or_react ... --shard i/N` 자식 프로세스를 N 개 띄우고 모두 끝날 때까지 기다립니다.
+    실패한 자식이 있으면 1 을 반환합니다.
+    """
+    child_argv = _strip_option(_strip_option(argv, "--processes"), "--shard")
+    children = [
+        subprocess.Popen([sys.executable, "-m", "cot_or_react", *child_argv, "--shard", f"{i}/{processes}"])
+        for i in range(processes)
+    ]
+    return_codes = [child.wait() for child in children]
+    for i, code in enumerate(return_codes):
+        if code != 0:
+            print(f"오류: 샤드 {i}/{processes} 프로세스가 코드 {code} 로 종료되었습니다.")
+    return 0 if all(code == 0 for code in return_codes) else 1
+
+
+def _id_key(item_id) -> tuple:
+    # 'T1_010' 과 'T1_9' 처럼 자릿수가 달라도 숫자 순서로 정렬되도록 숫자 부분을 정수로 비교합니다.
+    return tuple(int(part) if part.isdigit() else part for part in re.split(r"(\d+)", str(item_id)))
+
+
+def merge_stem(output_dir: str, stem: str):
+    """
+    `<stem>.shard-*-of-N.json` 을 모두 읽어 `<stem>.json` 과 `<stem>.summary.json` 으로 합칩니다.
+    샤드가 빠져 있으면 ValueError 를 올립니다.
+    """
+    shard_files = {}
+    for path in glob.glob(os.path.join(output_dir, glob.escape(stem) + ".shard-*-of-*.json")):
+        match = SHARD_FILE_RE.match(os.path.basename(path))
+        if match:
+            shard_files[(int(match.group("index")), int(match.group("count")))] = path
+
+    counts = {count for _, count in shard_files}
+    if len(counts) != 1:
+        raise ValueError(f"{stem}: shard files disagree on N ({sorted(counts)})")
+    count = counts.pop()
+    missing = [i for i in range(count) if (i, count) not in shard_files]
+    if missing:
+        raise ValueError(f"{stem}: missing shards {missing} of {count}")
+
+    keyed = []
+    summaries = []
+    for index in range(count):
+        path = shard_files[(index, count)]
+        with open(path, "r", encoding="utf-8") as f:
+            shard_results = json.load(f)
+        # 샤드 안의 위치로 원래 데이터셋 위치를 복원해 같은 id 끼리의 순서도 보존합니다.
+        for position, item in enumerate(shard_results):
+            keyed.append(((_id_key(item.get("id")), position * count + index), item))
+        summary_path = path[:-len(".json")] + ".summary.json"
+        if os.path.exists(summary_path):
+            with open(summary_path, "r", encoding="utf-8") as f:
+                summaries.append(json.load(f))
+
+    merged = [item for _, item in sorted(keyed, key=lambda pair: pair[0])]
+    merged_path = os.path.join(output_dir, stem + ".json")
+    if any("trace_store" in summary for summary in summaries):
+        write_slim_results(merged_path, merged)
+        merge_trace_files([shard_files[(index, count)] for index in range(count)], merged_path)
+    else:
+        with open(merged_path, "w", encoding="utf-8") as f:
+            json.dump(merged, f, ensure_ascii=False, indent=2)
+    merged_summary = merge_summaries(summaries)
+    if "trace_store" in merged_summary:
+        merged_summary["trace_store"]["path"] = os.path.basename(find_trace_file(merged_path))
+    with open(merged_path[:-len(".json")] + ".summary.json", "w", encoding="utf-8") as f:
+        json.dump(merged_summary, f, ensure_ascii=False, indent=2)
+    return merged_path
+
+
+def merge_trace_files(shard_paths: list, merged_path: str):
+    """
+    샤드 트레이스 파일을 이어 붙입니다. gzip 멤버와 zstd 프레임은 이어 붙여도 올바른 파일이고,
+    각 샤드의 blob 줄은 참조하는 트레이스보다 앞에 있으므로 순서대로 읽으면 그대로 복원됩니다.
+    """
+    for compression in COMPRESSIONS:
+        parts = [trace_path(path, compression) for path in shard_paths]
+        parts = [part for part in parts if os.path.exists(part)]
+        if not parts:
+            continue
+        with open(trace_path(merged_path, compression), "wb") as out:
+            for part in parts:
+                with open(part, "rb") as f:
+                    shutil.copyfileobj(f, out)
+
+
+def _sum_into(total: dict, summary: dict):
+    for key, value in summary.items():
+        if isinstance(value, dict):
+            _sum_into(total.setdefault(key, {}), value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            total[key] = total.get(key, 0) + value
+        else:
+            total.setdefault(key, value)
+
+
+def merge_summaries(summaries: list) -> dict:
+    """
+    샤드 요약을 합칩니다. 수치 필드는 더하고, 병렬 실행이므로 wall_time 은 가장 느린 샤드 기준입니다.
+    budget 블록은 한도를 더하면 안 되므로 merge_budget_summaries 로 따로 합칩니다.
+    verifier 의 calibration 은 샤드마다 전체 데이터셋으로 같은 값을 계산하므로 더하지 않고 하나만 씁니다.
+    """
+    if not summaries:
+        return {}
+    merged = {}
+    for summary in summaries:
+        _sum_into(merged, summary)
+    merged.pop("shard", None)
+    merged["wall_time"] = max(s.get("wall_time", 0) for s in summaries)
+    merged["shard_wall_time_sum"] = round(sum(s.get("wall_time", 0) for s in summaries), 3)
+    merged["shards"] = len(summaries)
+    if "stream" in merged:
+        merged["stream"] = stream_summary({key: merged["stream"][key] for key in (*STREAM_STATS, "completion_tokens")})
+    if "endpoints" in merged:
+        merged["endpoints"] = endpoint_summary(merged["endpoints"])
+    if "budget" in merged:
+        merged["budget"] = merge_budget_summaries([s["budget"] for s in summaries if "budget" in s])
+    calibrations = [s["verifier"]["calibration"] for s in summaries if "calibration" in s.get("verifier", {})]
+    if calibrations:
+        merged["verifier"]["calibration"] = calibrations[0]
+    return merged
+
+
+def merge_all(output_dir: str) -> list:
+    """
+    output_dir 에서 찾을 수 있는 모든 샤드 묶음을 병합하고 병합된 결과 파일 경로 목록을 반환합니다.
+    """
+    stems = set()
+    for path in glob.glob(os.path.join(output_dir, "*.shard-*-of-*.json")):
+        match = SHARD_FILE_RE.match(os.path.basename(path))
+        if match:
+            stems.add(match.group("stem"))
+    return [merge_stem(output_dir, stem) for stem in sorted(stems)]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Merge sharded result files.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    merge_parser = sub.add_parser("merge", help="Merge <stem>.shard-i-of-N.json files into <stem>.json.")
+    merge_parser.add_argument('--output-dir', type=str, default=".", help="Directory containing the shard files.")
+    args = parser.parse_args(argv)
+
+    try:
+        merged = merge_all(args.output_dir)
+    except ValueError as e:
+        print(f"오류: {e}")
+        return 1
+    if not merged:
+        print(f"'{args.output_dir}' 에서 샤드 결과 파일을 찾지 못했습니다.")
+        return 1
+    for path in merged:
+        print(f"병합 완료: '{path}'")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+동시에 들어온 같은 요청을 하나의 호출로 합치는 single-flight 계층.
+
+--workers 로 항목을 병렬 처리하면 입력이 같은 항목(같은 input_text / anchor_date)이나
+같은 도구 호출이 거의 동시에 나갑니다. 메모는 결과가 저장된 뒤에만 적중하므로 이런 중복은 잡지 못합니다.
+SingleFlight 는 같은 키의 호출이 진행 중이면 새 호출을 보내지 않고 진행 중인 호출의 결과(또는 예외)를 함께 받게 합니다.
+"""
+import functools
+import threading
+from concurrent.futures import Future
+
+from cot_or_react.canonical import canonical_tool_input
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight = {}     # (namespace, key) -> Future
+        self._stats = {}
+
+    def do(self, namespace: str, key: str, func) -> tuple:
+        """
+        (결과, 합류 여부). 같은 (namespace, key) 호출이 진행 중이면 그 결과를 기다려 돌려주고, 아니면 func() 를 실행합니다.
+        """
+        with self._lock:
+            counts = self._stats.setdefault(namespace, {"calls": 0, "coalesced": 0})
+            future = self._inflight.get((namespace, key))
+            leader = future is None
+            if leader:
+                counts["calls"] += 1
+                future = self._inflight[(namespace, key)] = Future()
+            else:
+                counts["coalesced"] += 1
+        if not leader:
+            return future.result(), True
+
+        try:
+            future.set_result(func())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._inflight[(namespace, key)]
+        return future.result(), False
+
+    def wrap(self, namespace, func, key_func=None):
+        """
+        ToolMemo.wrap 과 같은 모양으로 도구 함수를 감쌉니다. 합류 여부는 버리고 결과만 돌려줍니다.
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            ns = namespace(*args, **kwargs) if callable(namespace) else namespace
+            key = key_func(*args, **kwargs) if key_func else canonical_tool_input(ns, *args, **kwargs)
+            value, _ = self.do(ns, key, lambda: func(*args, **kwargs))
+            return value
+
+        return wrapper
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {namespace: dict(counts) for namespace, counts in sorted(self._stats.items()) if counts["coalesced"]}
+
+    def format_stats(self) -> str:
+        lines = []
+        for namespace, counts in self.stats().items():
+            lines.append(f"  {namespace}: 실제 호출 {counts['calls']}회, 합류 {counts['coalesced']}회")
+        return "\n".join(lines)
@@ -0,0 +1,137 @@
+"""
+규칙 기반 날짜 해석기.
+
+"내일", "사흘 전", "다음 주 금요일", "다음 달 15일" 처럼 앵커 날짜만으로 답이 정해지는 짧은 표현을
+LLM 호출 없이 계산합니다. 해석할 수 없거나 다른 시간 표현이 섞여 있으면 None 을 반환하므로,
+호출하는 쪽은 CoT / ReAct 로 넘기면 됩니다.
+"""
+import calendar
+import re
+from datetime import date, timedelta
+
+from cot_or_react import event_kb
+
+
+WEEKDAYS = {"월": 0, "화": 1, "수": 2, "목": 3, "금": 4, "토": 5, "일": 6}
+
+FIXED_DAYS = {
+    "그그저께": -3, "그끄저께": -3, "그저께": -2, "그제": -2, "어제": -1, "오늘": 0,
+    "내일 모레": 2, "내일": 1, "모레": 2, "글피": 3,
+}
+
+NATIVE_NUMBERS = {
+    "하루": 1, "이틀": 2, "사흘": 3, "나흘": 4, "닷새": 5, "엿새": 6, "이레": 7,
+    "여드레": 8, "아흐레": 9, "열흘": 10, "보름": 15,
+}
+
+COUNT_WORDS = {"한": 1, "두": 2, "세": 3, "네": 4}
+
+WEEK_OFFSETS = {"지난": -1, "저번": -1, "이번": 0, "다음": 1, "다다음": 2}
+MONTH_OFFSETS = {"지난": -1, "저번": -1, "이번": 0, "이": 0, "다음": 1, "내": 1, "다다음": 2}
+YEAR_OFFSETS = {"재작년": -2, "작년": -1, "올해": 0, "내년": 1, "후년": 2, "내후년": 2}
+
+# 해석한 구절 밖에 이런 표현이 남아 있으면 추가 조건이 있는 것으로 보고 해석하지 않습니다.
+TEMPORAL_RESIDUE = re.compile(r"\d|요일|주|달|월|년|전|후|뒤|제외|평일|영업|공휴|휴일|말일|첫|마지막|다음|지난|이번|연휴|명일|작일|익일|로부터|부터")
+
+_DIRECTION = r"(?P<dir>전|후|뒤|이후|이전)"
+
+
+def _sign(direction: str) -> int:
+    return -1 if direction in ("전", "이전") else 1
+
+
+def add_months(base: date, months: int) -> date:
+    """
+    월 단위 이동. 대상 월에 같은 날이 없으면 그 달의 마지막 날로 맞춥니다.
+    """
+    month_index = base.month - 1 + months
+    year, month = base.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(base.day, calendar.monthrange(year, month)[1]))
+
+
+def _week_weekday(anchor: date, week_offset: int, weekday: int) -> date:
+    monday = anchor - timedelta(days=anchor.weekday())
+    return monday + timedelta(weeks=week_offset, days=weekday)
+
+
+def _count(token: str) -> int:
+    return int(token) if token.isdigit() else COUNT_WORDS[token]
+
+
+def _rules():
+    """
+    (정규식, 계산 함수) 목록. 더 구체적인 규칙이 먼저 오도록 순서를 정합니다.
+    """
+    native = "|".join(sorted(NATIVE_NUMBERS, key=len, reverse=True))
+    fixed = "|".join(sorted(FIXED_DAYS, key=len, reverse=True))
+    count = r"(?P<n>\d+|한|두|세|네)"
+    return [
+        (rf"(?P<word>{native})\s*{_DIRECTION}",
+         lambda a, m: a + timedelta(days=_sign(m["dir"]) * NATIVE_NUMBERS[m["word"]])),
+        (rf"(?P<n>\d+)\s*일\s*{_DIRECTION}",
+         lambda a, m: a + timedelta(days=_sign(m["dir"]) * int(m["n"]))),
+        (rf"(?:일주일|{count}\s*주일?)\s*{_DIRECTION}",
+         lambda a, m: a + timedelta(weeks=_sign(m["dir"]) * _count(m["n"] or "1"))),
+        (rf"{count}\s*(?:달|개월)\s*{_DIRECTION}",
+         lambda a, m: add_months(a, _sign(m["dir"]) * _count(m["n"]))),
+        (rf"(?P<n>\d+)\s*년\s*{_DIRECTION}\s*(?:같은\s*날(?:짜)?)?",
+         lambda a, m: add_months(a, 12 * _sign(m["dir"]) * int(m["n"]))),
+        (r"(?P<y>재작년|작년|내후년|후년|내년)\s*같은\s*날(?:짜)?",
+         lambda a, m: add_months(a, 12 * YEAR_OFFSETS[m["y"]])),
+        (r"(?P<w>다다음|다음|지난|저번|이번)\s*주\s*(?P<wd>[월화수목금토일])요일",
+         lambda a, m: _week_weekday(a, WEEK_OFFSETS[m["w"]], WEEKDAYS[m["wd"]])),
+        (r"(?P<mo>다다음|다음|지난|저번|이번|내)\s*달\s*같은\s*날(?:짜)?",
+         lambda a, m: add_months(a, MONTH_OFFSETS[m["mo"]])),
+        (r"(?P<mo>다다음|다음|지난|저번|이번|내)\s*달\s*(?P<d>\d{1,2})\s*일",
+         lambda a, m: _month_day(a, MONTH_OFFSETS[m["mo"]], int(m["d"]))),
+        (r"(?P<mo>다다음|다음|지난|저번|이번|내)\s*달\s*(?:첫\s*날|첫날|1일)",
+         lambda a, m: _month_day(a, MONTH_OFFSETS[m["mo"]], 1)),
+        (r"(?P<mo>다다음|다음|지난|저번|이번|내)\s*달\s*(?:마지막\s*날|말일)",
+         lambda a, m: _month_end(a, MONTH_OFFSETS[m["mo"]])),
+        (r"(?P<y>재작년|작년|올해|내년|후년)\s*(?P<mon>\d{1,2})\s*월\s*(?P<d>\d{1,2})\s*일",
+         lambda a, m: date(a.year + YEAR_OFFSETS[m["y"]], int(m["mon"]), int(m["d"]))),
+        (r"(?P<y>재작년|작년|올해|내년|후년)\s*(?:첫\s*날|첫날)",
+         lambda a, m: date(a.year + YEAR_OFFSETS[m["y"]], 1, 1)),
+        (r"(?P<y>재작년|작년|올해|내년|후년)\s*(?:마지막\s*날)",
+         lambda a, m: date(a.year + YEAR_OFFSETS[m["y"]], 12, 31)),
+        (rf"(?P<word>{fixed})",
+         lambda a, m: a + timedelta(days=FIXED_DAYS[m["word"]])),
+    ]
+
+
+def _month_day(anchor: date, month_offset: int, day: int) -> date:
+    first = add_months(anchor.replace(day=1), month_offset)
+    return first.replace(day=day)
+
+
+def _month_end(anchor: date, month_offset: int) -> date:
+    first = add_months(anchor.replace(day=1), month_offset)
+    return first.replace(day=calendar.monthrange(first.year, first.month)[1])
+
+
+RULES = [(re.compile(pattern), compute) for pattern, compute in _rules()]
+
+
+def solve(input_text: str, anchor_date: str):
+    """
+    input_text 를 앵커 날짜 기준으로 해석해 'YYYY-MM-DD' 를 반환합니다. 규칙에 맞지 않으면 None.
+    """
+    if not input_text or not anchor_date:
+        return None
+    try:
+        anchor = date.fromisoformat(str(anchor_date))
+    except ValueError:
+        return None
+    text = re.sub(r"\s+", " ", str(input_text)).strip()
+    for pattern, compute in RULES:
+        match = pattern.search(text)
+        if not match:
+            continue
+        rest = (text[:match.start()] + " " + text[match.end():]).strip()
+        if TEMPORAL_RESIDUE.search(rest) or event_kb.get_kb().match(rest):
+            return None
+        try:
+            return compute(anchor, match).isoformat()
+        except ValueError:
+            return None
+    return None
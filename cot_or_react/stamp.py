@@ -0,0 +1,142 @@
+"""
+결과 항목의 의존성 해시와 증분 재실행.
+
+각 결과 항목에 input_hash 를 남깁니다. 이 해시는 사용한 프롬프트 파일 내용, 모델 이름, 결과에 영향을 주는 실행 옵션,
+메소드 구현(에이전트 루프, JSON 복구, CoT 묶음 등), 도구 구현(도구 모듈 소스와 이벤트 KB), 그리고 데이터셋 항목의 필드로 계산합니다.
+--incremental 은 이전 결과 파일에서 해시가 같은 항목을 그대로 가져오고, 해시가 달라진(=입력이 바뀐) 항목만 다시 실행합니다.
+"""
+import functools
+import hashlib
+import json
+import os
+
+from cot_or_react.agent import is_error_prediction
+from cot_or_react.tasks import REPO_ROOT
+from cot_or_react.trace_store import expand, find_trace_file
+
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 도구 동작을 정하는 파일. 이 중 하나라도 바뀌면 도구를 쓰는 항목(ReAct, 라우팅, extract-solve)은 모두 다시 실행됩니다.
+TOOL_SOURCES = (
+    os.path.join(PACKAGE_DIR, "tools.py"),
+    os.path.join(PACKAGE_DIR, "canonical.py"),
+    os.path.join(PACKAGE_DIR, "hybrid.py"),
+    os.path.join(PACKAGE_DIR, "solver.py"),
+    os.path.join(PACKAGE_DIR, "scheduler.py"),
+    os.path.join(PACKAGE_DIR, "verifier.py"),
+    os.path.join(REPO_ROOT, "data", "event_kb.json"),
+)
+
+# 메소드 동작을 정하는 파일. 응답 해석과 루프 제어가 여기 있으므로 CoT 를 포함한 모든 항목이 다시 실행됩니다.
+# llm.py·stream_json.py 는 요청 인자와 스트리밍 조기 중단, router.py 는 라우팅 메소드의 선택 규칙, kasi_cassette.py 는 --kasi-replay 의 재생 방식을 정합니다.
+METHOD_SOURCES = (
+    os.path.join(PACKAGE_DIR, "agent.py"),
+    os.path.join(PACKAGE_DIR, "react_guard.py"),
+    os.path.join(PACKAGE_DIR, "json_repair.py"),
+    os.path.join(PACKAGE_DIR, "extract.py"),
+    os.path.join(PACKAGE_DIR, "batch.py"),
+    os.path.join(PACKAGE_DIR, "llm.py"),
+    os.path.join(PACKAGE_DIR, "stream_json.py"),
+    os.path.join(PACKAGE_DIR, "router.py"),
+    os.path.join(PACKAGE_DIR, "kasi_cassette.py"),
+)
+
+# 결과에 영향을 주는 실행 옵션. workers, output-dir 처럼 결과를 바꾸지 않는 옵션은 넣지 않습니다.
+# kasi_replay 는 카세트 내용까지 해시합니다(같은 경로에 다시 녹화하면 도구 결과가 달라짐).
+STAMPED_OPTIONS = (
+    "model", "tool_mode", "shadow_rate", "max_stall_turns", "cot_batch_size", "cot_batch_tokens",
+    "stream", "max_output_chars", "route_tolerance", "react_verifier", "json_repair", "kasi_replay",
+)
+
+
+def _digest(payload) -> str:
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def source_fingerprint(paths: tuple) -> str:
+    sha = hashlib.sha256()
+    for path in paths:
+        sha.update(os.path.basename(path).encode("utf-8"))
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                sha.update(f.read())
+    return sha.hexdigest()
+
+
+def tool_fingerprint() -> str:
+    return source_fingerprint(TOOL_SOURCES)
+
+
+def _option_value(args, name: str):
+    value = getattr(args, name, None)
+    if name == "kasi_replay" and value:
+        value = dict(value, cassette=source_fingerprint((value["path"],)))
+    return value
+
+
+def run_fingerprint(method: str, prompts: dict, args, router_table: str = None) -> str:
+    """
+    한 Task / 메소드 조합의 모든 항목이 공유하는 의존성 해시.
+    """
+    payload = {
+        "method": method,
+        "prompts": prompts,
+        "options": {name: _option_value(args, name) for name in STAMPED_OPTIONS},
+        "code": source_fingerprint(METHOD_SOURCES),
+    }
+    if method != "cot":
+        payload["tools"] = tool_fingerprint()
+    if router_table:
+        with open(router_table, "r", encoding="utf-8") as f:
+            payload["router_table"] = json.load(f)
+    return _digest(payload)
+
+
+def item_stamp(item: dict, fingerprint: str) -> str:
+    fields = {key: value for key, value in item.items() if key != "input_hash"}
+    return _digest({"run": fingerprint, "item": fields})[:32]
+
+
+def previous_results_path(incremental: str, output_dir: str, filenames: list):
+    """
+    --incremental 값으로 이전 결과 파일을 찾습니다. 값이 없으면 output_dir 에서, 디렉터리면 그 안에서,
+    파일이면 그 파일을 씁니다. filenames 는 우선순위 순의 후보 파일 이름(샤드 파일, 병합 파일)입니다.
+    """
+    if incremental and os.path.isfile(incremental):
+        return incremental
+    directory = incremental or output_dir
+    for filename in filenames:
+        path = os.path.join(directory, filename)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def load_previous(path: str, dataset: list) -> list:
+    """
+    이전 결과 항목을 읽습니다. 슬림 결과 파일이면 트레이스와 데이터셋 입력을 합쳐 전체 항목으로 복원합니다.
+    """
+    if find_trace_file(path):
+        return expand(path, dataset)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def carry_forward(dataset: list, previous: list) -> dict:
+    """
+    {데이터셋 위치: 이전 결과 항목}. id 와 input_hash 가 모두 같은 이전 항목만 가져옵니다.
+    오류로 끝난 항목은 일시적인 API 오류일 수 있으므로, 예산 때문에 줄여 실행한 항목은 원래 방식의 결과가 아니므로 다시 실행합니다.
+    """
+    by_key = {}
+    for item in previous:
+        degraded = (item.get("budget") or {}).get("degradations")
+        if item.get("input_hash") and not is_error_prediction(item.get("prediction")) and not degraded:
+            by_key.setdefault((item.get("id"), item["input_hash"]), []).append(item)
+    carried = {}
+    for position, item in enumerate(dataset):
+        candidates = by_key.get((item.get("id"), item.get("input_hash")))
+        if candidates:
+            carried[position] = candidates.pop(0)
+    return carried
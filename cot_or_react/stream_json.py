@@ -0,0 +1,100 @@
+"""
+스트리밍 응답용 점진적 JSON 객체 파서.
+
+청크를 받을 때마다 최상위 객체의 키 중 값이 끝까지 도착한 것만 골라 냅니다.
+"tool" / "tool_input" 이나 "prediction" 처럼 제어 흐름에 필요한 키가 모두 완성되면
+호출하는 쪽은 나머지 생성을 기다리지 않고 스트림을 닫을 수 있습니다.
+"""
+import json
+
+
+class IncrementalJSONObject:
+    def __init__(self):
+        self.buffer = ""
+        self.values = {}
+        self.done = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._key = None
+        self._expect = "object"     # object -> key -> colon -> value -> (value 진행 중) -> comma
+        self._value_start = None
+
+    def feed(self, chunk: str) -> dict:
+        """
+        청크를 덧붙이고 지금까지 완성된 최상위 키-값을 반환합니다.
+        """
+        self.buffer += chunk
+        buf = self.buffer
+        while self._pos < len(buf) and not self.done:
+            self._step(buf, self._pos, buf[self._pos])
+            self._pos += 1
+        return self.values
+
+    def complete(self, keys) -> bool:
+        return all(key in self.values for key in keys)
+
+    def _finish_value(self, end: int):
+        try:
+            self.values[self._key] = json.loads(self.buffer[self._value_start:end])
+        except json.JSONDecodeError:
+            pass
+        self._key = None
+        self._value_start = None
+        self._expect = "comma"
+
+    def _step(self, buf: str, i: int, ch: str):
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._in_string = False
+                if self._depth == 1 and self._expect == "key":
+                    self._key = json.loads(buf[self._string_start:i + 1])
+                    self._expect = "colon"
+                elif self._depth == 1 and self._expect == "string_value":
+                    self._finish_value(i + 1)
+            return
+
+        if self._expect == "object":
+            # 코드 펜스 등 객체 앞의 텍스트는 건너뜁니다.
+            if ch == "{":
+                self._depth = 1
+                self._expect = "key"
+            return
+
+        if ch == '"':
+            self._in_string = True
+            self._string_start = i
+            if self._depth == 1 and self._expect == "value":
+                self._value_start = i
+                self._expect = "string_value"
+            return
+
+        if self._depth == 1 and self._expect == "colon" and ch == ":":
+            self._expect = "value"
+        elif self._depth == 1 and self._expect == "value" and not ch.isspace():
+            self._value_start = i
+            if ch in "{[":
+                self._depth += 1
+                self._expect = "container_value"
+            else:
+                self._expect = "scalar_value"
+        elif ch in "{[":
+            self._depth += 1
+        elif ch in "}]":
+            if self._depth == 1 and self._expect == "scalar_value":
+                self._finish_value(i)
+            self._depth -= 1
+            if self._depth == 1 and self._expect == "container_value":
+                self._finish_value(i + 1)
+            elif self._depth == 0:
+                self.done = True
+        elif ch == "," and self._depth == 1:
+            if self._expect == "scalar_value":
+                self._finish_value(i)
+            self._expect = "key"
@@ -0,0 +1,63 @@
+"""
+Task 별 데이터셋·프롬프트 구성.
+
+예전에는 스크립트마다 '/workspace/NLP/...' 경로를 하드코딩했지만, 이제 저장소 루트 기준의
+data/, prompts/ 디렉터리(또는 --data-dir / --prompt-dir 로 지정한 위치)에서 읽습니다.
+"""
+import json
+import os
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(REPO_ROOT, "data")
+PROMPT_DIR = os.path.join(REPO_ROOT, "prompts")
+RESULTS_DIR = os.path.join(REPO_ROOT, "results")
+
+# react: "single_step" 은 Thought -> Action -> 최종 답 (T1/T2), "loop" 는 최대 10턴 루프 (T3)
+TASKS = {
+    "t1": {"dataset": "T1_dataset.json", "react": "single_step"},
+    "t2": {"dataset": "T2_dataset.json", "react": "single_step"},
+    "t3": {"dataset": "T3_dataset.json", "react": "loop"},
+}
+
+METHODS = ("cot", "react")
+
+
+def prompt_files(task: str, method: str) -> dict:
+    """
+    method 에 필요한 프롬프트 파일 이름. system 은 CoT 프롬프트, ReAct Thought 프롬프트 또는 제약 추출 프롬프트입니다.
+    """
+    if method == "react":
+        return {"system": f"{task}_react_thought.txt", "observation": f"{task}_react_observation.txt"}
+    if method == "extract-solve":
+        return {"system": f"{task}_extract.txt"}
+    return {"system": f"{task}_{method}.txt"}
+
+
+def load_prompts(task: str, method: str, prompt_dir: str = PROMPT_DIR) -> dict:
+    prompts = {}
+    for role, filename in prompt_files(task, method).items():
+        with open(os.path.join(prompt_dir, filename), "r", encoding="utf-8") as f:
+            prompts[role] = f.read()
+    return prompts
+
+
+def load_dataset(task: str, data_dir: str = DATA_DIR) -> list:
+    """
+    T*_dataset.json 을 읽습니다. 없으면 한 줄에 항목 하나인 T*_dataset.jsonl(합성 부하 생성기의 출력)을 읽습니다.
+    """
+    path = os.path.join(data_dir, TASKS[task]["dataset"])
+    if not os.path.exists(path) and os.path.exists(path + "l"):
+        with open(path + "l", "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def output_filename(task: str, method: str, tool_mode: str = "real") -> str:
+    """
+    기존 스크립트와 같은 결과 파일 이름을 씁니다. LLM/하이브리드 도구 실행은 접미사로 구분합니다.
+    """
+    if tool_mode == "real":
+        return f"{task}_{method}_results.json"
+    return f"{task}_{method}_results_{tool_mode}_tools.json"
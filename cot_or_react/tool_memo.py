@@ -0,0 +1,142 @@
+"""
+실행 단위(run-scoped) 도구 결과 메모이제이션.
+
+500개 항목을 도는 동안 같은 calculator 문자열, 같은 calendar_db 조회, 같은 search 질의가
+여러 번 반복됩니다. ToolMemo 는 정규화된 입력 키로 결과를 LRU 에 보관해 항목 간에 공유하고,
+원하면 디스크 디렉터리에 결과를 함께 기록(spill)해 다음 실행이나 다른 프로세스도 재사용하게 합니다.
+"""
+import functools
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from cot_or_react.canonical import canonical_tool_input
+
+
+DEFAULT_CACHE_SIZE = 4096
+
+# 일시적인 실패는 캐시하지 않습니다.
+ERROR_MARKERS = ("Error:", "Error for", "tool error", "execution error")
+
+
+def is_cacheable(value) -> bool:
+    return isinstance(value, str) and not any(marker in value for marker in ERROR_MARKERS)
+
+
+class ToolMemo:
+    """
+    스레드 안전한 LRU 메모. maxsize 가 0 이면 아무것도 저장하지 않고 통과만 시킵니다.
+    spill_dir 를 주면 저장하는 모든 결과를 `<spill_dir>/<namespace>/<sha1>.json` 에도 기록하고,
+    메모리에서 밀려난 결과는 디스크에서 다시 읽어 옵니다.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE, spill_dir: str = None):
+        self.maxsize = maxsize
+        self.spill_dir = spill_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {}
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def _count(self, namespace: str, field: str):
+        counts = self._stats.setdefault(namespace, {"hits": 0, "disk_hits": 0, "misses": 0})
+        counts[field] += 1
+
+    def _spill_path(self, namespace: str, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.spill_dir, namespace, f"{digest}.json")
+
+    def _read_spill(self, namespace: str, key: str):
+        try:
+            with open(self._spill_path(namespace, key), "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return record.get("value") if record.get("key") == key else None
+
+    def _write_spill(self, namespace: str, key: str, value: str):
+        path = self._spill_path(namespace, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "value": value}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _store(self, namespace: str, key: str, value: str):
+        self._entries[(namespace, key)] = value
+        self._entries.move_to_end((namespace, key))
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get(self, namespace: str, key: str):
+        """
+        저장된 결과를 반환하고, 없으면 None 을 반환합니다. 적중/미적중은 namespace 별로 집계됩니다.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            if (namespace, key) in self._entries:
+                self._entries.move_to_end((namespace, key))
+                self._count(namespace, "hits")
+                return self._entries[(namespace, key)]
+
+        value = self._read_spill(namespace, key) if self.spill_dir else None
+        with self._lock:
+            if value is not None:
+                self._store(namespace, key, value)
+                self._count(namespace, "disk_hits")
+            else:
+                self._count(namespace, "misses")
+        return value
+
+    def put(self, namespace: str, key: str, value: str):
+        if not self.enabled or not is_cacheable(value):
+            return
+        with self._lock:
+            self._store(namespace, key, value)
+        if self.spill_dir:
+            self._write_spill(namespace, key, value)
+
+    def wrap(self, namespace, func, key_func=None):
+        """
+        도구 함수를 메모 계층으로 감쌉니다. namespace 는 문자열이거나, 호출 인자를 받아
+        문자열을 돌려주는 함수입니다(예: execute_tool_with_llm 의 tool_name 별 집계).
+        key_func 를 주지 않으면 canonical_tool_input(namespace, tool_input) 을 키로 씁니다.
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            ns = namespace(*args, **kwargs) if callable(namespace) else namespace
+            key = key_func(*args, **kwargs) if key_func else canonical_tool_input(ns, *args, **kwargs)
+            cached = self.get(ns, key)
+            if cached is not None:
+                return cached
+            value = func(*args, **kwargs)
+            self.put(ns, key, value)
+            return value
+
+        return wrapper
+
+    def stats(self) -> dict:
+        with self._lock:
+            result = {}
+            for namespace, counts in sorted(self._stats.items()):
+                total = counts["hits"] + counts["disk_hits"] + counts["misses"]
+                hit_rate = (counts["hits"] + counts["disk_hits"]) / total if total else 0.0
+                result[namespace] = dict(counts, hit_rate=round(hit_rate, 4))
+            return result
+
+    def format_stats(self) -> str:
+        lines = []
+        for namespace, counts in self.stats().items():
+            lines.append(
+                f"  {namespace}: 적중 {counts['hits']} (디스크 {counts['disk_hits']}) / "
+                f"미적중 {counts['misses']} (적중률 {counts['hit_rate']:.1%})"
+            )
+        return "\n".join(lines)
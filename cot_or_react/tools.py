@@ -0,0 +1,374 @@
+"""
+ReAct 에이전트의 도구 계층.
+
+결정적 도구(날짜 계산기, KASI 특일 정보 조회), LLM 기반 검색·도구 시뮬레이션, 그리고 이들을
+메모·선조회·하이브리드 실행과 묶어 주는 Toolbox 를 제공합니다. requests / dateutil 은 실제로
+도구를 쓸 때 import 하므로 CoT 실행은 이 비용을 치르지 않습니다.
+"""
+import json
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+
+from cot_or_react import event_kb
+from cot_or_react.canonical import calendar_months, canonical_tool_input
+from cot_or_react.hybrid import LLM_SOURCE, TOOL_SOURCE, HybridExecutor
+from cot_or_react.prefetch import HolidayPrefetcher, needs_holidays
+from cot_or_react.scheduler import HolidayCalendar
+from cot_or_react.singleflight import SingleFlight
+from cot_or_react.tool_memo import ToolMemo
+
+
+KASI_API_KEY = os.getenv("KASI_API_KEY", "PUT YOUR API KEY HERE")
+KASI_BASE_URL = os.getenv("KASI_BASE_URL", "http://apis.data.go.kr/B090041/openapi/service/SpcdeInfoService")
+CATEGORY_OPERATIONS = {
+    "holiday": "getHoliDeInfo",
+    "rest": "getRestDeInfo",
+    "anniversary": "getAnniversaryInfo",
+    "24divisions": "get24DivisionsInfo",
+    "sundry": "getSundryDayInfo"
+}
+
+TOOL_NAMES = ("calculator", "calendar_db", "search")
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def http_session():
+    """
+    KASI 호출이 커넥션을 재사용하도록 실행 전체에서 requests.Session 하나를 공유합니다.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+
+                _session = requests.Session()
+    return _session
+
+
+def install_http_session(session):
+    """
+    KASI 호출에 쓸 세션을 바꿉니다. kasi_cassette 의 녹화·재생 세션처럼 get(url, params=, timeout=) 만 있으면 됩니다.
+    """
+    global _session
+    with _session_lock:
+        _session = session
+
+
+def execute_calculator(tool_input: str) -> str:
+    """
+    날짜 계산 도구. '2025-11-21 + 7 days', '2025-11-21 next friday', '2025-11-21 next month' 같은 다양한 날짜 계산 입력을 처리합니다.
+    """
+    from dateutil.relativedelta import relativedelta
+
+    try:
+        tool_input = tool_input.lower().strip()
+
+        # 패턴 1: 'YYYY-MM-DD +/- N unit' 형식 (e.g., 2025-11-21 + 3 weeks)
+        pattern1 = r"(\d{4}-\d{2}-\d{2})\s*([+-])\s*(\d+)\s*(days?|weeks?|months?)"
+        match1 = re.match(pattern1, tool_input)
+        if match1:
+            base_date_str, operator, num_str, unit = match1.groups()
+            base_date = datetime.strptime(base_date_str, "%Y-%m-%d")
+            num = int(num_str)
+
+            if unit.startswith("day"):
+                delta = timedelta(days=num)
+            elif unit.startswith("week"):
+                delta = timedelta(weeks=num)
+            elif unit.startswith("month"):
+                delta = relativedelta(months=num)
+            
+            result_date = base_date + delta if operator == '+' else base_date - delta
+            return result_date.strftime("%Y-%m-%d")
+
+        # 패턴 2: 'YYYY-MM-DD [next/last/previous/this] weekday' 형식 (e.g., 2025-11-21 next friday)
+        pattern2 = r"(\d{4}-\d{2}-\d{2})\s*(next|last|previous|this)\s*(\w+day)"
+        match2 = re.match(pattern2, tool_input)
+        if match2:
+            base_date_str, direction, day_name = match2.groups()
+            base_date = datetime.strptime(base_date_str, "%Y-%m-%d")
+            
+            weekdays = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+            if day_name not in weekdays:
+                return f"Error: Unknown day '{day_name}'"
+            
+            target_weekday = weekdays.index(day_name)
+            current_weekday = base_date.weekday()
+            
+            if direction in ["next", "this"]:
+                days_ahead = target_weekday - current_weekday
+                if direction == "next" or (direction == "this" and days_ahead < 0):
+                     days_ahead += 7
+                result_date = base_date + timedelta(days_ahead)
+            elif direction in ["last", "previous"]:
+                days_behind = current_weekday - target_weekday
+                if days_behind <= 0:
+                    days_behind += 7
+                result_date = base_date - timedelta(days_behind)
+            
+            return result_date.strftime("%Y-%m-%d")
+
+        # 패턴 3: 'YYYY-MM-DD [next/last/previous/this] week/month' 형식 (e.g., 2025-11-21 next month)
+        pattern3 = r"(\d{4}-\d{2}-\d{2})\s*(next|last|previous|this)\s*(week|month)"
+        match3 = re.match(pattern3, tool_input)
+        if match3:
+            base_date_str, direction, unit = match3.groups()
+            base_date = datetime.strptime(base_date_str, "%Y-%m-%d")
+            
+            delta = None
+            if unit == "week":
+                delta = timedelta(weeks=1)
+            elif unit == "month":
+                delta = relativedelta(months=1)
+
+            if direction in ["next", "this"]:
+                result_date = base_date + delta
+            elif direction in ["last", "previous"]:
+                result_date = base_date - delta
+            
+            return result_date.strftime("%Y-%m-%d")
+
+        return f"Error: Cannot parse calculator input '{tool_input}'"
+
+    except Exception as e:
+        return f"Calculator Error: {str(e)}"
+
+
+def fetch_calendar_month(year, month: str, category: str = "rest") -> str:
+    """
+    KASI 특일 정보 API 에서 한 달치 특일을 조회해 JSON 배열 문자열로 반환합니다.
+    실패하면 예외를 그대로 올려 보내므로, 성공한 월만 메모·선조회 결과로 남습니다.
+    """
+    operation_name = CATEGORY_OPERATIONS.get(category, "getRestDeInfo")
+    base_url = f"{KASI_BASE_URL}/{operation_name}"
+    
+    date_kind_map = {
+        "01": "국경일",
+        "02": "기념일",
+        "03": "24절기",
+        "04": "잡절"
+    }
+
+    params = {
+        "solYear": year,
+        "solMonth": month,
+        "ServiceKey": KASI_API_KEY,
+        "_type": "json",
+        "numOfRows": 50
+    }
+    if KASI_API_KEY == "YOUR_KASI_API_KEY_HERE":
+         raise ValueError("KASI_API_KEY is not set.")
+    res = http_session().get(base_url, params=params, timeout=10)
+    res.raise_for_status()
+    data = res.json()
+    
+    # 특일이 없는 달(11월 등)은 items 가 빈 문자열로 옵니다.
+    items = data.get('response', {}).get('body', {}).get('items') or {}
+    items = items.get('item') if isinstance(items, dict) else None
+    if not items:
+        return "[]"
+    if isinstance(items, dict):
+        items = [items]
+    
+    month_results = []
+    for item in items:
+        date_kind_code = item.get('dateKind')
+        month_results.append({
+            "dateName": item.get('dateName'),
+            "locdate": str(item.get('locdate')),
+            "isHoliday": item.get('isHoliday', 'N'),
+            "dateKind": date_kind_map.get(date_kind_code, date_kind_code)
+        })
+    return json.dumps(month_results, ensure_ascii=False)
+
+
+def execute_calendar_db(tool_input: dict, fetch_month=None) -> str:
+    """
+    KASI 특일 정보 API를 호출하여 공휴일, 기념일 등의 정보를 가져옵니다.
+    tool_input 예시: {"year": "2025", "month": "all", "category": "rest"}
+    fetch_month 를 주면 월 단위 조회에 그 함수(메모·선조회 계층 등)를 사용합니다.
+    """
+    fetch_month = fetch_month or fetch_calendar_month
+    if not isinstance(tool_input, dict):
+        return "Error: Input for calendar_db must be a dictionary."
+
+    year = tool_input.get("year")
+    month = tool_input.get("month")
+    category = tool_input.get("category", "rest")
+    
+    if not year or not month:
+        return "Error: 'year' and 'month' are required for calendar_db."
+
+    all_results = []
+    for m in calendar_months(month):
+        try:
+            all_results.extend(json.loads(fetch_month(year, m, category)))
+        except Exception as e:
+            all_results.append(f"API Error for {year}-{m}: {str(e)}")
+            
+    return json.dumps(all_results, ensure_ascii=False) if all_results else "No special days found."
+
+
+def execute_search(llm, tool_input: str) -> str:
+    """
+    검색 도구. 로컬 이벤트 지식베이스(event_kb)를 먼저 조회하고,
+    KB 에 없는 질의만 Solar 모델을 사용하여 정보를 검색하고 요약합니다.
+    """
+    kb_result = event_kb.lookup(tool_input)
+    if kb_result is not None:
+        return kb_result
+
+    try:
+        messages = [
+            {"role": "system", "content": "You are a helpful assistant that provides concise, factual answers based on the user's query, as if you were a search engine."},
+            {"role": "user", "content": f"For the query '{tool_input}', provide a direct and factual answer, summarizing the key information within 150 characters."}
+        ]
+        return llm.complete(messages, json_mode=False).content.strip()
+
+    except Exception as e:
+        return f"Search tool error: {str(e)}"
+
+
+TOOL_EXECUTION_SYSTEM_PROMPT = """
+You are an expert tool executor. Your task is to act as a specific tool and provide only the direct output for the given input. Do not provide any explanations, apologies, or extra text. Just return the result.
+
+- If the tool is 'calculator', perform the date calculation and return the date string 'YYYY-MM-DD'.
+- If the tool is 'calendar_db', act like a database query. Return a JSON array of holidays for the given year/month, or return the exact string "No special days found." if there are none.
+- If the tool is 'search', act like a search engine and provide a concise, one-sentence factual answer.
+"""
+
+
+def execute_tool_with_llm(llm, tool_name: str, tool_input) -> str:
+    """
+    LLM을 사용하여 주어진 도구의 실행을 시뮬레이션하고 결과를 반환합니다.
+    """
+    user_prompt = f"Tool: [{tool_name}]\nInput: {json.dumps(tool_input, ensure_ascii=False)}"
+
+    try:
+        messages = [
+            {"role": "system", "content": TOOL_EXECUTION_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]
+        return llm.complete(messages, json_mode=False).content.strip()
+
+    except Exception as e:
+        return f"LLM-based tool execution error: {str(e)}"
+
+
+class Toolbox:
+    """
+    ReAct 에이전트가 쓰는 도구 묶음. 실행 전체에서 하나만 만들어 메모·선조회·HTTP 세션을 공유합니다.
+
+    mode:
+      - "real":   결정적 calculator / KASI calendar_db, KB 우선 search (t1.py, t2.py, t3.py)
+      - "llm":    모든 도구를 LLM 으로 시뮬레이션 (t3_llm.py 기본)
+      - "hybrid": 결정적 경로를 먼저 시도하고 실패할 때만 LLM 시뮬레이션
+    """
+
+    def __init__(self, llm, mode: str = "real", memo: ToolMemo = None, prefetch: bool = False, shadow_rate: float = 0.0,
+                 flight: SingleFlight = None):
+        self.llm = llm
+        self.mode = mode
+        self.memo = memo or ToolMemo(0)
+        self.flight = flight
+
+        self._fetch_month = self._shared(
+            "calendar_month",
+            fetch_calendar_month,
+            key_func=lambda year, month, category="rest": f"{year}-{month}:{category}",
+        )
+        self.prefetcher = None
+        if prefetch and mode != "llm":
+            self.prefetcher = HolidayPrefetcher(self._fetch_month)
+            self._fetch_month = self.prefetcher.track(self._fetch_month)
+
+        # extract-solve 의 일정 계산기가 쓰는 공휴일. 시뮬레이션 모드에서는 KASI 대신 이벤트 KB 만 씁니다.
+        self.holidays = HolidayCalendar(self._fetch_month if mode != "llm" else None)
+
+        self._real = {
+            "calculator": self._shared("calculator", execute_calculator),
+            "calendar_db": self._shared("calendar_db", self.calendar_db),
+            "search": self._shared("search", lambda tool_input: execute_search(self.llm, tool_input)),
+        }
+        self._simulate = self._shared(
+            lambda tool_name, tool_input: f"llm_{tool_name}",
+            lambda tool_name, tool_input: execute_tool_with_llm(self.llm, tool_name, tool_input),
+            key_func=canonical_tool_input,
+        )
+        self.hybrid = None
+        if mode == "hybrid":
+            self.hybrid = HybridExecutor(
+                simulate=self._simulate,
+                deterministic={
+                    "calculator": self._real["calculator"],
+                    "calendar_db": self._real["calendar_db"],
+                    "search": event_kb.lookup,
+                },
+                shadow_rate=shadow_rate,
+            )
+
+    def _shared(self, namespace, func, key_func=None):
+        """
+        메모 -> single-flight -> 도구 순으로 감쌉니다. 메모에 없는 같은 호출이 동시에 들어오면 한 번만 실행합니다.
+        """
+        if self.flight is not None:
+            func = self.flight.wrap(namespace, func, key_func)
+        return self.memo.wrap(namespace, func, key_func)
+
+    def calendar_db(self, tool_input: dict) -> str:
+        return execute_calendar_db(tool_input, fetch_month=self._fetch_month)
+
+    def start_item(self, item: dict):
+        """
+        ReAct 항목 시작 시 호출합니다. 공휴일 관련 항목이면 앵커 연도 선조회를 시작합니다.
+        """
+        if self.prefetcher and needs_holidays(item.get("input_text")):
+            self.prefetcher.start(item.get("anchor_date"))
+
+    def execute(self, tool_name: str, tool_input):
+        """
+        도구를 실행하고 (관측 결과, 메타 정보) 를 반환합니다. 메타의 `source` 는 결과 출처입니다.
+        """
+        if tool_name not in TOOL_NAMES:
+            return f"Error: Unknown tool '{tool_name}'", {"source": "controller"}
+        if self.mode == "llm":
+            return self._simulate(tool_name, tool_input), {"source": LLM_SOURCE}
+        if self.mode == "hybrid":
+            return self.hybrid.execute(tool_name, tool_input)
+        return self._real[tool_name](tool_input), {"source": TOOL_SOURCE}
+
+    def stats(self) -> dict:
+        stats = {"memo": self.memo.stats(), "search_kb": event_kb.stats()}
+        if self.prefetcher:
+            stats["prefetch"] = self.prefetcher.stats()
+        if self.hybrid:
+            stats["hybrid"] = self.hybrid.stats()
+        if self.flight and self.flight.stats():
+            stats["coalesced"] = self.flight.stats()
+        return stats
+
+    def format_stats(self) -> str:
+        lines = []
+        kb_stats = event_kb.stats()
+        if kb_stats["hits"] or kb_stats["misses"]:
+            lines.append(f"검색 KB 적중 {kb_stats['hits']}회 / 미적중 {kb_stats['misses']}회 (적중률 {kb_stats['hit_rate']:.1%})")
+        if self.memo.stats():
+            lines.append("도구 결과 메모:")
+            lines.append(self.memo.format_stats())
+        if self.prefetcher:
+            lines.append(self.prefetcher.format_stats())
+        if self.hybrid:
+            lines.append(self.hybrid.format_stats())
+        if self.flight and self.flight.stats():
+            lines.append("동시 중복 도구 호출 합류:")
+            lines.append(self.flight.format_stats())
+        return "\n".join(lines)
+
+    def close(self):
+        if self.prefetcher:
+            self.prefetcher.close()
@@ -0,0 +1,220 @@
+"""
+슬림 결과 레코드와 중복 제거·압축 트레이스 저장소.
+
+--trace-store 를 inline 이 아닌 값으로 주면 결과 파일에는 id, prediction, latency, tokens (와 forced_finish) 만 남기고,
+thought / react_turn_N / react_guard 같은 실행 기록은 `<결과 파일>.traces.jsonl(.gz|.zst)` 로 보냅니다.
+트레이스 안의 긴 문자열(공휴일 JSON 배열 같은 Observation)은 해시로 한 번만 저장하고 이후에는 참조만 남깁니다.
+
+    python -m cot_or_react.trace_store expand t3_react_results.json    # 예전 형식의 전체 결과 파일로 복원
+"""
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+from dataclasses import dataclass
+
+
+COMPRESSIONS = {"gzip": ".gz", "zstd": ".zst", "plain": ""}
+BLOB_MIN_CHARS = 64
+BLOB_KEY = "$blob"
+# 결과 파일에 남는 필드. route 는 경로 이름만 요약용으로 복사하고, 근거 버킷까지 담긴 원본은 트레이스에 남깁니다.
+SLIM_FIELDS = ("id", "prediction", "latency", "tokens", "input_hash", "forced_finish")
+
+
+@dataclass(slots=True)
+class ItemResult:
+    id: str
+    prediction: object = None
+    latency: float = None
+    tokens: int = None
+    route: str = None
+    input_hash: str = None
+    forced_finish: str = None
+
+    def get(self, key: str, default=None):
+        # summarize() 등 결과 딕셔너리를 읽던 코드가 그대로 동작하도록 dict.get 과 같은 모양을 제공합니다.
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def to_dict(self) -> dict:
+        return {key: getattr(self, key) for key in self.__slots__ if getattr(self, key) is not None}
+
+
+def trace_path(results_path: str, compression: str) -> str:
+    return results_path[:-len(".json")] + ".traces.jsonl" + COMPRESSIONS[compression]
+
+
+def write_slim_results(path: str, records: list):
+    """
+    슬림 레코드는 들여쓰기 없이 한 줄에 하나씩 씁니다. 내용은 여전히 JSON 배열입니다.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[\n" + ",\n".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) for r in records) + "\n]\n")
+
+
+def _open(path: str, mode: str):
+    """
+    확장자로 압축 방식을 고릅니다. zstd 는 선택 의존성(zstandard)이므로 쓸 때만 import 합니다.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=6)
+    if path.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError as e:
+            raise RuntimeError("zstd trace storage requires the 'zstandard' package (pip install zstandard)") from e
+        if mode == "w":
+            raw = zstandard.ZstdCompressor(level=3).stream_writer(open(path, "wb"))
+        else:
+            raw = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), read_across_frames=True)
+        return io.TextIOWrapper(raw, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class TraceStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._fh = _open(path, "w")
+        self._lock = threading.Lock()
+        self._blobs = set()
+        self.traces = 0
+        self.blob_refs = 0
+
+    def _dedupe(self, value, lines: list):
+        if isinstance(value, str) and len(value) >= BLOB_MIN_CHARS:
+            digest = hashlib.sha1(value.encode("utf-8")).hexdigest()
+            if digest not in self._blobs:
+                self._blobs.add(digest)
+                lines.append(json.dumps({"blob": digest, "value": value}, ensure_ascii=False))
+            self.blob_refs += 1
+            return {BLOB_KEY: digest}
+        if isinstance(value, dict):
+            return {key: self._dedupe(v, lines) for key, v in value.items()}
+        if isinstance(value, list):
+            return [self._dedupe(v, lines) for v in value]
+        return value
+
+    def add(self, trace_id, trace: dict):
+        """
+        트레이스 하나를 기록합니다. 처음 보는 긴 문자열은 blob 줄로 먼저 쓰고 트레이스에는 참조만 남깁니다.
+        """
+        with self._lock:
+            lines = []
+            body = self._dedupe(trace, lines)
+            lines.append(json.dumps({"trace": trace_id, "fields": body}, ensure_ascii=False))
+            self._fh.write("\n".join(lines) + "\n")
+            self.traces += 1
+
+    def slim(self, item: dict, input_keys) -> ItemResult:
+        """
+        처리가 끝난 항목을 슬림 레코드와 트레이스로 나눕니다. 입력 필드(input_keys)는 데이터셋에 있으므로 저장하지 않습니다.
+        """
+        route = item.get("route")
+        record = ItemResult(
+            id=item.get("id"),
+            prediction=item.get("prediction"),
+            latency=item.get("latency"),
+            tokens=item.get("tokens"),
+            route=route.get("route") if isinstance(route, dict) else None,
+            input_hash=item.get("input_hash"),
+            forced_finish=item.get("forced_finish"),
+        )
+        trace = {key: value for key, value in item.items() if key not in input_keys and key not in SLIM_FIELDS}
+        if trace:
+            self.add(record.id, trace)
+        return record
+
+    def stats(self) -> dict:
+        return {"traces": self.traces, "blobs": len(self._blobs), "blob_refs": self.blob_refs}
+
+    def close(self):
+        with self._lock:
+            self._fh.close()
+
+
+def _resolve(value, blobs: dict):
+    if isinstance(value, dict):
+        if set(value) == {BLOB_KEY}:
+            return blobs[value[BLOB_KEY]]
+        return {key: _resolve(v, blobs) for key, v in value.items()}
+    if isinstance(value, list):
+        return [_resolve(v, blobs) for v in value]
+    return value
+
+
+def iter_traces(path: str):
+    """
+    (trace_id, fields) 를 파일 순서대로 돌려줍니다. 참조는 원래 문자열로 복원됩니다.
+    """
+    blobs = {}
+    with _open(path, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if "blob" in entry:
+                blobs[entry["blob"]] = entry["value"]
+            else:
+                yield entry["trace"], _resolve(entry["fields"], blobs)
+
+
+def find_trace_file(results_path: str):
+    for compression in COMPRESSIONS:
+        path = trace_path(results_path, compression)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def expand(results_path: str, dataset: list) -> list:
+    """
+    슬림 결과 파일과 트레이스 파일, 데이터셋 입력을 합쳐 예전 형식의 전체 결과 항목 목록을 만듭니다.
+    같은 id 가 여러 번 나오면 순서대로 짝을 맞춥니다.
+    """
+    with open(results_path, "r", encoding="utf-8") as f:
+        records = json.load(f)
+    inputs, traces = {}, {}
+    for item in dataset:
+        inputs.setdefault(item.get("id"), []).append(item)
+    trace_file = find_trace_file(results_path)
+    if trace_file:
+        for trace_id, fields in iter_traces(trace_file):
+            traces.setdefault(trace_id, []).append(fields)
+
+    expanded = []
+    for record in records:
+        item_id = record.get("id")
+        item = dict(inputs[item_id].pop(0)) if inputs.get(item_id) else {"id": item_id}
+        if traces.get(item_id):
+            item.update(traces[item_id].pop(0))
+        item.update({key: value for key, value in record.items() if key != "route"})
+        expanded.append(item)
+    return expanded
+
+
+def main(argv=None) -> int:
+    from cot_or_react.tasks import DATA_DIR, load_dataset
+
+    parser = argparse.ArgumentParser(description="Inspect slim result files and their trace stores.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    expand_parser = sub.add_parser("expand", help="Rebuild full result records from a slim result file and its traces.")
+    expand_parser.add_argument('results', type=str, help="Slim result file, e.g. t3_react_results.json.")
+    expand_parser.add_argument('--task', type=str, default=None, help="Task whose dataset supplies the input fields (default: from the file name).")
+    expand_parser.add_argument('--data-dir', type=str, default=DATA_DIR, help="Directory containing T*_dataset.json.")
+    expand_parser.add_argument('--output', type=str, default=None, help="Where to write the full records (default: <results>.full.json).")
+    args = parser.parse_args(argv)
+
+    task = args.task or os.path.basename(args.results).split("_", 1)[0]
+    results = expand(args.results, load_dataset(task, args.data_dir))
+    output = args.output or args.results[:-len(".json")] + ".full.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"복원 완료: '{output}' (항목 {len(results)}개)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
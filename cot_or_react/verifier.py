@@ -0,0 +1,365 @@
+"""
+T3 ReAct 후보 날짜 목록의 로컬 검증기.
+
+요청문에서 정규식으로 뽑을 수 있는 규칙(개수, 제외 요일·주말, 특정 요일만, 공휴일 제외, 최소 간격, 시작일, 월 범위)만 모아
+Decider 가 돌려준 후보 목록을 검사합니다. 규칙을 만족하는 것만으로는 부족합니다(같은 목록을 한 주 미룬 것도 규칙은 다 지킴).
+그래서 뽑은 규칙을 제약 스키마로 옮겨 scheduler.Schedule 로 가장 이른 목록을 계산하고, 후보가 그 목록과 같을 때만 통과시킵니다.
+개수를 모르거나 모델링하지 않는 표현(짝수 날짜, N째 주, 우선 날짜, 이벤트 등)이 있으면 supported=False 로 두고 판단하지 않습니다.
+
+--react-verifier on 이면 Decider 가 continue 를 내도 검증된 목록이 있으면 그 턴에 바로 끝냅니다. 단, 데이터셋 보정(calibrate)에서
+expected 가 gold 와 충분히 맞은 제약 모양일 때만이고, 나머지는 shadow 처럼 기록만 합니다. shadow 면 판단만 기록해 Decider 가 finish 할 때까지 몇 턴이 더 걸렸는지(turns_saved)를 잽니다.
+"""
+import re
+from datetime import date, timedelta
+
+from cot_or_react.scheduler import WEEKDAY_NAMES, HolidayCalendar, Schedule, parse_date
+from cot_or_react.solver import add_months, solve
+
+
+VERIFIER_MODES = ("off", "shadow", "on")
+# on 모드 게이트: 데이터셋에서 이 비율 이상 expected == gold 였고 항목이 이만큼 있는 제약 모양에서만 루프를 일찍 끝냅니다.
+CALIBRATION_MIN_AGREEMENT = 0.9
+CALIBRATION_MIN_ITEMS = 5
+
+WEEKDAY_CHARS = "월화수목금토일"
+WEEKEND = {5, 6}
+
+# "월·수·금", "토요일/일요일" 처럼 구분자로 이어 쓴 요일(줄임 포함). 구분자가 없으면 "1월" 의 "월" 과 헷갈리므로 요일 하나짜리는 "요일" 까지 씁니다.
+_SHORT_RUN = r"[월화수목금토일](?:요일)?(?:\s*[·/]\s*[월화수목금토일](?:요일)?)+"
+_TERM = rf"(?:{_SHORT_RUN}|[월화수목금토일]요일|주말|공휴일|휴일)"
+_JOIN = r"\s*(?:와/과|과|와|및|,|·|/|또는|이나|그리고)\s*"
+_RUN = rf"{_TERM}(?:{_JOIN}{_TERM})*"
+_NEGATION = r"(?:제외|빼|피하|피해)"
+_EXCLUDED = re.compile(rf"({_RUN})\)?\s*(?:은\(는\)|이\(가\)|을\(를\)|은|는|이|가|을|를|도)?\s*{_NEGATION}")
+_ONLY = re.compile(rf"(?:(매주|격주로?|모든|\d+주마다)\s*)?\(?({_RUN})\)?\s*(만|에만|에|인\s*날(?:짜)?만)?")
+_WEEKDAY = re.compile(rf"{_SHORT_RUN}|[월화수목금토일]요일")
+_COUNT = re.compile(r"(\d+)\s*(?:개(?!월)|번(?!째)|회)")
+_INTERVAL_DAYS = re.compile(r"(?<!기준\s)(\d+)\s*일\s*간격")
+_INTERVAL_BUSINESS = re.compile(r"영업일\s*기준\s*(\d+)\s*일\s*간격")
+_INTERVAL_WEEKS = re.compile(r"(\d+)\s*주\s*(?:간격|마다)")
+_INTERVAL_MONTHS = re.compile(r"(\d+)\s*(?:달|개월)\s*간격")
+_START = re.compile(r"^(.+?)(?:부터|이후)")
+# 달 하나를 범위로 정하는 표현. 뒤에 날짜(5일, 첫째 주, 말일 등)가 오면 범위가 아니라 시작일이므로 건너뜁니다.
+_MONTH_SCOPE = re.compile(
+    r"(이번\s*달|다음\s*달|지난\s*달|(?:(\d{4})년|(내년|올해|작년|다음\s*해))\s*(\d{1,2})월)"
+    r"(?:\s*(?:중에서|중에|중|에|의|동안|전체))*(?!\s*(?:\d+\s*일|첫|둘째|셋째|넷째|마지막|말|초|중순|하순))"
+)
+_YEAR_OFFSETS = {"내년": 1, "다음해": 1, "올해": 0, "작년": -1}
+# 검증기가 모델링하지 않는 규칙의 표지. 하나라도 있으면 판단하지 않습니다.
+_UNSUPPORTED = re.compile(
+    r"짝수|홀수|끝자리|끝나는|로\s*끝|배수|주차|째\s*주|번째|마지막|우선|옮겨|말일|첫날|보름|분기|사이|이전에|까지|"
+    r"\d+\s*일\s*(?:과|와|,)|공휴일이면|휴일이면|쉬는 날|다음 평일|이전 평일"
+)
+_HOLIDAYS_EXCLUDED = re.compile(
+    rf"공휴일\s*(?:은|는|도)?\s*{_NEGATION}|공휴일이\s*아닌|공휴일\s*(?:을|은|이)?\s*(?:포함|넣)\S*\s*안\s*(?:됩|돼|되)"
+)
+_HOLIDAYS_INCLUDED = re.compile(r"공휴일\s*(?:포함|상관)(?!\S*\s*안\s*(?:됩|돼|되))")
+# 풀지 못하면 판단을 포기해야 하는 표현들: 날짜 범위·시작점, 그리고 부정(제외·회피).
+_SCOPE_TOKEN = re.compile(
+    r"\d{4}\s*년|\d{1,2}\s*월|\d+\s*일(?!\s*간격)|이번|다음|지난|다다음|내년|올해|작년|재작년|오늘|내일|모레|글피|어제|그제|그저께|"
+    r"이틀|사흘|나흘|닷새|열흘|\d+\s*(?:주|달|개월|년)\s*(?:전|후|뒤)"
+)
+_NEGATION_TOKEN = re.compile(r"제외|빼|피하|피해|아닌|말고|안\s*(?:됩|돼|되)")
+
+
+def _weekdays(run: str) -> set:
+    days = set()
+    for match in _WEEKDAY.finditer(run):
+        days |= {WEEKDAY_CHARS.index(ch) for ch in re.findall(r"([월화수목금토일])(?:요일)?", match.group(0))}
+    return days
+
+
+def _month_range(match, anchor: date) -> tuple:
+    scope = re.sub(r"\s+", "", match.group(1))
+    if match.group(2):
+        first = date(int(match.group(2)), int(match.group(4)), 1)
+    elif match.group(3):
+        first = date(anchor.year + _YEAR_OFFSETS[re.sub(r"\s+", "", match.group(3))], int(match.group(4)), 1)
+    else:
+        first = add_months(anchor.replace(day=1), {"이번달": 0, "다음달": 1, "지난달": -1}[scope])
+    return first, add_months(first, 1) - timedelta(days=1)
+
+
+def _covered(span: tuple, spans: list) -> bool:
+    return any(a <= span[0] and span[1] <= b for a, b in spans)
+
+
+def parse_rules(input_text: str, anchor_date: str) -> dict:
+    """
+    요청문에서 검사할 수 있는 규칙을 뽑습니다. 값이 None 인 규칙은 요청에 없거나 해석하지 못한 것입니다.
+    범위·시작점, 요일, 제외 표현 가운데 규칙으로 옮기지 못한 것이 남으면 supported=False 입니다(잘못 읽은 규칙으로
+    목록을 통과시키느니 판단하지 않습니다).
+    """
+    text = input_text or ""
+    anchor = parse_date(anchor_date)
+    rules = {
+        "count": None, "exclude_weekdays": set(), "only_weekdays": set(), "exclude_holidays": False,
+        "min_gap": None, "interval": None, "start": None, "range": None, "supported": anchor is not None, "reason": None,
+    }
+    if anchor is None:
+        rules["reason"] = "anchor_date"
+        return rules
+    # 규칙으로 옮긴 표현의 위치. 범위·요일·부정 표현이 이 밖에 남으면 다 읽지 못한 것입니다.
+    consumed = []
+
+    for match in _EXCLUDED.finditer(text):
+        run = match.group(1)
+        rules["exclude_weekdays"] |= _weekdays(run)
+        if "주말" in run:
+            rules["exclude_weekdays"] |= WEEKEND
+        if "휴일" in run:
+            rules["exclude_holidays"] = True
+        consumed.append(match.span())
+    for match in re.finditer(r"평일만|영업일", text):
+        rules["exclude_weekdays"] |= WEEKEND
+        consumed.append(match.span())
+    for match in _HOLIDAYS_EXCLUDED.finditer(text):
+        rules["exclude_holidays"] = True
+        consumed.append(match.span())
+    if not rules["exclude_holidays"] and _HOLIDAYS_INCLUDED.search(text):
+        rules["exclude_holidays"] = False
+    excluded_spans = [match.span(1) for match in _EXCLUDED.finditer(text)]
+    for match in _ONLY.finditer(text):
+        if not (match.group(1) or match.group(3)) or any(a <= match.start(2) < b for a, b in excluded_spans):
+            continue
+        if text[match.end():match.end() + 2].startswith(("부터", "이후")):
+            continue
+        rules["only_weekdays"] |= _weekdays(match.group(2))
+        consumed.append(match.span())
+
+    count = _COUNT.search(text)
+    if count:
+        rules["count"] = int(count.group(1))
+    # (최소 간격 일수, (단위, 수)). 달 간격은 가장 짧은 달 기준 28일, 영업일 간격은 달력으로 최소 N 일입니다.
+    intervals = [(int(m.group(1)), ("days", int(m.group(1)))) for m in _INTERVAL_DAYS.finditer(text)]
+    intervals += [(int(m.group(1)), ("business_days", int(m.group(1)))) for m in _INTERVAL_BUSINESS.finditer(text)]
+    intervals += [(7 * int(m.group(1)), ("weeks", int(m.group(1)))) for m in _INTERVAL_WEEKS.finditer(text)]
+    intervals += [(28 * int(m.group(1)), ("months", int(m.group(1)))) for m in _INTERVAL_MONTHS.finditer(text)]
+    if "격주" in text:
+        intervals.append((14, ("weeks", 2)))
+    if intervals:
+        rules["min_gap"], rules["interval"] = max(intervals)
+    for pattern in (_INTERVAL_DAYS, _INTERVAL_BUSINESS, _INTERVAL_WEEKS):
+        consumed += [match.span() for match in pattern.finditer(text)]
+
+    start = _START.match(text)
+    if start:
+        resolved = solve(start.group(1).strip(" ,"), anchor.isoformat())
+        rules["start"] = parse_date(resolved) if isinstance(resolved, str) else None
+        if rules["start"] is None:
+            rules["supported"], rules["reason"] = False, "start"
+        consumed.append(start.span())
+    for scope in _MONTH_SCOPE.finditer(text):
+        if start and scope.start() < start.end():
+            continue
+        if rules["range"] is not None:
+            rules["supported"], rules["reason"] = False, "scope"
+            break
+        rules["range"] = _month_range(scope, anchor)
+        consumed.append(scope.span())
+
+    if rules["count"] is None and rules["supported"]:
+        rules["supported"], rules["reason"] = False, "count"
+    unsupported = _UNSUPPORTED.search(text)
+    if unsupported and rules["supported"]:
+        rules["supported"], rules["reason"] = False, unsupported.group(0)
+    for reason, pattern in (("scope", _SCOPE_TOKEN), ("weekday", _WEEKDAY), ("negation", _NEGATION_TOKEN)):
+        leftover = next((m for m in pattern.finditer(text) if not _covered(m.span(), consumed)), None)
+        if leftover and rules["supported"]:
+            rules["supported"], rules["reason"] = False, f"{reason}: {leftover.group(0)}"
+    return rules
+
+
+def schedule_constraints(rules: dict) -> dict:
+    """
+    parse_rules 의 규칙을 데이터셋 constraints 스키마로 옮깁니다. 주 간격은 요일이 정해져 있을 때만 interval_weeks 이고,
+    아니면 시작일에서 7k 일씩입니다.
+    """
+    constraints = {"min_count": rules["count"], "exclude_holidays": rules["exclude_holidays"]}
+    if rules["exclude_weekdays"]:
+        constraints["exclude_weekdays"] = [WEEKDAY_NAMES[k] for k in sorted(rules["exclude_weekdays"])]
+    if rules["only_weekdays"]:
+        constraints["specific_weekdays"] = [WEEKDAY_NAMES[k] for k in sorted(rules["only_weekdays"])]
+    if rules["start"]:
+        constraints["start_date"] = rules["start"].isoformat()
+    if rules["range"]:
+        constraints["date_range"] = [day.isoformat() for day in rules["range"]]
+    unit, n = rules["interval"] or (None, None)
+    if unit == "months":
+        constraints["interval_months"] = n
+    elif unit == "business_days":
+        constraints["interval_business_days"] = n
+    elif unit == "weeks" and rules["only_weekdays"]:
+        constraints["interval_weeks"] = n
+    elif unit:
+        constraints["interval_days"] = n if unit == "days" else 7 * n
+    return constraints
+
+
+def signature(rules: dict) -> str:
+    """
+    규칙의 제약 모양: schedule_constraints 에서 값이 있는 키를 정렬해 '+' 로 이은 것. 보정(calibrate)의 단위입니다.
+    """
+    constraints = schedule_constraints(rules)
+    return "+".join(sorted(key for key, value in constraints.items() if value not in (None, False, [])))
+
+
+def calibrate(items, holidays=None) -> dict:
+    """
+    정답이 있는 데이터셋 항목으로 검증기를 보정합니다. supported 로 판단한 항목마다 expected 가 gold_standard 와
+    같은지 제약 모양별로 세고, 일치율과 항목 수가 기준을 넘은 모양을 trusted 로 돌려줍니다.
+    """
+    holidays = holidays or HolidayCalendar()
+    signatures = {}
+    for item in items:
+        verifier = ScheduleVerifier(item.get("input_text"), item.get("anchor_date"), holidays)
+        if not verifier.supported:
+            continue
+        expected = verifier.expected
+        if not verifier.supported:
+            continue
+        gold = item.get("gold_standard")
+        entry = signatures.setdefault(signature(verifier.rules), {"items": 0, "agreed": 0})
+        entry["items"] += 1
+        entry["agreed"] += isinstance(gold, list) and sorted(str(value) for value in gold) == expected
+    trusted = sorted(
+        key for key, entry in signatures.items()
+        if entry["items"] >= CALIBRATION_MIN_ITEMS and entry["agreed"] >= CALIBRATION_MIN_AGREEMENT * entry["items"]
+    )
+    return {
+        "items": sum(entry["items"] for entry in signatures.values()),
+        "agreed": sum(entry["agreed"] for entry in signatures.values()),
+        "signatures": signatures,
+        "trusted": trusted,
+    }
+
+
+class ScheduleVerifier:
+    """
+    항목 하나의 검증기. violations() 는 어긴 규칙 목록을, check() 는 턴별 판단을 기록하고 통과 여부를 돌려줍니다.
+    check() 는 규칙을 다 지키고 Schedule 이 계산한 가장 이른 목록(expected)과 같아야 통과입니다.
+    trusted 는 calibrate() 가 믿을 만하다고 본 제약 모양들로, on 모드에서 루프를 끝내도 되는지(may_finish)를 정합니다.
+    """
+
+    def __init__(self, input_text: str, anchor_date: str, holidays=None, mode: str = "on", trusted=()):
+        self.rules = parse_rules(input_text, anchor_date)
+        self.anchor_date = anchor_date
+        self.holidays = holidays
+        self.mode = mode
+        self.trusted = frozenset(trusted or ())
+        self.checks = []
+        self.verified_turn = None
+        self.verified_dates = None
+        self._expected = None
+
+    @property
+    def supported(self) -> bool:
+        return self.rules["supported"]
+
+    @property
+    def expected(self) -> list:
+        """
+        규칙으로 계산한 가장 이른 목록(YYYY-MM-DD). 첫 check() 때 한 번 계산합니다(공휴일 조회가 필요할 수 있음).
+        Schedule 이 다루지 못한 제약이 남으면 항목을 supported=False 로 돌립니다.
+        """
+        if self._expected is None:
+            schedule = Schedule(schedule_constraints(self.rules), self.anchor_date, self.holidays or HolidayCalendar())
+            self._expected = schedule.dates()
+            if schedule.unsupported:
+                self.rules["supported"] = False
+                self.rules["reason"] = "schedule: " + ", ".join(schedule.unsupported)
+        return self._expected
+
+    @property
+    def may_finish(self) -> bool:
+        """
+        on 모드이고, 이 항목의 제약 모양이 데이터셋 보정에서 gold 와 충분히 맞았을 때만 검증된 목록으로 루프를 끝냅니다.
+        """
+        return self.mode == "on" and self.supported and signature(self.rules) in self.trusted
+
+    def violations(self, dates) -> list:
+        """
+        후보 목록이 어긴 규칙 이름들. 빈 목록이면 통과입니다.
+        """
+        rules = self.rules
+        if not isinstance(dates, list) or not dates:
+            return ["format"]
+        days = [parse_date(value) if isinstance(value, str) else None for value in dates]
+        if None in days:
+            return ["format"]
+        days = sorted(days)
+        failed = []
+        if len(set(days)) != len(days):
+            failed.append("duplicate")
+        if rules["count"] is not None and len(set(days)) != rules["count"]:
+            failed.append("count")
+        if any(day.weekday() in rules["exclude_weekdays"] for day in days):
+            failed.append("exclude_weekdays")
+        if rules["only_weekdays"] and any(day.weekday() not in rules["only_weekdays"] for day in days):
+            failed.append("only_weekdays")
+        if rules["exclude_holidays"] and self.holidays is not None and any(day in self.holidays for day in days):
+            failed.append("holidays")
+        if rules["min_gap"] and any((b - a).days < rules["min_gap"] for a, b in zip(days, days[1:])):
+            failed.append("interval")
+        if rules["start"] and days[0] < rules["start"]:
+            failed.append("start")
+        if rules["range"] and (days[0] < rules["range"][0] or days[-1] > rules["range"][1]):
+            failed.append("range")
+        return failed
+
+    def check(self, dates, turn: int) -> bool:
+        """
+        turn 의 후보 목록을 검사해 기록합니다. 규칙을 다 모델링하지 못한 항목은 항상 False 입니다.
+        """
+        if not self.supported:
+            return False
+        failed = self.violations(dates)
+        if not failed and sorted(parse_date(value).isoformat() for value in dates) != self.expected:
+            failed.append("not_earliest")
+        if not self.supported:
+            return False
+        self.checks.append({"turn": turn, "verified": not failed, "failed": failed})
+        if not failed and self.verified_turn is None:
+            self.verified_turn = turn
+            self.verified_dates = sorted(dates)
+        return not failed
+
+    def summary(self, finish_turn: int = None, final_dates=None, early: bool = False) -> dict:
+        """
+        항목의 react_verifier 필드. Decider 가 끝낸 목록이 처음 검증된 목록과 같으면 두 턴의 차이를 turns_saved 로 남깁니다.
+        on 모드에서 검증기로 끝낸 항목은 Decider 의 종료 턴을 알 수 없으므로 early_finish 만 남깁니다.
+        """
+        block = {"mode": self.mode, "supported": self.supported, "verified_turn": self.verified_turn, "early_finish": early}
+        if not self.supported:
+            block["reason"] = self.rules["reason"]
+            return block
+        block["signature"] = signature(self.rules)
+        if self.mode == "on":
+            block["trusted"] = block["signature"] in self.trusted
+        block["checks"] = self.checks
+        if not early and self.verified_turn is not None and finish_turn is not None and isinstance(final_dates, list):
+            same = sorted(final_dates) == self.verified_dates
+            block["agreed"] = same
+            block["turns_saved"] = finish_turn - self.verified_turn if same else 0
+        return block
+
+
+def verifier_summary(blocks: list) -> dict:
+    """
+    실행 요약의 verifier 블록. early_finishes 는 on 모드에서 검증기로 끝낸 항목 수(항목마다 적어도 한 턴 절약),
+    untrusted 는 on 모드지만 보정을 통과하지 못한 제약 모양이라 일찍 끝내지 않은 항목 수,
+    turns_saved 는 shadow 모드에서 Decider 가 같은 목록으로 끝내기까지 더 쓴 턴 수의 합입니다.
+    """
+    supported = [b for b in blocks if b.get("supported")]
+    return {
+        "mode": blocks[0]["mode"] if blocks else None,
+        "items": len(blocks),
+        "supported": len(supported),
+        "verified": sum(1 for b in supported if b.get("verified_turn") is not None),
+        "early_finishes": sum(1 for b in supported if b.get("early_finish")),
+        "untrusted": sum(1 for b in supported if b.get("trusted") is False),
+        "rejected_checks": sum(1 for b in supported for check in b.get("checks", ()) if not check["verified"]),
+        "agreed": sum(1 for b in supported if b.get("agreed")),
+        "disagreed": sum(1 for b in supported if b.get("agreed") is False),
+        "turns_saved": sum(b.get("turns_saved") or 0 for b in supported),
+    }
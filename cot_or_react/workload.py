@@ -0,0 +1,533 @@
+"""
+T1/T2/T3 합성 부하 생성기.
+
+데이터셋은 Task 마다 500개 정도라 캐시 적중률, 동시 호출 상한, 메모리 증가를 실제 부하 규모에서 보기 어렵습니다.
+여기서는 기존 데이터셋의 분포를 따라 항목을 원하는 만큼 만들어 JSONL 로 흘려 씁니다.
+
+- T1: temporal_pattern 별 한국어 표현 틀(다음 주 금요일, 3달 뒤 첫날, 지난 달 두 번째 화요일 ...)을
+  데이터셋의 temporal_pattern 빈도로 고르고, 정답은 앵커 날짜로 직접 계산합니다.
+- T2: T2 문장에서 같은 id 의 T1 표현을 뺀 문장 틀("{expression} 날짜 좀 알려줘")에 T1 항목을 끼워 넣습니다.
+- T3: 데이터셋 constraints 의 키 조합과 키별 값 분포에서 제약을 뽑아 한국어 요청문으로 쓰고, 정답은 scheduler 로 계산합니다
+  (공휴일은 이벤트 KB). 앵커는 KB 공휴일 표가 채워진 연도로 자르고, 정답이 그 밖의 연도에 걸치는 항목은 다시 뽑습니다.
+
+항목마다 (seed, task, 순번) 으로 난수를 따로 만들므로 같은 seed 면 몇 번째 항목이든 같은 내용이 나오고,
+--start 로 나눠 만든 파일을 이어 붙여도 한 번에 만든 것과 같습니다. 만든 파일은 --data-dir 로 실행기에 그대로 넘길 수 있습니다.
+
+    python -m cot_or_react.workload --task t1 t2 t3 --count 1000000 --seed 7 --output-dir data/synthetic
+    python -m cot_or_react --task t1 --method cot --data-dir data/synthetic
+"""
+import argparse
+import calendar
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+from cot_or_react.scheduler import WEEKDAY_NAMES, HolidayCalendar, Schedule
+from cot_or_react.solver import FIXED_DAYS, NATIVE_NUMBERS, TEMPORAL_RESIDUE, add_months
+from cot_or_react.tasks import DATA_DIR, TASKS, load_dataset
+
+
+WEEKDAY_CHARS = "월화수목금토일"
+ORDINALS = ("첫", "두", "세", "네")
+DIRECTIONS = (("전", -1), ("뒤", 1), ("후", 1))
+
+
+def _monday(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    first = date(year, month, 1)
+    return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def _last_weekday(year: int, month: int, weekday: int) -> date:
+    last = date(year, month, calendar.monthrange(year, month)[1])
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _month_end(day: date) -> date:
+    return day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+
+# --- T1 표현 틀 ------------------------------------------------------------------------
+# temporal_pattern -> (rng, 앵커) 를 받아 (표현, 정답 날짜) 를 돌려주는 함수.
+
+def _fixed(word):
+    return lambda r, a: (word, a + timedelta(days=FIXED_DAYS[word]))
+
+
+def _week_weekday(prefixes, offset):
+    def make(r, a):
+        wd = r.randrange(7)
+        return f"{r.choice(prefixes)} {WEEKDAY_CHARS[wd]}요일", _monday(a) + timedelta(weeks=offset, days=wd)
+    return make
+
+
+def _duration(unit_words, max_n, step):
+    def make(r, a):
+        n = r.randint(1, max_n)
+        word, sign = r.choice(DIRECTIONS)
+        return f"{n}{r.choice(unit_words)} {word}", step(a, sign * n)
+    return make
+
+
+def _duration_weekday(r, a):
+    n, wd = r.randint(1, 8), r.randrange(7)
+    word, sign = r.choice(DIRECTIONS)
+    return f"{n}주 {word} {WEEKDAY_CHARS[wd]}요일", _monday(a + timedelta(weeks=sign * n)) + timedelta(days=wd)
+
+
+def _native(r, a):
+    word = r.choice(sorted(NATIVE_NUMBERS))
+    direction, sign = r.choice(DIRECTIONS)
+    return f"{word} {direction}", a + timedelta(days=sign * NATIVE_NUMBERS[word])
+
+
+def _month_nth_weekday(prefixes, offset):
+    def make(r, a):
+        month, n, wd = add_months(a.replace(day=1), offset), r.randint(1, 4), r.randrange(7)
+        text = f"{r.choice(prefixes)} {ORDINALS[n - 1]} 번째 {WEEKDAY_CHARS[wd]}요일"
+        return text, _nth_weekday(month.year, month.month, wd, n)
+    return make
+
+
+def _month_last_weekday(prefixes, offset):
+    def make(r, a):
+        month, wd = add_months(a.replace(day=1), offset), r.randrange(7)
+        text = f"{r.choice(prefixes)} 마지막{r.choice(('', ' 주'))} {WEEKDAY_CHARS[wd]}요일"
+        return text, _last_weekday(month.year, month.month, wd)
+    return make
+
+
+def _month_date(prefixes, offset):
+    def make(r, a):
+        day = r.randint(1, 28)
+        return f"{r.choice(prefixes)} {day}일", add_months(a.replace(day=1), offset).replace(day=day)
+    return make
+
+
+def _month_edge(prefixes, offset, end):
+    def make(r, a):
+        month = add_months(a.replace(day=1), offset)
+        if end:
+            return f"{r.choice(prefixes)} {r.choice(('마지막 날', '말일'))}", _month_end(month)
+        return f"{r.choice(prefixes)} 첫날", month
+    return make
+
+
+def _duration_month_edge(end):
+    def make(r, a):
+        n = r.randint(1, 12)
+        word, sign = r.choice(DIRECTIONS)
+        month = add_months(a.replace(day=1), sign * n)
+        unit = r.choice(("달", "개월"))
+        return (f"{n}{unit} {word} 마지막 날", _month_end(month)) if end else (f"{n}{unit} {word} 첫날", month)
+    return make
+
+
+def _year_edge(word, offset, end):
+    return lambda r, a: (f"{word} {'마지막 날' if end else '첫날'}", date(a.year + offset, 12, 31) if end else date(a.year + offset, 1, 1))
+
+
+def _same_day_year(r, a):
+    word, offset = r.choice((("작년", -1), ("내년", 1), ("재작년", -2)))
+    return f"{word} 같은 날", add_months(a, 12 * offset)
+
+
+def _weekend(prefix, offset, last):
+    return lambda r, a: (f"{prefix} 주말 {'마지막' if last else '첫째'} 날", _monday(a) + timedelta(weeks=offset, days=6 if last else 5))
+
+
+def _quarter_nth_weekday(r, a):
+    quarter_start = date(a.year, 3 * ((a.month - 1) // 3) + 1, 1)
+    month, n, wd = add_months(quarter_start, 3), r.randint(1, 4), r.randrange(7)
+    return f"다음 분기 {ORDINALS[n - 1]} 번째 {WEEKDAY_CHARS[wd]}요일", _nth_weekday(month.year, month.month, wd, n)
+
+
+def _last_quarter_last_weekday(r, a):
+    quarter_start = date(a.year, 3 * ((a.month - 1) // 3) + 1, 1)
+    month, wd = add_months(quarter_start, -1), r.randrange(7)
+    return f"지난 분기 마지막 {WEEKDAY_CHARS[wd]}요일", _last_weekday(month.year, month.month, wd)
+
+
+T1_PATTERNS = {
+    "today": _fixed("오늘"),
+    "yesterday": _fixed("어제"),
+    "tomorrow": _fixed("내일"),
+    "day_after_tomorrow": _fixed("모레"),
+    "day_before_yesterday": _fixed("그저께"),
+    "next_weekday": _week_weekday(("다음 주", "다음주"), 1),
+    "last_weekday": _week_weekday(("지난주", "지난 주"), -1),
+    "this_weekday": _week_weekday(("이번 주",), 0),
+    "duration_day": _duration(("일",), 30, lambda a, n: a + timedelta(days=n)),
+    "duration_week": _duration(("주",), 8, lambda a, n: a + timedelta(weeks=n)),
+    "duration_month": _duration(("달", "개월"), 12, add_months),
+    "duration_year": _duration(("년",), 5, lambda a, n: add_months(a, 12 * n)),
+    "duration_weekday": _duration_weekday,
+    "korean_days": _native,
+    "next_month_nth_weekday": _month_nth_weekday(("다음 달",), 1),
+    "last_month_nth_weekday": _month_nth_weekday(("지난 달", "지난달"), -1),
+    "next_month_last_weekday": _month_last_weekday(("다음 달",), 1),
+    "last_month_last_weekday": _month_last_weekday(("지난 달",), -1),
+    "next_month_date": _month_date(("다음 달",), 1),
+    "last_month_date": _month_date(("지난 달",), -1),
+    "next_month_start": _month_edge(("다음 달",), 1, False),
+    "last_month_start": _month_edge(("지난 달",), -1, False),
+    "this_month_start": _month_edge(("이번 달",), 0, False),
+    "next_month_end": _month_edge(("다음 달",), 1, True),
+    "last_month_end": _month_edge(("지난 달",), -1, True),
+    "this_month_end": _month_edge(("이번 달",), 0, True),
+    "duration_month_start": _duration_month_edge(False),
+    "duration_month_end": _duration_month_edge(True),
+    "next_year_start": _year_edge("내년", 1, False),
+    "last_year_start": _year_edge("작년", -1, False),
+    "last_year_end": _year_edge("작년", -1, True),
+    "year_end": _year_edge("올해", 0, True),
+    "relative_year": _same_day_year,
+    "this_weekend_start": _weekend("이번", 0, False),
+    "next_weekend_start": _weekend("다음 주", 1, False),
+    "last_weekend_end": _weekend("지난주", -1, True),
+    "next_quarter_nth_weekday": _quarter_nth_weekday,
+    "last_quarter_last_weekday": _last_quarter_last_weekday,
+}
+
+
+# --- T2 문장 틀 ----------------------------------------------------------------------
+# 표현 바로 뒤의 조사는 표현의 마지막 글자 받침에 맞춰 바꿉니다. (받침 있을 때, 없을 때)
+PARTICLES = (("이면", "면"), ("이", "가"), ("은", "는"), ("을", "를"), ("과", "와"))
+
+
+def _has_final_consonant(text: str) -> bool:
+    last = text.rstrip()[-1:]
+    if "가" <= last <= "힣":
+        return (ord(last) - ord("가")) % 28 != 0
+    return last in "013678"
+
+
+def _wrapper(template: str):
+    """
+    '{expression}이 언제야?' 를 ('', ('이', '가'), ' 언제야?') 로 나눕니다. 표현 뒤에 다른 글자가 바로 붙는 틀은 버립니다.
+    """
+    head, _, tail = template.partition("{expression}")
+    if not tail or not "가" <= tail[0] <= "힣":
+        return head, None, tail
+    for pair in PARTICLES:
+        for particle in pair:
+            rest = tail[len(particle):]
+            if tail.startswith(particle) and (not rest or rest[0] in " ?!.,"):
+                return head, pair, rest
+    if tail[0] in "에의":
+        return head, None, tail
+    return None
+
+
+def _wrap(wrapper: tuple, expression: str) -> str:
+    head, pair, tail = wrapper
+    particle = "" if pair is None else pair[0] if _has_final_consonant(expression) else pair[1]
+    return head + expression + particle + tail
+
+
+# --- T3 제약 -----------------------------------------------------------------------
+# 데이터셋에서 같은 뜻으로 쓰인 키는 scheduler 의 대표 키로 모읍니다.
+T3_KEY_ALIASES = {"interval": "interval_days", "specific_weekdays_exclude": "exclude_weekdays", "adjust_for_holidays": "adjust_if_holiday"}
+T3_VALUE_KEYS = ("interval_days", "interval_business_days", "interval_weeks", "interval_months", "min_count", "date_pattern", "week_numbers")
+T3_DROPPED_KEYS = ("fallback_strategy",)   # preferred_dates 와 함께 만듭니다.
+
+
+def _active_keys(constraints: dict) -> tuple:
+    keys = {T3_KEY_ALIASES.get(key, key) for key, value in constraints.items() if value not in (None, False, 0, "", [])}
+    return tuple(sorted(keys - set(T3_DROPPED_KEYS)))
+
+
+def _korean_list(words: list, particle: str = "과") -> str:
+    if len(words) == 1:
+        return words[0]
+    return ", ".join(words[:-1]) + f"{particle} " + words[-1]
+
+
+def _weekday_words(names: list) -> list:
+    return [f"{WEEKDAY_CHARS[WEEKDAY_NAMES.index(name)]}요일" for name in names]
+
+
+def _korean_date(day: date, anchor: date) -> str:
+    return f"{day.month}월 {day.day}일" if day.year == anchor.year else f"{day.year}년 {day.month}월 {day.day}일"
+
+
+def _sentence(parts: list) -> str:
+    """
+    요청문 조각을 잇습니다. '~의', '~중' 처럼 뒤 조각을 꾸미는 조각 뒤에는 쉼표를 넣지 않습니다.
+    """
+    text = parts[0]
+    for previous, part in zip(parts, parts[1:]):
+        text += (" " if previous.endswith(("의", "중", "에")) or part == parts[-1] and len(parts) == 2 else ", ") + part
+    return text
+
+
+def _pattern_words(pattern: str) -> str:
+    if pattern == "odd_day":
+        return "홀수 날짜"
+    if pattern == "even_day":
+        return "짝수 날짜"
+    if pattern == "prime_number":
+        return "일자가 소수인 날짜"
+    if pattern.startswith("multiple_of_"):
+        return f"일자가 {pattern.rsplit('_', 1)[1]}의 배수인 날짜"
+    if pattern.startswith("ends_with_"):
+        digits = pattern[len("ends_with_"):].split("_or_")
+        # 영·삼·육 뒤에는 '으로', 나머지 숫자 뒤에는 '로'.
+        particle = "으로" if digits[-1] in ("0", "3", "6") else "로"
+        return f"일자가 {' 또는 '.join(digits)}{particle} 끝나는 날짜"
+    days = [part.rstrip("stndrh") for part in pattern.split("_and_")]
+    return f"매달 {'일과 '.join(days)}일"
+
+
+class WorkloadGenerator:
+    """
+    데이터셋 분포를 읽어 두고 task 별 항목을 순번으로 만듭니다. item(task, i) 는 seed 와 i 만으로 정해집니다.
+    """
+
+    def __init__(self, seed: int = 0, data_dir: str = DATA_DIR):
+        self.seed = seed
+        self.holidays = HolidayCalendar()
+        t1 = load_dataset("t1", data_dir)
+        t2 = load_dataset("t2", data_dir)
+        t3 = load_dataset("t3", data_dir)
+
+        patterns = Counter(item.get("metadata", {}).get("temporal_pattern") for item in t1)
+        self.t1_patterns = sorted(T1_PATTERNS)
+        self.t1_weights = [patterns.get(name, 0) or 1 for name in self.t1_patterns]
+        complexity = {}
+        for item in t1:
+            metadata = item.get("metadata", {})
+            complexity.setdefault(metadata.get("temporal_pattern"), Counter())[metadata.get("complexity")] += 1
+        self.complexity = {name: counts.most_common(1)[0][0] for name, counts in complexity.items()}
+
+        # T2 문장 틀: 같은 id 의 T1 표현이 그대로 들어 있고, 표현을 빼면 다른 시간 표현("오늘" 등)이 남지 않는 문장만 씁니다.
+        expressions = {item["id"]: item["input_text"] for item in t1}
+        wrappers = {
+            item["input_text"].replace(expressions[item["id"]], "{expression}", 1)
+            for item in t2 if item.get("id") in expressions and expressions[item["id"]] in item["input_text"]
+        }
+        self.t2_wrappers = sorted(filter(None, (
+            _wrapper(wrapper) for wrapper in wrappers
+            if not TEMPORAL_RESIDUE.search(wrapper.replace("{expression}", "")) and not any(word in wrapper for word in FIXED_DAYS)
+        )), key=str)
+
+        self.t3_signatures = Counter(_active_keys(item.get("constraints") or {}) for item in t3 if item.get("constraints"))
+        self.t3_values = {key: Counter() for key in T3_VALUE_KEYS}
+        for item in t3:
+            for key, value in (item.get("constraints") or {}).items():
+                key = T3_KEY_ALIASES.get(key, key)
+                if key in self.t3_values and value not in (None, False, 0, "", []):
+                    self.t3_values[key][json.dumps(value)] += 1
+
+        anchors = [date.fromisoformat(item["anchor_date"]) for item in t1 + t3 if item.get("anchor_date")]
+        self.anchor_span = (min(anchors).toordinal(), max(anchors).toordinal())
+        # T3 정답은 공휴일 표에 기대므로 앵커를 표가 채워진 연도 안으로 줄입니다.
+        known = [year for year in range(min(anchors).year, max(anchors).year + 1) if self.holidays.complete(year)]
+        if not known:
+            raise ValueError("the holiday table covers none of the dataset anchor years")
+        self.t3_anchor_span = (
+            max(self.anchor_span[0], date(known[0], 1, 1).toordinal()),
+            min(self.anchor_span[1], date(known[-1], 12, 31).toordinal()),
+        )
+
+    def _rng(self, task: str, i: int) -> random.Random:
+        return random.Random(f"{self.seed}:{task}:{i}")
+
+    def _anchor(self, r: random.Random, span: tuple = None) -> date:
+        return date.fromordinal(r.randint(*(span or self.anchor_span)))
+
+    def _holidays_known(self, anchor: date, gold: list) -> bool:
+        last = date.fromisoformat(gold[-1]).year if gold else anchor.year
+        return all(self.holidays.complete(year) for year in range(anchor.year, last + 1))
+
+    def _value(self, r: random.Random, key: str):
+        values = self.t3_values[key]
+        return json.loads(r.choices(list(values), weights=list(values.values()))[0])
+
+    def item(self, task: str, i: int) -> dict:
+        return getattr(self, f"_{task}")(self._rng(task, i), i)
+
+    def items(self, task: str, count: int, start: int = 0):
+        for i in range(start, start + count):
+            yield self.item(task, i)
+
+    # --- T1 / T2 ---------------------------------------------------------------
+
+    def _expression(self, r: random.Random) -> tuple:
+        pattern = r.choices(self.t1_patterns, weights=self.t1_weights)[0]
+        anchor = self._anchor(r)
+        text, gold = T1_PATTERNS[pattern](r, anchor)
+        return pattern, anchor, text, gold
+
+    def _t1(self, r: random.Random, i: int) -> dict:
+        pattern, anchor, text, gold = self._expression(r)
+        return {
+            "id": f"S1_{i + 1:07d}", "task": "T1", "input_text": text, "anchor_date": anchor.isoformat(),
+            "gold_standard": gold.isoformat(),
+            "metadata": {"complexity": self.complexity.get(pattern, "low"), "temporal_pattern": pattern, "synthetic": True},
+        }
+
+    def _t2(self, r: random.Random, i: int) -> dict:
+        pattern, anchor, text, gold = self._expression(r)
+        return {
+            "id": f"S2_{i + 1:07d}", "task": "T2", "input_text": _wrap(r.choice(self.t2_wrappers), text),
+            "anchor_date": anchor.isoformat(), "gold_standard": gold.isoformat(),
+            "metadata": {"complexity": self.complexity.get(pattern, "low"), "temporal_pattern": pattern, "synthetic": True},
+        }
+
+    # --- T3 --------------------------------------------------------------------
+
+    def _t3_constraints(self, r: random.Random, keys: tuple, anchor: date) -> tuple:
+        """
+        키 조합 하나의 값을 뽑고 (constraints, 요청문 조각들) 을 돌려줍니다.
+        """
+        c, parts = {}, []
+        if "start_date" in keys:
+            offset = r.choice((1, 7 - anchor.weekday() + r.randrange(7), r.randrange(2, 40)))
+            c["start_date"] = (anchor + timedelta(days=offset)).isoformat()
+            start = date.fromisoformat(c["start_date"])
+            if offset == 1:
+                parts.append("내일부터 시작해서")
+            elif _monday(start) == _monday(anchor) + timedelta(weeks=1):
+                parts.append(f"다음 주 {WEEKDAY_CHARS[start.weekday()]}요일부터")
+            else:
+                parts.append(f"{_korean_date(start, anchor)}부터")
+        if "date_range" in keys:
+            offset = r.choice((0, 1, 1, 2))
+            month = add_months(anchor.replace(day=1), offset)
+            c["date_range"] = [month.isoformat(), _month_end(month).isoformat()]
+            parts.append(f"{('이번 달', '다음 달', f'{month.year}년 {month.month}월')[offset]} 중에서")
+        if "week_start_day" in keys:
+            c["week_start_day"] = r.choice(("Monday", "Sunday"))
+            parts.append(f"한 주를 {WEEKDAY_CHARS[WEEKDAY_NAMES.index(c['week_start_day'])]}요일부터 세어")
+        if "week_numbers" in keys:
+            c["week_numbers"] = self._value(r, "week_numbers")
+            weeks = [("마지막" if n < 0 else ("첫째", "둘째", "셋째", "넷째", "다섯째")[n - 1]) + " 주" for n in c["week_numbers"]]
+            parts.append(f"{_korean_list(weeks, '와')}의")
+        if "week_position" in keys:
+            c["week_position"] = "last"
+            parts.append("마지막 주의")
+
+        excluded = []
+        if "weekdays_only" in keys:
+            c["weekdays_only"] = True
+            excluded.append("주말")
+        if "exclude_holidays" in keys:
+            c["exclude_holidays"] = True
+            excluded.append("공휴일")
+        if "exclude_weekdays" in keys:
+            c["exclude_weekdays"] = sorted(r.sample(WEEKDAY_NAMES[:5], r.choice((1, 1, 2))), key=WEEKDAY_NAMES.index)
+            excluded.extend(_weekday_words(c["exclude_weekdays"]))
+        if "exclude_dates" in keys:
+            base = date.fromisoformat(c.get("start_date") or (c.get("date_range") or [anchor.isoformat()])[0])
+            c["exclude_dates"] = [(base + timedelta(days=r.randrange(1, 15))).isoformat()]
+            excluded.append(_korean_date(date.fromisoformat(c["exclude_dates"][0]), anchor))
+        if excluded:
+            parts.append(f"{_korean_list(excluded)}을 제외하고")
+
+        if "date_pattern" in keys:
+            c["date_pattern"] = self._value(r, "date_pattern")
+            parts.append(f"{_pattern_words(c['date_pattern'])} 중")
+        if "preferred_dates" in keys:
+            month = add_months(anchor.replace(day=1), 1)
+            c["preferred_dates"] = [month.replace(day=15).isoformat(), _month_end(month).replace(day=min(30, _month_end(month).day)).isoformat()]
+            c["fallback_strategy"] = r.choice(("next_weekday", "previous_weekday"))
+            preferred = [_korean_date(date.fromisoformat(value), anchor) for value in c["preferred_dates"]]
+            direction = "다음" if c["fallback_strategy"] == "next_weekday" else "이전"
+            parts.append(f"{_korean_list(preferred)}을 우선으로 하되 쉬는 날이면 {direction} 평일로 옮겨")
+        if "specific_weekdays" in keys:
+            c["specific_weekdays"] = sorted(r.sample(WEEKDAY_NAMES[:5], r.choice((1, 1, 2))), key=WEEKDAY_NAMES.index)
+            weekdays = _korean_list(_weekday_words(c["specific_weekdays"]))
+            if "interval_weeks" in keys:
+                c["interval_weeks"] = self._value(r, "interval_weeks")
+                parts.append(f"{'격주로' if c['interval_weeks'] == 2 else '매주' if c['interval_weeks'] == 1 else str(c['interval_weeks']) + '주마다'} {weekdays}에")
+            else:
+                parts.append(f"{weekdays}에만")
+        elif "interval_weeks" in keys:
+            c["interval_weeks"] = self._value(r, "interval_weeks")
+            parts.append(f"{c['interval_weeks']}주 간격으로")
+        if "interval_business_days" in keys:
+            c["interval_business_days"] = self._value(r, "interval_business_days")
+            parts.append(f"영업일 기준 {c['interval_business_days']}일 간격으로")
+        elif "interval_days" in keys:
+            c["interval_days"] = self._value(r, "interval_days")
+            parts.append(f"{c['interval_days']}일 간격으로")
+        if "interval_months" in keys:
+            c["interval_months"] = r.randint(1, 3)
+            parts.append(f"{c['interval_months']}달 간격으로")
+        if "adjust_if_holiday" in keys:
+            c["adjust_if_holiday"] = {"shift_to": r.choice(("next_weekday", "previous_weekday"))}
+            direction = "다음" if c["adjust_if_holiday"]["shift_to"] == "next_weekday" else "이전"
+            parts.append(f"공휴일에 걸리면 {direction} 평일로 옮겨서")
+        if "min_count" in keys:
+            c["min_count"] = self._value(r, "min_count")
+            parts.append(f"{c['min_count']}개의 날짜를 제안해주세요.")
+        else:
+            parts.append("해당하는 날짜를 모두 알려주세요.")
+        return c, parts
+
+    def _t3(self, r: random.Random, i: int) -> dict:
+        signatures = list(self.t3_signatures)
+        weights = list(self.t3_signatures.values())
+        # 정답이 비거나 요청한 개수보다 적게 나오는 조합은 20번까지 다시 뽑습니다.
+        # 공휴일 표가 빠진 연도에 걸친 정답은 틀릴 수 있으므로 횟수와 상관없이 다시 뽑습니다.
+        for attempt in range(200):
+            keys = r.choices(signatures, weights=weights)[0]
+            anchor = self._anchor(r, self.t3_anchor_span)
+            constraints, parts = self._t3_constraints(r, keys, anchor)
+            gold = Schedule(constraints, anchor.isoformat(), self.holidays).dates()
+            if not self._holidays_known(anchor, gold):
+                continue
+            if attempt >= 19 or (gold and len(gold) >= constraints.get("min_count", 1)):
+                break
+        else:
+            raise ValueError(f"T3 item {i}: no constraint draw stays inside the holiday table years")
+        return {
+            "id": f"S3_{i + 1:07d}", "task": "T3", "input_text": _sentence(parts),
+            "anchor_date": anchor.isoformat(), "gold_standard": gold, "constraints": constraints,
+            "metadata": {"constraint_keys": list(keys), "synthetic": True},
+        }
+
+
+def write_workload(generator: WorkloadGenerator, task: str, count: int, path: str, start: int = 0) -> int:
+    """
+    항목을 하나씩 만들어 JSONL 로 씁니다. 메모리는 항목 수와 상관없이 일정합니다.
+    """
+    written = 0
+    with open(path, "a" if start else "w", encoding="utf-8") as f:
+        for item in generator.items(task, count, start):
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+            written += 1
+    return written
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Stream a reproducible synthetic T1/T2/T3 workload to JSONL.")
+    parser.add_argument('--task', type=str, nargs='+', choices=sorted(TASKS), default=sorted(TASKS))
+    parser.add_argument('--count', type=int, required=True, help="Items per task.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--start', type=int, default=0, help="First item index; appends to existing files (split generation).")
+    parser.add_argument('--output-dir', type=str, required=True, help="Writes T*_dataset.jsonl here (usable as --data-dir).")
+    parser.add_argument('--data-dir', type=str, default=DATA_DIR, help="Source datasets for the distributions.")
+    args = parser.parse_args(argv)
+
+    generator = WorkloadGenerator(args.seed, args.data_dir)
+    os.makedirs(args.output_dir, exist_ok=True)
+    for task in args.task:
+        path = os.path.join(args.output_dir, TASKS[task]["dataset"] + "l")
+        start_time = time.time()
+        written = write_workload(generator, task, args.count, path, args.start)
+        elapsed = time.time() - start_time
+        print(f"[{task}] {written}개 항목, {elapsed:.1f}초 (초당 {written / elapsed if elapsed else 0:,.0f}개) -> '{path}'")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
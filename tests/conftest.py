@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 설치하지 않고 저장소 루트에서 `python -m pytest` 로 돌릴 수 있게 패키지 경로를 잡습니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
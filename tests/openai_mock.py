@@ -0,0 +1,115 @@
+"""
+테스트용 OpenAI 호환 Chat Completions 백엔드.
+
+POST /v1/chat/completions 만 받고, 요청 모양에 따라 정해진 JSON 답을 돌려줍니다.
+
+    CoT 마이크로 배치({"items": [...]})  -> {"results": [{"id", "thought", "prediction"}, ...]}
+    T3 추출 프롬프트([Constraint Keys]) -> {"thought", "constraints": MockBackend.constraints}
+    그 밖의 요청                        -> {"thought", "prediction": MockBackend.prediction}
+
+"stream": true 면 SSE 청크(chat.completion.chunk)로 나눠 보내고, stream_options.include_usage 면 마지막에 사용량 청크를 붙입니다.
+받은 요청 본문은 requests 에, 끝까지 보내지 못한(클라이언트가 끊은) 스트림 수는 aborted_streams 에 남습니다.
+
+    with MockBackend() as backend:
+        llm = LLM(base_url=backend.base_url, api_key="test")
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+USAGE = {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120}
+
+
+class MockBackend:
+    def __init__(self, prediction: str = "2025-01-10", constraints: dict = None, chunk_chars: int = 8, chunk_delay: float = 0.0):
+        self.prediction = prediction
+        self.constraints = constraints or {"min_count": 1}
+        self.chunk_chars = chunk_chars
+        self.chunk_delay = chunk_delay
+        self.requests = []
+        self.aborted_streams = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def answer(self, messages: list) -> str:
+        system, user = messages[0]["content"], messages[-1]["content"]
+        try:
+            payload = json.loads(user)
+        except json.JSONDecodeError:
+            payload = None
+        if isinstance(payload, dict) and isinstance(payload.get("items"), list):
+            return json.dumps({"results": [{"id": entry["id"], "thought": "batch", "prediction": self.prediction}
+                                           for entry in payload["items"]]})
+        if "[Constraint Keys]" in system:
+            return json.dumps({"thought": "extract", "constraints": self.constraints})
+        return json.dumps({"thought": "cot", "prediction": self.prediction})
+
+    def _handler(self):
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)))
+                with backend._lock:
+                    backend.requests.append(body)
+                content = backend.answer(body["messages"])
+                if body.get("stream"):
+                    self._stream(body, content)
+                    return
+                data = json.dumps({
+                    "id": "mock", "object": "chat.completion", "created": 0, "model": body.get("model"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                    "usage": USAGE,
+                }).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream(self, body: dict, content: str):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                chunk = {"id": "mock", "object": "chat.completion.chunk", "created": 0, "model": body.get("model")}
+                try:
+                    for start in range(0, len(content), backend.chunk_chars):
+                        delta = {"content": content[start:start + backend.chunk_chars]}
+                        self._event(dict(chunk, choices=[{"index": 0, "delta": delta, "finish_reason": None}]))
+                        time.sleep(backend.chunk_delay)
+                    self._event(dict(chunk, choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}]))
+                    if (body.get("stream_options") or {}).get("include_usage"):
+                        self._event(dict(chunk, choices=[], usage=USAGE))
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    with backend._lock:
+                        backend.aborted_streams += 1
+                self.close_connection = True
+
+            def _event(self, obj: dict):
+                self.wfile.write(b"data: " + json.dumps(obj).encode("utf-8") + b"\n\n")
+                self.wfile.flush()
+
+        return Handler
@@ -0,0 +1,89 @@
+import json
+
+from cot_or_react.agent import RunContext, run_react_loop
+from cot_or_react.budget import BudgetExceeded
+from cot_or_react.llm import Completion
+from cot_or_react.react_guard import StallGuard
+
+PROMPTS = {"system": "planner", "observation": "decider"}
+DATES = ["2025-03-03", "2025-03-10"]
+
+
+class ScriptedLLM:
+    """
+    Planner 는 항상 같은 도구 호출을, Decider 는 continue 와 같은 날짜 목록을 돌려줍니다.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def complete(self, messages, required_keys=None):
+        self.calls += 1
+        if messages[0]["content"] == "planner":
+            body = {"thought": "compute", "tool": "calculator", "tool_input": "2025-03-03 + 7 days"}
+        else:
+            body = {"thought": "still checking", "status": ["continue", DATES]}
+        return Completion(content=json.dumps(body), total_tokens=10)
+
+
+class FakeToolbox:
+    holidays = None
+
+    def start_item(self, item):
+        pass
+
+    def execute(self, tool_name, tool_input):
+        return "2025-03-10", {"source": "fake"}
+
+
+class CallBudget:
+    def __init__(self, calls: int):
+        self.calls = calls
+
+    def before_call(self, item):
+        self.calls -= 1
+        if self.calls < 0:
+            raise BudgetExceeded("run", "calls", 2, 2)
+
+
+def _context(**kwargs) -> RunContext:
+    return RunContext(llm=ScriptedLLM(), toolbox=FakeToolbox(), prompts=PROMPTS, json_repair="off", **kwargs)
+
+
+def test_stalled_loop_is_marked_forced_finish():
+    item = run_react_loop({"id": "x", "input_text": "q", "anchor_date": "2025-03-01"}, _context(max_stall_turns=3))
+    assert item["prediction"] == DATES
+    assert item["forced_finish"] == "stalled"
+    assert item["stall_reason"].startswith("repeated_action")
+
+
+def test_repeat_hint_is_added_once():
+    item = run_react_loop({"id": "x", "input_text": "q", "anchor_date": "2025-03-01"}, _context(max_stall_turns=3))
+    assert item["thought"].count("[Controller]") == 1
+
+
+def test_budget_stop_is_marked_forced_finish():
+    item = run_react_loop({"id": "x", "input_text": "q", "anchor_date": "2025-03-01"}, _context(budget=CallBudget(2)))
+    assert item["prediction"] == DATES
+    assert item["forced_finish"] == "budget"
+
+
+def test_budget_stop_without_dates_is_an_error():
+    item = run_react_loop({"id": "x", "input_text": "q", "anchor_date": "2025-03-01"}, _context(budget=CallBudget(1)))
+    assert item["prediction"].startswith("Error: ")
+    assert "forced_finish" not in item
+
+
+def test_guard_hint_once_per_action():
+    guard = StallGuard()
+    assert guard.hint("calculator", "1 + 1", "2")
+    assert guard.hint("calculator", "1 + 1", "2") is None
+    assert guard.hint("calculator", "2 + 2", "4")
+
+
+def test_guard_disabled_never_stalls():
+    guard = StallGuard(max_stall_turns=0)
+    for _ in range(5):
+        guard.record_turn("calculator", "1 + 1", "2", repeated=True)
+    assert guard.total_stall_turns == 5
+    assert not guard.stalled
@@ -0,0 +1,84 @@
+import json
+
+from cot_or_react.agent import RunContext, run_cot
+from cot_or_react.batch import _solve_batch
+from cot_or_react.budget import BudgetController, merge_budget_summaries, shard_limits
+from cot_or_react.llm import Completion
+
+
+class CountingLLM:
+    """
+    stats() 만 BudgetController 가 보는 형태로 내주고, complete 는 빈 CoT 답을 돌려줍니다.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.tokens = 0
+
+    def stats(self):
+        return {"calls": self.calls, "total_tokens": self.tokens}
+
+    def complete(self, messages, required_keys=None):
+        self.calls += 1
+        self.tokens += 100
+        return Completion(content=json.dumps({"thought": "t", "prediction": "2025-01-01"}), prompt_tokens=80,
+                          completion_tokens=20, total_tokens=100)
+
+
+def test_shard_limits_add_back_up():
+    limits = {"tokens": 1001, "calls": 10, "seconds": 60}
+    shares = [shard_limits(limits, (index, 3)) for index in range(3)]
+    assert sum(share["tokens"] for share in shares) == 1001
+    assert sum(share["calls"] for share in shares) == 10
+    assert all(share["seconds"] == 60 for share in shares)
+
+
+def test_merge_restores_limits_and_sums_usage():
+    llm = CountingLLM()
+    blocks = []
+    for index in range(2):
+        budget = BudgetController(llm, shard_limits({"tokens": 1000, "seconds": 60}, (index, 2)), {})
+        before = budget.usage()
+        llm.calls, llm.tokens = llm.calls + 2, llm.tokens + 300
+        blocks.append(budget.summary(usage_before=before))
+    merged = merge_budget_summaries(blocks)
+    assert merged["run_limits"]["tokens"] == 1000
+    assert merged["run_limits"]["seconds"] == 60
+    assert merged["combination_usage"]["tokens"] == 600
+    assert merged["combination_usage"]["calls"] == 4
+    assert merged["scope"] == "run"
+
+
+def test_summary_reports_combination_usage_of_shared_budget():
+    llm = CountingLLM()
+    budget = BudgetController(llm, {"calls": 10}, {})
+    llm.calls = 6
+    before = budget.usage()
+    llm.calls = 9
+    block = budget.summary(usage_before=before)
+    assert block["usage"]["calls"] == 9
+    assert block["combination_usage"]["calls"] == 3
+    assert block["level"] == "cheaper_method"
+
+
+def test_cot_budget_stop_is_not_a_processing_error(capsys):
+    llm = CountingLLM()
+    budget = BudgetController(llm, {"calls": 1}, {})
+    llm.calls = 1
+    item = run_cot({"id": "a", "input_text": "어제", "anchor_date": "2025-01-02"},
+                   RunContext(llm=llm, toolbox=None, prompts={"system": "s"}, budget=budget))
+    assert item["prediction"] == "Error: run budget exceeded: calls 1/1"
+    assert item["budget"]["degradations"] == ["run_calls_exceeded"]
+    assert capsys.readouterr().out == ""
+    assert llm.calls == 1
+
+
+def test_batch_call_checks_budget():
+    llm = CountingLLM()
+    budget = BudgetController(llm, {"calls": 1}, {})
+    llm.calls = 1
+    items = [{"id": str(n), "input_text": "어제", "anchor_date": "2025-01-02"} for n in range(3)]
+    _solve_batch(items, RunContext(llm=llm, toolbox=None, prompts={"system": "s"}, budget=budget))
+    assert llm.calls == 1
+    assert all(item["prediction"].startswith("Error: run budget exceeded") for item in items)
+    assert all(item["budget"]["degradations"] == ["run_calls_exceeded"] for item in items)
@@ -0,0 +1,38 @@
+import json
+
+from cot_or_react.canonical import calendar_months, canonical_calendar_input, canonical_tool_input
+from cot_or_react.react_guard import StallGuard
+
+
+def test_calendar_months():
+    assert calendar_months("all") == [f"{m:02d}" for m in range(1, 13)]
+    assert calendar_months("ALL") == calendar_months("all")
+    assert calendar_months("9, 1,09") == ["01", "09"]
+    assert calendar_months(3) == ["03"]
+    assert calendar_months("") == []
+
+
+def test_calendar_input_defaults_and_normalizes():
+    assert canonical_calendar_input({"year": 2025, "month": "3,1"}) == {"year": "2025", "month": "01,03", "category": "rest"}
+    assert canonical_calendar_input({"year": " 2025 ", "month": "01", "category": " Rest "})["category"] == "rest"
+
+
+def test_same_meaning_same_key():
+    assert canonical_tool_input("calculator", "2025-01-01  +  7 Days") == canonical_tool_input("calculator", "2025-01-01 + 7 days")
+    assert canonical_tool_input("calendar_db", {"month": "1,3", "year": "2025"}) == \
+        canonical_tool_input("calendar_db", {"year": 2025, "month": "03,01", "category": "rest"})
+
+
+def test_different_meaning_different_key():
+    assert canonical_tool_input("calculator", "1 + 1") != canonical_tool_input("search", "1 + 1")
+    assert canonical_tool_input("calendar_db", {"year": "2025", "month": "1"}) != \
+        canonical_tool_input("calendar_db", {"year": "2025", "month": "1", "category": "anniversary"})
+
+
+def test_guard_recalls_months_already_fetched():
+    guard = StallGuard()
+    holidays = [{"locdate": 20250101, "dateName": "1월1일"}, {"locdate": 20250301, "dateName": "삼일절"}]
+    guard.remember("calendar_db", {"year": "2025", "month": "1,3"}, json.dumps(holidays, ensure_ascii=False))
+    assert guard.recall("calendar_db", {"year": "2025", "month": "03"}) == json.dumps(holidays[1:], ensure_ascii=False)
+    assert guard.recall("calendar_db", {"year": "2025", "month": "2"}) is None
+    assert guard.memo_hits == 1
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from cot_or_react.agent import RunContext, parse_json
+from cot_or_react.json_repair import RepairStats, repair_json
+from cot_or_react.llm import Completion
+
+SCHEMA = {"thought": "string", "prediction": "string"}
+
+
+@pytest.mark.parametrize("text, value, fixes", [
+    ('{"prediction": "2025-01-10"}', {"prediction": "2025-01-10"}, []),
+    ('```json\n{"prediction": "2025-01-10"}\n```', {"prediction": "2025-01-10"}, ["code_fence"]),
+    ('답은 다음과 같습니다: {"prediction": "2025-01-10"} 입니다.', {"prediction": "2025-01-10"}, ["surrounding_text"]),
+    ("{'prediction': '2025-01-10'}", {"prediction": "2025-01-10"}, ["single_quotes"]),
+    ('{"prediction": ["2025-01-10", "2025-01-11",],}', {"prediction": ["2025-01-10", "2025-01-11"]}, ["trailing_comma"]),
+    ('{"prediction": "2025-01-10\n"}', {"prediction": "2025-01-10\n"}, ["control_chars"]),
+])
+def test_local_repairs(text, value, fixes):
+    assert repair_json(text) == (value, fixes)
+
+
+def test_braces_inside_strings_are_not_counted():
+    value, fixes = repair_json('thought first {"thought": "use {calculator}", "prediction": "x"} trailing }')
+    assert value == {"thought": "use {calculator}", "prediction": "x"}
+    assert fixes == ["surrounding_text"]
+
+
+def test_single_quoted_string_keeps_inner_double_quote():
+    value, _ = repair_json("{'thought': 'he said \"hi\"', 'prediction': 'x'}")
+    assert value["thought"] == 'he said "hi"'
+
+
+def test_unrepairable_raises_original_error():
+    with pytest.raises(json.JSONDecodeError):
+        repair_json("no json here")
+
+
+class ReaskLLM:
+    def __init__(self, answer: str):
+        self.answer = answer
+        self.messages = []
+
+    def complete(self, messages, required_keys=None):
+        self.messages.append(messages)
+        return Completion(content=self.answer, total_tokens=7)
+
+
+def _parse(content: str, mode: str, reask_answer: str = '{"thought": "t", "prediction": "x"}'):
+    llm = ReaskLLM(reask_answer)
+    item = {}
+    ctx = RunContext(llm=llm, toolbox=None, prompts={}, json_repair=mode)
+    result = parse_json(ctx, item, Completion(content=content, total_tokens=10), SCHEMA, "cot")
+    return result, item, llm
+
+
+def test_parse_json_local_repair_is_recorded():
+    (output, tokens), item, llm = _parse('```json\n{"prediction": "x"}\n```', "local")
+    assert output == {"prediction": "x"} and tokens == 10
+    assert item["json_repairs"] == [{"step": "cot", "fixes": ["code_fence"], "reasked": False, "ok": True}]
+    assert llm.messages == []
+
+
+def test_parse_json_reask_adds_tokens():
+    (output, tokens), item, llm = _parse("prediction: x", "reask")
+    assert output == {"thought": "t", "prediction": "x"}
+    assert tokens == 17
+    assert item["json_repairs"][0]["reasked"] is True
+    assert llm.messages[0][1]["content"] == "prediction: x"
+
+
+def test_parse_json_off_and_local_fail_without_reask():
+    with pytest.raises(json.JSONDecodeError):
+        _parse("```json\n{'prediction': 'x'}\n```", "off")
+    with pytest.raises(json.JSONDecodeError):
+        _parse("prediction: x", "local")
+
+
+def test_parse_json_rejects_non_object():
+    with pytest.raises(json.JSONDecodeError):
+        _parse('["x"]', "reask", reask_answer='["still a list"]')
+
+
+def test_repair_stats_summary_since_snapshot():
+    stats = RepairStats()
+    stats.record("cot", ["code_fence"], reasked=False, ok=True)
+    before = stats.snapshot()
+    stats.record("thought", ["single_quotes", "trailing_comma"], reasked=False, ok=True)
+    stats.record("thought", [], reasked=True, ok=False)
+    summary = stats.summary(before)
+    assert summary["repaired_locally"] == 1 and summary["reask_failed"] == 1
+    assert summary["steps"] == {"thought": 2}
+    assert summary["fixes"] == {"single_quotes": 1, "trailing_comma": 1}
+    assert RepairStats().summary() == {}
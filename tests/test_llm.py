@@ -0,0 +1,62 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from cot_or_react.llm import LLM
+
+ANSWER = json.dumps({"prediction": "2025-01-10", "thought": "a long explanation that the caller does not need"})
+
+
+class FakeStream:
+    """
+    openai Stream 처럼 청크를 내주고 close() 여부를 기록합니다. fail_after 번째 청크 뒤에는 연결 오류를 냅니다.
+    """
+
+    def __init__(self, content: str, fail_after: int = None):
+        self.pieces = [content[i:i + 6] for i in range(0, len(content), 6)]
+        self.fail_after = fail_after
+        self.closed = False
+
+    def __iter__(self):
+        for n, piece in enumerate(self.pieces):
+            if self.fail_after is not None and n >= self.fail_after:
+                raise ConnectionError("stream dropped")
+            yield SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+        yield SimpleNamespace(usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5), choices=[])
+
+    def close(self):
+        self.closed = True
+
+
+class FakeClient:
+    def __init__(self, stream: FakeStream):
+        self.stream = stream
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=lambda **kwargs: self.stream))
+
+
+def _llm(stream: FakeStream) -> LLM:
+    return LLM(api_key="test", client=FakeClient(stream), stream=True, coalesce=False)
+
+
+def test_stream_closed_after_complete_response():
+    stream = FakeStream(ANSWER)
+    completion = _llm(stream).complete([{"role": "user", "content": "q"}])
+    assert completion.stop_reason == "complete"
+    assert json.loads(completion.content)["prediction"] == "2025-01-10"
+    assert stream.closed
+
+
+def test_stream_closed_after_early_stop():
+    stream = FakeStream(ANSWER)
+    completion = _llm(stream).complete([{"role": "user", "content": "q"}], required_keys=("prediction",))
+    assert completion.stop_reason == "keys"
+    assert json.loads(completion.content) == {"prediction": "2025-01-10"}
+    assert stream.closed
+
+
+def test_stream_closed_when_iteration_fails():
+    stream = FakeStream(ANSWER, fail_after=2)
+    with pytest.raises(ConnectionError):
+        _llm(stream).complete([{"role": "user", "content": "q"}])
+    assert stream.closed
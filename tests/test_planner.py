@@ -0,0 +1,22 @@
+import json
+
+from cot_or_react import planner
+from cot_or_react.run import main
+
+
+def test_dry_run_plan_defaults_to_results_dir(tmp_path, monkeypatch):
+    results = tmp_path / "results"
+    monkeypatch.setattr(planner, "RESULTS_DIR", str(results))
+    monkeypatch.chdir(tmp_path)
+    assert main(["--task", "t1", "--method", "cot", "--dry-run"]) == 0
+    assert not (tmp_path / planner.PLAN_FILENAME).exists()
+    plans = json.loads((results / planner.PLAN_FILENAME).read_text(encoding="utf-8"))["plans"]
+    assert [(plan["task"], plan["method"]) for plan in plans] == [("t1", "cot")]
+    assert plans[0]["calls"] == plans[0]["items"]
+
+
+def test_dry_run_plan_follows_output_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(planner, "RESULTS_DIR", str(tmp_path / "results"))
+    assert main(["--task", "t1", "--method", "cot", "--dry-run", "--output-dir", str(tmp_path / "out")]) == 0
+    assert (tmp_path / "out" / planner.PLAN_FILENAME).exists()
+    assert not (tmp_path / "results").exists()
@@ -0,0 +1,10 @@
+import pytest
+
+from cot_or_react.run import main
+
+
+def test_extract_solve_rejects_non_t3_tasks(capsys):
+    with pytest.raises(SystemExit) as exc:
+        main(["--task", "t1", "t3", "--method", "extract-solve"])
+    assert exc.value.code == 2
+    assert "extract-solve only applies to --task t3" in capsys.readouterr().err
@@ -0,0 +1,93 @@
+import pytest
+
+from cot_or_react.scheduler import HolidayCalendar, Schedule, schedule
+
+# data/T3_dataset.json 에서 가져온 (id, anchor_date, constraints, gold_standard) 쌍.
+DATASET_PAIRS = [
+    ('T2_004', '2023-11-20', {'start_date': '2023-11-26', 'weekdays_only': False, 'interval_days': 3, 'min_count': 4, 'exclude_holidays': False},
+     ['2023-11-26', '2023-11-29', '2023-12-02', '2023-12-05']),
+    ('T2_005', '2025-09-20', {'start_date': '2025-10-01', 'exclude_weekdays': ['Tuesday'], 'weekdays_only': False, 'interval_days': 4, 'min_count': 3, 'exclude_holidays': False},
+     ['2025-10-01', '2025-10-05', '2025-10-09']),
+    ('T2_011', '2023-03-20', {'start_date': '2023-04-01', 'interval_days': 5, 'min_count': 3, 'exclude_holidays': True},
+     ['2023-04-01', '2023-04-06', '2023-04-11']),
+    ('T2_029', '2025-08-18', {'start_date': '2025-08-21', 'interval_days': 2, 'min_count': 4, 'weekdays_only': True, 'exclude_holidays': False},
+     ['2025-08-21', '2025-08-25', '2025-08-27', '2025-08-29']),
+    ('T2_126', '2023-07-01', {'interval_days': 6, 'weekdays_only': True, 'exclude_holidays': True, 'min_count': 4, 'start_date': '2023-06-21'},
+     ['2023-06-21', '2023-06-27', '2023-07-03', '2023-07-21']),
+    ('T2_135', '2023-07-20', {'interval_days': 9, 'exclude_weekdays': ['Tuesday'], 'weekdays_only': False, 'exclude_holidays': True, 'min_count': 2, 'start_date': '2024-07-20'},
+     ['2024-07-20', '2024-07-29']),
+    ('T2_429', '2025-09-01', {'start_date': '2025-10-10', 'date_range': ['2025-10-10', '2025-10-20'], 'interval_days': 2, 'weekdays_only': True, 'min_count': 4, 'exclude_holidays': True},
+     ['2025-10-10', '2025-10-14', '2025-10-16', '2025-10-20']),
+    ('T2_118', '2025-12-20', {'interval': 2, 'date_range': ['2026-01-05', '2026-01-31'], 'specific_weekdays_exclude': ['Saturday', 'Sunday'], 'min_count': 5, 'exclude_holidays': True},
+     ['2026-01-05', '2026-01-07', '2026-01-09', '2026-01-13', '2026-01-15']),
+    ('T2_106', '2026-02-10', {'interval': 7, 'date_range': ['2026-02-28', '2026-03-31'], 'min_count': 3, 'adjust_for_holidays': True},
+     ['2026-02-28', '2026-03-07', '2026-03-14']),
+    ('T2_426', '2025-10-20', {'start_date': '2025-11-01', 'interval_business_days': 4, 'min_count': 3, 'exclude_holidays': True},
+     ['2025-11-06', '2025-11-12', '2025-11-18']),
+    ('T2_454', '2025-10-01', {'start_date': '2025-12-01', 'interval_weeks': 3, 'specific_weekdays': ['Wednesday'], 'min_count': 3, 'exclude_holidays': False},
+     ['2025-12-03', '2025-12-24', '2026-01-14']),
+    ('T2_095', '2025-11-26', {'week_numbers': [1, 3], 'specific_weekdays': ['Saturday'], 'date_range': ['2025-12-01', '2025-12-31'], 'min_count': 2, 'exclude_holidays': False},
+     ['2025-12-06', '2025-12-20']),
+    ('T2_058', '2025-06-10', {'week_position': 'last', 'specific_weekdays': ['Monday', 'Tuesday', 'Wednesday'], 'min_count': 3, 'exclude_holidays': False},
+     ['2025-06-30', '2025-07-01', '2025-07-02']),
+    ('T2_042', '2023-10-20', {'preferred_dates': ['2023-11-15', '2023-11-30'], 'exclude_holidays': True, 'min_count': 2, 'fallback_strategy': 'next_weekday'},
+     ['2023-11-15', '2023-11-30']),
+    ('T2_441', '2025-06-01', {'start_date': '2025-06-10', 'date_pattern': 'multiple_of_7', 'min_count': 4, 'exclude_holidays': False},
+     ['2025-06-14', '2025-06-21', '2025-06-28', '2025-07-07']),
+]
+
+
+@pytest.fixture(scope="module")
+def holidays():
+    # fetch_month 없이 만들면 KB 공휴일만 씁니다(네트워크 없음).
+    return HolidayCalendar()
+
+
+@pytest.mark.parametrize("item_id, anchor, constraints, gold", DATASET_PAIRS, ids=[pair[0] for pair in DATASET_PAIRS])
+def test_dataset_pairs(holidays, item_id, anchor, constraints, gold):
+    assert schedule(constraints, anchor, holidays) == gold
+
+
+def test_interval_skips_excluded_step_on_grid(holidays):
+    # 10-03(금) 은 제외 요일이 아니고, 10-05(일)만 건너뛰고 격자(2일 간격)를 그대로 따라갑니다.
+    constraints = {"start_date": "2025-10-01", "interval_days": 2, "exclude_weekdays": ["Sunday"], "min_count": 4}
+    assert schedule(constraints, "2025-09-20", holidays) == ["2025-10-01", "2025-10-03", "2025-10-07", "2025-10-09"]
+
+
+def test_interval_realigns_stuck_weekday_grid(holidays):
+    # 토요일 시작 + 7일 간격은 평일을 영원히 밟지 못하므로 첫 단계에서 다음 허용일(월요일)로 옮깁니다.
+    constraints = {"start_date": "2025-03-22", "interval_days": 7, "weekdays_only": True, "min_count": 3}
+    assert schedule(constraints, "2025-03-01", holidays) == ["2025-03-24", "2025-03-31", "2025-04-07"]
+
+
+def test_interval_realigns_stuck_pattern_grid(holidays):
+    # 홀수 날 시작 + 2일 간격은 짝수 날을 밟지 못합니다(월말을 넘기기 전까지).
+    constraints = {"date_range": ["2025-12-01", "2025-12-31"], "date_pattern": "even_day", "interval_days": 2, "min_count": 4}
+    assert schedule(constraints, "2025-12-04", holidays) == ["2025-12-02", "2025-12-04", "2025-12-06", "2025-12-08"]
+
+
+def test_unknown_key_is_reported(holidays):
+    s = Schedule({"start_date": "2025-01-01", "min_count": 1, "moon_phase": "full"}, "2025-01-01", holidays)
+    assert s.unsupported == ["moon_phase"]
+
+
+def test_missing_count_falls_back_and_is_reported(holidays):
+    s = Schedule({"start_date": "2025-01-06"}, "2025-01-01", holidays)
+    assert len(s.dates()) == 5
+    assert "min_count" in s.unsupported
+
+
+def test_bulk_matches_schedule(holidays):
+    pytest.importorskip("numpy")
+    from cot_or_react.bulk import CalendarMatrix, MatrixHolidays, solve
+
+    matrix = CalendarMatrix.build(2020, 2030, holidays)
+    matrix_holidays = MatrixHolidays(matrix, holidays)
+    stuck = [
+        ("2025-03-01", {"start_date": "2025-03-22", "interval_days": 7, "weekdays_only": True, "min_count": 3}),
+        ("2025-12-04", {"date_range": ["2025-12-01", "2025-12-31"], "date_pattern": "even_day", "interval_days": 2, "min_count": 4}),
+    ]
+    for anchor, constraints in [(pair[1], pair[2]) for pair in DATASET_PAIRS] + stuck:
+        result = solve(matrix, matrix_holidays, constraints, anchor)
+        assert result["path"] == "vector"
+        assert result["prediction"] == schedule(constraints, anchor, holidays)
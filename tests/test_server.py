@@ -0,0 +1,151 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+pytest.importorskip("openai")
+
+from openai_mock import MockBackend  # noqa: E402
+
+from cot_or_react.llm import LLM  # noqa: E402
+from cot_or_react.scheduler import HolidayCalendar, schedule  # noqa: E402
+from cot_or_react.server import Server, Service, make_handler  # noqa: E402
+from cot_or_react.tool_memo import ToolMemo  # noqa: E402
+from cot_or_react.tools import Toolbox  # noqa: E402
+
+CONSTRAINTS = {"start_date": "2025-03-03", "interval_days": 2, "exclude_weekdays": ["Saturday", "Sunday"], "min_count": 3}
+
+
+@pytest.fixture(scope="module")
+def backend():
+    with MockBackend(prediction="2025-01-10", constraints=CONSTRAINTS) as backend:
+        yield backend
+
+
+def _serve(backend, stream=False, batch_size=8, batch_wait=0.2):
+    llm = LLM(base_url=backend.base_url, api_key="test", stream=stream)
+    toolbox = Toolbox(llm, memo=ToolMemo(16))
+    # KASI 대신 KB 공휴일만 씁니다(네트워크 없음).
+    toolbox.holidays = HolidayCalendar()
+    service = Service(llm, toolbox, batch_size=batch_size, batch_wait=batch_wait, batch_workers=2, react=False)
+    server = Server(("127.0.0.1", 0), make_handler(service))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return service, server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _stop(service, server):
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+@pytest.fixture(scope="module")
+def server(backend):
+    service, server, url = _serve(backend)
+    yield url
+    _stop(service, server)
+
+
+@pytest.fixture
+def fresh_server(backend):
+    # 배치 크기 분포와 요청 수를 처음부터 세야 하는 테스트용.
+    service, server, url = _serve(backend)
+    yield url
+    _stop(service, server)
+
+
+def _post(url: str, body) -> tuple:
+    request = Request(url, data=json.dumps(body).encode("utf-8"), headers={"Content-Type": "application/json"})
+    try:
+        with urlopen(request, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def _get(url: str) -> str:
+    with urlopen(url, timeout=10) as response:
+        return response.read().decode("utf-8")
+
+
+def test_normalize_solver_path(server, backend):
+    calls = len(backend.requests)
+    status, body = _post(server + "/normalize", {"input_text": "어제", "anchor_date": "2025-01-02"})
+    assert status == 200
+    assert body["path"] == "solver" and body["prediction"] == "2025-01-01"
+    assert len(backend.requests) == calls
+
+
+def test_extract_goes_to_cot_batch(server):
+    status, body = _post(server + "/extract", {"input_text": "지난번 회의 다음날 알려줘", "anchor_date": "2025-01-02", "id": "q1"})
+    assert status == 200
+    assert body["path"] == "batch" and body["id"] == "q1" and body["prediction"] == "2025-01-10"
+
+
+def test_concurrent_requests_share_one_batch(fresh_server, backend):
+    server = fresh_server
+    calls = len(backend.requests)
+    payloads = [{"input_text": f"회의 {n}번 다음날", "anchor_date": "2025-01-02", "method": "cot"} for n in range(4)]
+    with ThreadPoolExecutor(4) as pool:
+        replies = list(pool.map(lambda p: _post(server + "/normalize", p), payloads))
+    assert all(status == 200 and body["path"] == "batch" for status, body in replies)
+    batch_requests = backend.requests[calls:]
+    assert len(batch_requests) == 1
+    assert len(json.loads(batch_requests[0]["messages"][-1]["content"])["items"]) == 4
+    assert json.loads(_get(server + "/metrics?format=json"))["batch_sizes"] == {"4": 1}
+
+
+def test_schedule_with_constraints_is_deterministic(server, backend):
+    calls = len(backend.requests)
+    status, body = _post(server + "/schedule", {"constraints": CONSTRAINTS, "anchor_date": "2025-03-01"})
+    assert status == 200
+    assert body["path"] == "deterministic"
+    assert body["prediction"] == schedule(CONSTRAINTS, "2025-03-01", HolidayCalendar())
+    assert len(backend.requests) == calls
+
+
+def test_schedule_text_uses_extract_solve(server):
+    status, body = _post(server + "/schedule", {"input_text": "3월 3일부터 주말 빼고 2일 간격으로 3번", "anchor_date": "2025-03-01"})
+    assert status == 200
+    assert body["path"] == "extract-solve"
+    assert body["prediction"] == schedule(CONSTRAINTS, "2025-03-01", HolidayCalendar())
+
+
+@pytest.mark.parametrize("anchor_date", ["2025-13-01", "20250102", "2025-W01-1", 20250102, None, "", "2025-01-02T00:00"])
+@pytest.mark.parametrize("route", ["/normalize", "/extract", "/schedule"])
+def test_malformed_anchor_date_is_400(server, route, anchor_date):
+    status, body = _post(server + route, {"input_text": "어제", "anchor_date": anchor_date})
+    assert status == 400
+    assert body["error"] == "anchor_date must be YYYY-MM-DD"
+
+
+def test_bad_bodies_are_400(server):
+    assert _post(server + "/normalize", ["어제"])[0] == 400
+    assert _post(server + "/normalize", {"input_text": " ", "anchor_date": "2025-01-02"})[0] == 400
+    assert _post(server + "/normalize", {"input_text": "어제", "anchor_date": "2025-01-02", "method": "react"})[0] == 400
+
+
+def test_metrics(fresh_server):
+    server = fresh_server
+    _post(server + "/normalize", {"input_text": "어제", "anchor_date": "2025-01-02"})
+    _post(server + "/normalize", {"input_text": "어제", "anchor_date": "bad"})
+    text = _get(server + "/metrics")
+    assert 'cot_or_react_requests_total{route="normalize",status="200"} 1' in text
+    assert 'cot_or_react_requests_total{route="normalize",status="400"} 1' in text
+    assert 'cot_or_react_request_seconds_count{route="normalize",path="solver"} 1' in text
+    snapshot = json.loads(_get(server + "/metrics?format=json"))
+    assert {"route": "normalize", "status": 400, "count": 1} in snapshot["requests"]
+    assert json.loads(_get(server + "/healthz")) == {"status": "ok"}
+
+
+def test_streaming_backend(backend):
+    service, server, url = _serve(backend, stream=True, batch_size=1, batch_wait=0.0)
+    try:
+        status, body = _post(url + "/normalize", {"input_text": "지난번 회의 다음날", "anchor_date": "2025-01-02", "method": "cot"})
+        assert status == 200 and body["prediction"] == "2025-01-10"
+        assert service.llm.stats()["stream_calls"] == 1
+    finally:
+        _stop(service, server)
@@ -0,0 +1,76 @@
+import argparse
+import json
+
+import pytest
+
+from cot_or_react.shard import merge_stem, merge_summaries, parse_shard, select_shard, shard_filename
+
+
+def test_parse_shard():
+    assert parse_shard("1/4") == (1, 4)
+    assert parse_shard(" 0/1 ") == (0, 1)
+    for spec in ("4/4", "1-4", "0/0", "a/b"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_shard(spec)
+
+
+def test_shards_partition_the_dataset():
+    dataset = list(range(10))
+    shards = [select_shard(dataset, (index, 3)) for index in range(3)]
+    assert sorted(x for shard in shards for x in shard) == dataset
+    assert select_shard(dataset, None) is dataset
+    assert shard_filename("t3_react_results.json", (2, 4)) == "t3_react_results.shard-2-of-4.json"
+    assert shard_filename("t3_react_results.json", None) == "t3_react_results.json"
+
+
+def _summary(items, wall_time, calls, budget_calls):
+    return {
+        "task": "t3", "method": "react", "items": items, "errors": 1, "wall_time": wall_time, "shard": [0, 2],
+        "llm": {"calls": calls, "total_tokens": calls * 100},
+        "forced_finishes": {"stalled": 1},
+        "budget": {"scope": "run", "run_limits": {"calls": 50, "seconds": 60}, "item_limits": {}, "thresholds": [0.7, 0.85, 1.0],
+                   "usage": {"calls": budget_calls, "seconds": wall_time}, "combination_usage": {"calls": budget_calls, "seconds": wall_time},
+                   "peak_level": "normal", "degradations": {"stopped": 1}},
+    }
+
+
+def test_merge_summaries_sums_counts_but_not_limits():
+    merged = merge_summaries([_summary(5, 10.0, 20, 20), _summary(4, 12.5, 30, 30)])
+    assert merged["items"] == 9 and merged["errors"] == 2
+    assert merged["llm"] == {"calls": 50, "total_tokens": 5000}
+    assert merged["forced_finishes"] == {"stalled": 2}
+    assert merged["wall_time"] == 12.5 and merged["shard_wall_time_sum"] == 22.5
+    assert merged["shards"] == 2 and "shard" not in merged
+    assert merged["task"] == "t3"
+    budget = merged["budget"]
+    assert budget["run_limits"] == {"calls": 100, "seconds": 60}
+    assert budget["usage"] == {"calls": 50, "seconds": 12.5}
+    assert budget["pressure"] == 0.5 and budget["pressure_resource"] == "calls"
+    assert budget["degradations"] == {"stopped": 2}
+
+
+def test_merge_stem_restores_dataset_order(tmp_path):
+    # 데이터셋 순서: T3_1 .. T3_10 (샤드 0 은 짝수 위치, 샤드 1 은 홀수 위치).
+    dataset = [{"id": f"T3_{n}"} for n in range(1, 11)]
+    for index in range(2):
+        stem = tmp_path / f"t3_react_results.shard-{index}-of-2"
+        (tmp_path / f"{stem.name}.json").write_text(json.dumps(select_shard(dataset, (index, 2))))
+        (tmp_path / f"{stem.name}.summary.json").write_text(json.dumps({"items": 5, "wall_time": 1.0}))
+    merged_path = merge_stem(str(tmp_path), "t3_react_results")
+    assert [item["id"] for item in json.loads(open(merged_path).read())] == [item["id"] for item in dataset]
+    assert json.loads((tmp_path / "t3_react_results.summary.json").read_text())["items"] == 10
+
+
+def test_merge_stem_refuses_missing_shards(tmp_path):
+    (tmp_path / "t1_cot_results.shard-0-of-3.json").write_text("[]")
+    (tmp_path / "t1_cot_results.shard-2-of-3.json").write_text("[]")
+    with pytest.raises(ValueError, match=r"missing shards \[1\]"):
+        merge_stem(str(tmp_path), "t1_cot_results")
+
+
+def test_verifier_calibration_is_not_summed():
+    calibration = {"items": 300, "agreed": 280, "trusted": ["min_count+specific_weekdays+start_date"]}
+    shard = {"items": 150, "wall_time": 1.0, "verifier": {"mode": "on", "items": 150, "early_finishes": 40, "calibration": calibration}}
+    merged = merge_summaries([shard, json.loads(json.dumps(shard))])
+    assert merged["verifier"]["items"] == 300 and merged["verifier"]["early_finishes"] == 80
+    assert merged["verifier"]["calibration"] == calibration
@@ -0,0 +1,59 @@
+from datetime import date
+
+import pytest
+
+from cot_or_react.solver import add_months, solve
+
+# data/T1_dataset.json 에서 규칙마다 하나씩 가져온 (id, input_text, anchor_date, gold_standard).
+DATASET_PAIRS = [
+    ('T1_130', '보름 후', '2023-11-15', '2023-11-30'),
+    ('T1_012', '3일 전', '2025-03-19', '2025-03-16'),
+    ('T1_011', '2주 뒤', '2025-03-12', '2025-03-26'),
+    ('T1_014', '2달 뒤', '2025-04-02', '2025-06-02'),
+    ('T1_024', '1년 전', '2025-06-11', '2024-06-11'),
+    ('T1_144', '내년 같은 날', '2023-11-11', '2024-11-11'),
+    ('T1_001', '다음 주 금요일', '2025-01-01', '2025-01-10'),
+    ('T1_255', '다음 달 같은 날', '2025-07-14', '2025-08-14'),
+    ('T1_009', '다음 달 1일', '2025-02-26', '2025-03-01'),
+    ('T1_029', '지난 달 첫날', '2025-07-16', '2025-06-01'),
+    ('T1_010', '지난 달 마지막 날', '2025-03-05', '2025-02-28'),
+    ('T1_131', '올해 2월 1일', '2023-11-15', '2023-02-01'),
+    ('T1_123', '내년 첫날', '2025-03-05', '2026-01-01'),
+    ('T1_027', '올해 마지막 날', '2025-07-02', '2025-12-31'),
+    ('T1_002', '어제', '2025-01-08', '2025-01-07'),
+]
+
+
+@pytest.mark.parametrize("item_id, text, anchor, gold", DATASET_PAIRS, ids=[pair[0] for pair in DATASET_PAIRS])
+def test_dataset_pairs(item_id, text, anchor, gold):
+    assert solve(text, anchor) == gold
+
+
+def test_t2_phrasing_around_the_expression():
+    assert solve("다음 주 금요일 날짜 좀 알려줘", "2025-01-01") == "2025-01-10"
+    assert solve("6달 뒤면 날짜가 어떻게 변해?", "2025-06-04") == "2025-12-04"
+
+
+@pytest.mark.parametrize("text", [
+    "4주 전 수요일",            # 남은 "수요일" 은 추가 조건
+    "다음 달 세 번째 토요일",
+    "내년",
+    "지난달 첫 번째 일요일",
+    "다음 주 금요일 제외하고 평일",
+    "추석 다음 날",
+])
+def test_leaves_compound_expressions_to_the_llm(text):
+    assert solve(text, "2025-01-01") is None
+
+
+def test_add_months_clamps_to_month_end():
+    assert add_months(date(2025, 1, 31), 1) == date(2025, 2, 28)
+    assert add_months(date(2024, 1, 31), 1) == date(2024, 2, 29)
+    assert add_months(date(2025, 1, 15), -13) == date(2023, 12, 15)
+
+
+def test_bad_inputs_return_none():
+    assert solve("어제", "2025-13-01") is None
+    assert solve("", "2025-01-01") is None
+    assert solve("어제", None) is None
+    assert solve("작년 2월 29일", "2024-06-01") is None
@@ -0,0 +1,61 @@
+import os
+from argparse import Namespace
+
+from cot_or_react.stamp import METHOD_SOURCES, carry_forward, item_stamp, run_fingerprint, source_fingerprint
+
+PROMPTS = {"system": "s"}
+
+
+def _args(**overrides):
+    return Namespace(**dict({"model": "m", "tool_mode": "real", "json_repair": "reask"}, **overrides))
+
+
+def test_method_sources_cover_llm_router_and_cassette():
+    names = {os.path.basename(path) for path in METHOD_SOURCES}
+    assert {"llm.py", "router.py", "kasi_cassette.py"} <= names
+    assert all(os.path.exists(path) for path in METHOD_SOURCES)
+
+
+def test_source_fingerprint_follows_content(tmp_path):
+    path = tmp_path / "module.py"
+    path.write_text("A = 1\n")
+    before = source_fingerprint((str(path),))
+    path.write_text("A = 2\n")
+    source_fingerprint.cache_clear()
+    assert source_fingerprint((str(path),)) != before
+
+
+def test_fingerprint_changes_with_stamped_options_only():
+    base = run_fingerprint("cot", PROMPTS, _args())
+    assert run_fingerprint("cot", PROMPTS, _args(workers=8, output_dir="elsewhere")) == base
+    assert run_fingerprint("cot", PROMPTS, _args(model="other")) != base
+    assert run_fingerprint("cot", {"system": "changed"}, _args()) != base
+    assert run_fingerprint("react", PROMPTS, _args()) != base
+
+
+def test_kasi_replay_stamps_cassette_content(tmp_path):
+    cassette = tmp_path / "kasi.json"
+    cassette.write_text("{}")
+    replay = {"path": str(cassette), "faults": None}
+    first = run_fingerprint("react", PROMPTS, _args(kasi_replay=replay))
+    cassette.write_text('{"2025": []}')
+    source_fingerprint.cache_clear()
+    assert run_fingerprint("react", PROMPTS, _args(kasi_replay=replay)) != first
+
+
+def test_item_stamp_ignores_previous_hash():
+    item = {"id": "a", "input_text": "어제", "anchor_date": "2025-01-02"}
+    assert item_stamp(item, "run") == item_stamp(dict(item, input_hash="old"), "run")
+    assert item_stamp(item, "run") != item_stamp(dict(item, anchor_date="2025-01-03"), "run")
+
+
+def test_carry_forward_keeps_only_clean_matching_results():
+    dataset = [{"id": str(n), "input_hash": f"h{n}"} for n in range(5)]
+    previous = [
+        {"id": "0", "input_hash": "h0", "prediction": "2025-01-01"},
+        {"id": "1", "input_hash": "stale", "prediction": "2025-01-01"},
+        {"id": "2", "input_hash": "h2", "prediction": "Error: timeout"},
+        {"id": "3", "input_hash": "h3", "prediction": "2025-01-01", "budget": {"degradations": ["method=cot"]}},
+        {"id": "4", "input_hash": "h4", "prediction": ["2025-01-01"], "forced_finish": "stalled"},
+    ]
+    assert sorted(carry_forward(dataset, previous)) == [0, 4]
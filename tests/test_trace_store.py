@@ -0,0 +1,74 @@
+import gzip
+import json
+
+import pytest
+
+from cot_or_react.shard import merge_trace_files
+from cot_or_react.trace_store import ItemResult, TraceStore, expand, iter_traces, trace_path, write_slim_results
+
+HOLIDAYS = json.dumps([{"locdate": 20250101, "dateName": "1월1일"}, {"locdate": 20250128, "dateName": "설날"}], ensure_ascii=False)
+
+
+def _item(n: int, **extra) -> dict:
+    return dict({
+        "id": f"T3_{n}", "input_text": f"요청 {n}", "anchor_date": "2025-01-01",
+        "prediction": ["2025-01-02"], "latency": 1.5, "tokens": 300, "thought": "짧은 생각",
+        "react_turn_1": {"tool": "calendar_db", "observation": HOLIDAYS},
+    }, **extra)
+
+
+def _write(tmp_path, items: list, compression: str = "gzip", name: str = "t3_react_results.json"):
+    results = tmp_path / name
+    store = TraceStore(trace_path(str(results), compression))
+    dataset = [{key: item[key] for key in ("id", "input_text", "anchor_date")} for item in items]
+    records = [store.slim(dict(item), set(entry)) for item, entry in zip(items, dataset)]
+    store.close()
+    write_slim_results(str(results), [record.to_dict() for record in records])
+    return results, dataset, records, store
+
+
+@pytest.mark.parametrize("compression", ["gzip", "plain", "zstd"])
+def test_slim_and_expand_round_trip(tmp_path, compression):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    items = [_item(1), _item(2, forced_finish="stalled", route={"route": "react", "bucket": "t3"})]
+    results, dataset, _, _ = _write(tmp_path, items, compression)
+    assert expand(str(results), dataset) == items
+
+
+def test_slim_records_keep_summary_fields_only(tmp_path):
+    results, _, records, _ = _write(tmp_path, [_item(1, forced_finish="budget", route={"route": "cot", "bucket": "t3"})])
+    assert json.loads(results.read_text()) == [{"id": "T3_1", "prediction": ["2025-01-02"], "latency": 1.5, "tokens": 300,
+                                                "route": "cot", "forced_finish": "budget"}]
+    assert records[0].get("forced_finish") == "budget"
+    assert records[0].get("thought") is None and records[0].get("thought", "-") == "-"
+
+
+def test_long_strings_are_stored_once(tmp_path):
+    results, _, _, store = _write(tmp_path, [_item(n) for n in range(3)])
+    assert store.stats() == {"traces": 3, "blobs": 1, "blob_refs": 3}
+    with gzip.open(trace_path(str(results), "gzip"), "rt", encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert sum(1 for line in lines if "blob" in line) == 1
+    assert [fields["react_turn_1"]["observation"] for _, fields in iter_traces(trace_path(str(results), "gzip"))] == [HOLIDAYS] * 3
+
+
+def test_concatenated_shard_traces_expand(tmp_path):
+    shards = []
+    for index in range(2):
+        results, _, _, _ = _write(tmp_path, [_item(index)], name=f"t3_react_results.shard-{index}-of-2.json")
+        shards.append(str(results))
+    merged = tmp_path / "t3_react_results.json"
+    write_slim_results(str(merged), [json.loads(open(path).read())[0] for path in shards])
+    merge_trace_files(shards, str(merged))
+    dataset = [{"id": f"T3_{n}", "input_text": f"요청 {n}", "anchor_date": "2025-01-01"} for n in range(2)]
+    assert expand(str(merged), dataset) == [_item(0), _item(1)]
+
+
+def test_item_result_without_trace(tmp_path):
+    store = TraceStore(trace_path(str(tmp_path / "t1_cot_results.json"), "plain"))
+    record = store.slim({"id": "T1_1", "input_text": "어제", "prediction": "2025-01-01"}, {"id", "input_text"})
+    store.close()
+    assert isinstance(record, ItemResult)
+    assert record.to_dict() == {"id": "T1_1", "prediction": "2025-01-01"}
+    assert store.stats()["traces"] == 0
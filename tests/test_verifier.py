@@ -0,0 +1,112 @@
+from datetime import date
+
+import pytest
+
+from cot_or_react.scheduler import HolidayCalendar
+from cot_or_react.verifier import ScheduleVerifier, calibrate, parse_rules, signature, verifier_summary
+
+
+@pytest.fixture(scope="module")
+def holidays():
+    return HolidayCalendar()
+
+
+def test_holiday_inclusion_negated_means_exclusion():
+    rules = parse_rules("2026년 8월 매주 월·수·금마다 점검을 하되, 공휴일 포함해선 안 됩니다. 총 6회", "2026-07-20")
+    assert rules["exclude_holidays"] is True
+    assert rules["supported"]
+
+
+def test_holidays_included_stays_included():
+    rules = parse_rules("다음 달 1일부터, 주말 제외하고 6일 간격으로 3개의 날짜를 찾아주세요. (공휴일 포함)", "2025-05-10")
+    assert rules["exclude_holidays"] is False
+
+
+def test_middle_dot_weekday_run():
+    rules = parse_rules("2026년 8월 매주 월·수·금마다 점검을 하되, 공휴일 포함해선 안 됩니다. 총 6회", "2026-07-20")
+    assert rules["only_weekdays"] == {0, 2, 4}
+    assert rules["range"] == (date(2026, 8, 1), date(2026, 8, 31))
+
+
+def test_slash_weekday_run_with_avoid_verb():
+    rules = parse_rules("다음 달 5일부터 매 2일 간격으로 5회 알림 보내기 — 단 토요일/일요일은 피하고, 공휴일도 제외", "2025-12-20")
+    assert rules["exclude_weekdays"] == {5, 6}
+    assert rules["exclude_holidays"] is True
+    assert rules["start"] == date(2026, 1, 5)
+
+
+def test_month_scope_without_suffix():
+    rules = parse_rules("다음 달 공휴일과 일요일을 제외하고, 6일 간격으로 3개의 날짜를 제안해주세요.", "2024-04-20")
+    assert rules["range"] == (date(2024, 5, 1), date(2024, 5, 31))
+    assert rules["exclude_weekdays"] == {6}
+    assert rules["exclude_holidays"] is True
+
+
+def test_next_year_month_scope():
+    rules = parse_rules("내년 1월에 매주 화요일과 목요일에 개인 트레이너 예약을 8회 잡아주세요.", "2025-11-26")
+    assert rules["range"] == (date(2026, 1, 1), date(2026, 1, 31))
+    assert rules["only_weekdays"] == {1, 3}
+    assert rules["supported"]
+
+
+def test_month_name_is_not_a_monday():
+    rules = parse_rules("내년 1월에 매주 화요일과 목요일에 개인 트레이너 예약을 8회 잡아주세요.", "2025-11-26")
+    assert 0 not in rules["only_weekdays"]
+
+
+@pytest.mark.parametrize("text, reason", [
+    ("내년 1월에 매주 화요일과 목요일에 개인 트레이너 예약을 8회 잡아주세요. 단, 설 연휴는 제외해주세요.", "negation"),
+    ("다음 해 1월 첫 평일을 시작으로 9일 간격으로 3개 날짜를 골라주세요.", "scope"),
+    ("다음 달 중 10일을 제외하고 평일만 3개의 날짜를 골라주세요.", "scope"),
+    ("화요일과 목요일 중 점심 약속 3개를 잡아주세요.", "weekday"),
+])
+def test_unparsed_phrases_are_unsupported(text, reason):
+    rules = parse_rules(text, "2025-11-26")
+    assert not rules["supported"]
+    assert rules["reason"].startswith(reason)
+
+
+def test_business_day_interval():
+    rules = parse_rules("이번 달 10일부터, 영업일 기준 3일 간격으로 3개의 날짜를 골라주세요. 공휴일은 제외합니다.", "2025-04-01")
+    assert rules["interval"] == ("business_days", 3)
+    assert rules["supported"]
+
+
+def test_check_accepts_earliest_and_rejects_shifted(holidays):
+    text = "다음 달 10일 이후부터, 월요일 또는 목요일인 날짜만 4개를 찾아주세요."
+    verifier = ScheduleVerifier(text, "2025-01-01", holidays, mode="shadow")
+    assert verifier.check(["2025-02-10", "2025-02-13", "2025-02-17", "2025-02-20"], 1)
+    assert not verifier.check(["2025-02-13", "2025-02-17", "2025-02-20", "2025-02-24"], 2)
+    assert verifier.checks[1]["failed"] == ["not_earliest"]
+
+
+def test_violations_name_broken_rules(holidays):
+    verifier = ScheduleVerifier("다음 달 5일부터 매 2일 간격으로 5회 알림 보내기 — 단 토요일/일요일은 피하고, 공휴일도 제외",
+                                "2025-12-20", holidays)
+    assert set(verifier.violations(["2026-01-03", "2026-01-04"])) >= {"count", "exclude_weekdays", "start"}
+    assert verifier.violations("2026-01-05") == ["format"]
+
+
+def test_calibration_gates_on_mode(holidays):
+    text = "다음 달 10일 이후부터, 월요일 또는 목요일인 날짜만 4개를 찾아주세요."
+    expected = ["2025-02-10", "2025-02-13", "2025-02-17", "2025-02-20"]
+    agreeing = [{"input_text": text, "anchor_date": "2025-01-01", "gold_standard": expected}] * 5
+    noisy = agreeing[:3] + [{"input_text": text, "anchor_date": "2025-01-01", "gold_standard": []}] * 2
+
+    trusted = calibrate(agreeing, holidays)
+    assert trusted["items"] == trusted["agreed"] == 5
+    verifier = ScheduleVerifier(text, "2025-01-01", holidays, "on", trusted["trusted"])
+    assert signature(verifier.rules) in trusted["trusted"]
+    assert verifier.check(expected, 1) and verifier.may_finish
+
+    untrusted = calibrate(noisy, holidays)
+    assert untrusted["trusted"] == []
+    verifier = ScheduleVerifier(text, "2025-01-01", holidays, "on", untrusted["trusted"])
+    assert verifier.check(expected, 1) and not verifier.may_finish
+    assert verifier_summary([verifier.summary(1, expected)])["untrusted"] == 1
+
+
+def test_shadow_mode_never_finishes(holidays):
+    verifier = ScheduleVerifier("다음 달 10일 이후부터, 월요일 또는 목요일인 날짜만 4개를 찾아주세요.", "2025-01-01", holidays, "shadow",
+                                ["min_count+specific_weekdays+start_date"])
+    assert not verifier.may_finish